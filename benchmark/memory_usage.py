@@ -0,0 +1,119 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+"""
+Measure memory taken by single instance of objects Eos keeps in
+large amounts - cache objects, attribute maps and affectors.
+
+Usage: python benchmark/memory_usage.py [object amount]
+
+Script imports Eos from the checkout it is located in, thus to
+compare memory usage before and after some change, run it on
+both revisions.
+"""
+
+
+import gc
+import os.path
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eos.const.eve import Effect as EffectId, EffectCategory
+from eos.data.cache_object import Attribute, Effect, Modifier, Type
+from eos.fit.attribute_calculator import MutableAttributeMap
+from eos.fit.attribute_calculator.affector import Affector
+
+
+def make_type(index):
+    return Type(type_id=index, group=1, category=1, attributes={}, effects=())
+
+
+def make_type_used(index):
+    effect = Effect(effect_id=EffectId.hi_power, category=EffectCategory.online)
+    type_ = Type(type_id=index, group=1, category=1, attributes={}, effects=(effect,))
+    # Fill values of cached properties
+    type_.required_skills
+    type_.max_state
+    type_.is_targeted
+    type_.slots
+    return type_
+
+
+def make_effect(index):
+    return Effect(effect_id=index, category=EffectCategory.passive, modifiers=())
+
+
+def make_modifier(index):
+    return Modifier(modifier_id=index)
+
+
+def make_attribute(index):
+    return Attribute(attribute_id=index, default_value=0.0)
+
+
+def make_attribute_map(index):
+    return MutableAttributeMap(None)
+
+
+def make_affector(index):
+    return Affector(None, None)
+
+
+# Format: ((benchmark name, object factory),)
+BENCHMARKS = (
+    ('Type', make_type),
+    ('Type, cached properties used', make_type_used),
+    ('Effect', make_effect),
+    ('Modifier', make_modifier),
+    ('Attribute', make_attribute),
+    ('MutableAttributeMap', make_attribute_map),
+    ('Affector', make_affector)
+)
+
+
+def measure(factory, amount):
+    """
+    Get average amount of memory taken by object, in bytes.
+    Only memory allocated by factory and not freed afterwards
+    is counted, and list which keeps objects is excluded.
+    """
+    objects = [None] * amount
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for index in range(amount):
+        objects[index] = factory(index)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / amount
+
+
+def main():
+    amount = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print('Memory per object, measured over {} objects:'.format(amount))
+    for name, factory in BENCHMARKS:
+        print('  {:<30}{:>6.0f} B'.format(name, measure(factory, amount)))
+
+
+if __name__ == '__main__':
+    main()
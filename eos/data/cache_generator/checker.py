@@ -22,12 +22,23 @@
 from logging import getLogger
 
 from eos.const.eve import Effect
-from eos.util.frozen_dict import FrozenDict
 
 
 logger = getLogger(__name__)
 
 
+# Names of fields which form primary key of each table
+PRIMARY_KEYS = {
+    'dgmattribs': ('attributeID',),
+    'dgmeffects': ('effectID',),
+    'dgmexpressions': ('expressionID',),
+    'dgmtypeattribs': ('typeID', 'attributeID'),
+    'dgmtypeeffects': ('typeID', 'effectID'),
+    'evegroups': ('groupID',),
+    'evetypes': ('typeID',)
+}
+
+
 class Checker:
     """
     Class responsible for conducting checks and making
@@ -43,16 +54,7 @@ class Checker:
         data -- data to check
         """
         self.data = data
-        primary_keys = {
-            'dgmattribs': ('attributeID',),
-            'dgmeffects': ('effectID',),
-            'dgmexpressions': ('expressionID',),
-            'dgmtypeattribs': ('typeID', 'attributeID'),
-            'dgmtypeeffects': ('typeID', 'effectID'),
-            'evegroups': ('groupID',),
-            'evetypes': ('typeID',)
-        }
-        for table_name, key_names in primary_keys.items():
+        for table_name, key_names in PRIMARY_KEYS.items():
             self._table_pk(table_name, key_names)
 
     def pre_convert(self, data):
@@ -78,50 +80,29 @@ class Checker:
         as primary keys in iterable
         """
         table = self.data[table_name]
+        key_columns = [table.column(key_name) for key_name in key_names]
         # Contains keys used in current table
         used_keys = set()
-        # Storage for rows which should be removed
+        # Storage for indices of rows which should be removed
         invalid_rows = set()
-        for datarow in sorted(table, key=lambda row: row['table_pos']):
-            self._row_pk(key_names, datarow, used_keys, invalid_rows)
+        for index in table:
+            row_key = tuple(key_column[index] for key_column in key_columns)
+            # Invalidate row if it doesn't have any component
+            # of primary key, or if any component is not an integer
+            if not all(isinstance(k, int) for k in row_key):
+                invalid_rows.add(index)
+            # If specified key is already used
+            elif row_key in used_keys:
+                invalid_rows.add(index)
+            else:
+                used_keys.add(row_key)
         # If any invalid rows were detected, remove them and
         # write corresponding message to log
         if invalid_rows:
             msg = '{} rows in table {} have invalid PKs, removing them'.format(
                 len(invalid_rows), table_name)
             logger.warning(msg)
-            table.difference_update(invalid_rows)
-
-    def _row_pk(self, key_names, datarow, used_keys, invalid_rows):
-        """
-        Check row primary key for validity.
-
-        Required arguments:
-        key_names -- names of fields which contain keys
-        datarow -- row to check
-        used_keys -- container with alreaady used keys
-        invalid_rows -- container for invalid rows
-        """
-        row_key = []
-        for key_name in key_names:
-            try:
-                key_value = datarow[key_name]
-            # Invalidate row if it doesn't have any component
-            # of primary key
-            except KeyError:
-                invalid_rows.add(datarow)
-                return
-            # If primary key is not an integer
-            if not isinstance(key_value, int):
-                invalid_rows.add(datarow)
-                return
-            row_key.append(key_value)
-        row_key = tuple(row_key)
-        # If specified key is already used
-        if row_key in used_keys:
-            invalid_rows.add(datarow)
-            return
-        used_keys.add(row_key)
+            table.discard(invalid_rows)
 
     def _attribute_value_type(self):
         """
@@ -129,16 +110,14 @@ class Checker:
         Only ints and floats are considered as valid. Eos
         attribute calculation engine relies on this assumption.
         """
-        invalid_rows = set()
         table = self.data['dgmtypeattribs']
-        for row in table:
-            if not isinstance(row.get('value'), (int, float)):
-                invalid_rows.add(row)
+        values = table.column('value')
+        invalid_rows = set(i for i in table.rows if not isinstance(values[i], (int, float)))
         if invalid_rows:
             msg = '{} attribute rows have non-numeric value, removing them'.format(
                 len(invalid_rows))
             logger.warning(msg)
-            table.difference_update(invalid_rows)
+            table.discard(invalid_rows)
 
     def _multiple_default_effects(self):
         """
@@ -149,17 +128,18 @@ class Checker:
         # Set with IDs of types, which have default effect
         defeff = set()
         table = self.data['dgmtypeeffects']
+        type_ids = table.column('typeID')
+        defaults = table.column('isDefault')
         invalid_rows = set()
-        for row in sorted(table, key=lambda r: r['table_pos']):
-            is_default = row.get('isDefault')
+        for index in table:
             # We're interested only in default effects
-            if is_default is not True:
+            if defaults[index] is not True:
                 continue
-            type_id = row['typeID']
+            type_id = type_ids[index]
             # If we already saw default effect for given type ID,
             # invalidate current row
             if type_id in defeff:
-                invalid_rows.add(row)
+                invalid_rows.add(index)
             else:
                 defeff.add(type_id)
         # Process ivalid rows, if any
@@ -168,12 +148,8 @@ class Checker:
                 len(invalid_rows))
             logger.warning(msg)
             # Replace isDefault field value with False for invalid rows
-            table.difference_update(invalid_rows)
-            for invalid_row in invalid_rows:
-                new_row = {}
-                for field, value in invalid_row.items():
-                    new_row[field] = False if field == 'isDefault' else value
-                table.add(FrozenDict(new_row))
+            for index in invalid_rows:
+                table.set(index, 'isDefault', False)
 
     def _colliding_module_racks(self):
         """
@@ -186,22 +162,23 @@ class Checker:
         won't be actually used won't be printed.
         """
         table = self.data['dgmtypeeffects']
+        type_ids = table.column('typeID')
+        effect_ids = table.column('effectID')
         rack_effects = (Effect.hi_power, Effect.med_power, Effect.lo_power)
         racked_items = set()
         invalid_rows = set()
-        for row in sorted(table, key=lambda r: r['table_pos']):
-            effect_id = row['effectID']
+        for index in table:
             # We're not interested in anything besides
             # rack effects
-            if effect_id not in rack_effects:
+            if effect_ids[index] not in rack_effects:
                 continue
-            type_id = row['typeID']
+            type_id = type_ids[index]
             if type_id in racked_items:
-                invalid_rows.add(row)
+                invalid_rows.add(index)
             else:
                 racked_items.add(type_id)
         if invalid_rows:
             msg = '{} rows contain colliding module racks, removing them'.format(
                 len(invalid_rows))
             logger.warning(msg)
-            table.difference_update(invalid_rows)
+            table.discard(invalid_rows)
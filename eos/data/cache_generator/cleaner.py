@@ -19,41 +19,135 @@
 # ===============================================================================
 
 
-import yaml
+from collections import namedtuple
 from itertools import chain
 from logging import getLogger
+from time import perf_counter
 
 from eos.const.eve import Group, Category
 from eos.util.cached_property import CachedProperty
+from .modifier_builder import ModifierInfoCache
+from .table import Table
 
 
 logger = getLogger(__name__)
 
 
+# Format:
+# {source table: {source column: (target table, target column)}}
+FOREIGN_KEYS = {
+    'dgmattribs': {
+        'maxAttributeID': ('dgmattribs', 'attributeID')
+    },
+    'dgmeffects': {
+        'preExpression': ('dgmexpressions', 'expressionID'),
+        'postExpression': ('dgmexpressions', 'expressionID'),
+        'durationAttributeID': ('dgmattribs', 'attributeID'),
+        'trackingSpeedAttributeID': ('dgmattribs', 'attributeID'),
+        'dischargeAttributeID': ('dgmattribs', 'attributeID'),
+        'rangeAttributeID': ('dgmattribs', 'attributeID'),
+        'falloffAttributeID': ('dgmattribs', 'attributeID'),
+        'fittingUsageChanceAttributeID': ('dgmattribs', 'attributeID')
+    },
+    'dgmexpressions': {
+        'arg1': ('dgmexpressions', 'expressionID'),
+        'arg2': ('dgmexpressions', 'expressionID'),
+        'expressionTypeID': ('evetypes', 'typeID'),
+        'expressionGroupID': ('evegroups', 'groupID'),
+        'expressionAttributeID': ('dgmattribs', 'attributeID')
+    },
+    'dgmtypeattribs': {
+        'typeID': ('evetypes', 'typeID'),
+        'attributeID': ('dgmattribs', 'attributeID')
+    },
+    'dgmtypeeffects': {
+        'typeID': ('evetypes', 'typeID'),
+        'effectID': ('dgmeffects', 'effectID')
+    },
+    'evetypes': {
+        'groupID': ('evegroups', 'groupID')
+    }
+}
+
+# Auxiliary tables are those which do not define
+# any entities, they just map one entities to others
+# or complement entities with additional data
+AUX_TABLES = ('dgmtypeattribs', 'dgmtypeeffects')
+
+
+# Stats of single cleanup stage: its name, time it
+# took and amount of rows it processed
+CleanupStageStats = namedtuple('CleanupStageStats', ('name', 'time', 'rows'))
+
+
 class Cleaner:
     """
     Class responsible for cleaning up unnecessary data
     from the database in automatic mode, using several
     pre-defined data relations.
+
+    Optional arguments:
+    modinfo_cache -- cache of parsed modifier infos to use,
+    when not specified, private cache is used
     """
 
-    def clean(self, data):
+    def __init__(self, modinfo_cache=None):
+        if modinfo_cache is None:
+            modinfo_cache = ModifierInfoCache()
+        self._modinfo_cache = modinfo_cache
+
+    def clean(self, data, external_types=None):
+        """
+        Clean passed data. After cleaning, stats of each
+        cleanup stage are available in report attribute.
+
+        Required arguments:
+        data -- data to clean
+
+        Optional arguments:
+        external_types -- types whose rows are not in passed data,
+        but which take part in cleanup as if they were, in format
+        get_type_references returns. IDs of these types which are
+        kept are stored in kept_external_types attribute
+        """
         self.data = data
+        # Format: {type ID: (group ID, references)}
+        self._external_types = external_types or {}
+        self.kept_external_types = set()
+        # List with stats of cleanup stages
+        self.report = []
         # Container to store signs of so-called strong data,
-        # such rows are immune to removal. Dictionary structure
-        # is the same as structure of general data container
+        # such rows are immune to removal. Rows are referred
+        # to by their indices
+        # Format: {table name: {row indices}}
         self.strong_data = {}
         # Move some rows to strong data container
-        self._pump_evetypes()
-        # Also contains data in the very same format, but tables/rows
-        # in this table are considered as pending for removal
+        self._run_stage('pump', self._pump_evetypes)
+        # Also contains indices of rows in the very same format, but
+        # rows in this container are considered as pending for removal
         self.trashed_data = {}
         self._autocleanup()
         self._report_results()
 
+    def _run_stage(self, name, method):
+        """
+        Run cleanup stage and record its stats.
+
+        Required arguments:
+        name -- name of stage
+        method -- method which runs stage and returns
+        amount of rows it processed
+        """
+        time_started = perf_counter()
+        rows = method()
+        self.report.append(CleanupStageStats(name=name, time=perf_counter() - time_started, rows=rows))
+
     def _pump_evetypes(self):
         """
         Mark some hardcoded evetypes as strong.
+
+        Return value:
+        Amount of pumped rows
         """
         # Tuple with categoryIDs of items we want to keep
         strong_categories = (
@@ -72,164 +166,222 @@ class Cleaner:
         # It is set because we will need to modify it
         strong_groups = {Group.character, Group.effect_beacon}
         # Go through table data, filling valid groups set according to valid categories
-        for datarow in self.data['evegroups']:
-            if datarow.get('categoryID') in strong_categories:
-                strong_groups.add(datarow['groupID'])
+        evegroups = self.data['evegroups']
+        for index in evegroups.rows:
+            if evegroups.get(index, 'categoryID') in strong_categories:
+                strong_groups.add(evegroups.get(index, 'groupID'))
+        evetypes = self.data['evetypes']
         rows_to_pump = set()
-        for datarow in self.data['evetypes']:
-            if datarow.get('groupID') in strong_groups:
-                rows_to_pump.add(datarow)
+        for index in evetypes.rows:
+            if evetypes.get(index, 'groupID') in strong_groups:
+                rows_to_pump.add(index)
         self._pump_data('evetypes', rows_to_pump)
+        for type_id, (group_id, _) in self._external_types.items():
+            if group_id in strong_groups:
+                self.kept_external_types.add(type_id)
+        return len(rows_to_pump)
 
     def _autocleanup(self):
         """
         Define auto-cleanup workflow.
         """
-        self._kill_weak()
-        self._changed = True
-        # Cycle as long as we have changes during previous iteration.
-        # We need this because contents of even evetypes may change, which,
-        # by turn, will need to pull additional data into other tables
-        while self._changed is True:
-            self._changed = False
-            self._reanimate_auxiliary_friends()
-            self._reestablish_broken_relationships()
+        self._run_stage('kill weak', self._kill_weak)
+        self._run_stage('index', self._index_trash)
+        self._run_stage('restore', self._restore_referenced)
 
     def _kill_weak(self):
         """
         Trash all data which isn't marked as strong.
+
+        Return value:
+        Amount of trashed rows
         """
+        trashed = 0
         for table_name, table in self.data.items():
-            to_trash = set()
             strong_rows = self.strong_data.get(table_name, set())
-            to_trash.update(table.difference(strong_rows))
+            to_trash = table.rows.difference(strong_rows)
             self._trash_data(table_name, to_trash)
+            trashed += len(to_trash)
+        return trashed
 
-    def _reanimate_auxiliary_friends(self):
-        """
-        Restore rows in tables, which complement evetypes
-        or serve as m:n mapping between evetypes and other tables.
-        """
-        # As we filter whole database using evetypes table,
-        # gather evetype IDs we currently have in there
-        type_ids = set(row['typeID'] for row in self.data['evetypes'])
-        # Auxiliary tables are those which do not define
-        # any entities, they just map one entities to others
-        # or complement entities with additional data
-        aux_tables = ('dgmtypeattribs', 'dgmtypeeffects')
-        for table_name in aux_tables:
-            to_restore = set()
-            # Restore rows which map other entities to types
-            for row in self.trashed_data[table_name]:
-                if row['typeID'] in type_ids:
-                    to_restore.add(row)
-            if to_restore:
-                self._changed = True
-                self._restore_data(table_name, to_restore)
-
-    def _reestablish_broken_relationships(self):
-        """
-        Restore all rows targeted by references of rows, which
-        exist in actual data.
-        """
-        # Container for 'target data', matches with which are
-        # going to be restored
-        # Format: {(target table name, target column name): {values to have}}}
-        tgt_data = {}
-        self._get_targets_relational(tgt_data)
-        self._get_targets_yaml(tgt_data)
-        # Now, when we have all the target data values, we may look for
-        # rows, which have matching values, and restore them
-        for tgt_spec, tgt_values in tgt_data.items():
-            tgt_table_name, tgt_column_name = tgt_spec
-            to_restore = set()
-            for row in self.trashed_data[tgt_table_name]:
-                if row.get(tgt_column_name) in tgt_values:
-                    to_restore.add(row)
-            if to_restore:
-                self._changed = True
-                self._restore_data(tgt_table_name, to_restore)
-
-    def _get_targets_relational(self, tgt_data):
-        """
-        Fill dictionary with target references taken from data
-        stored in relational format
+    def _index_trash(self):
         """
-        # Format:
-        # {source table: {source column: (target table, target column)}}
-        foreign_keys = {
-            'dgmattribs': {
-                'maxAttributeID': ('dgmattribs', 'attributeID')
-            },
-            'dgmeffects': {
-                'preExpression': ('dgmexpressions', 'expressionID'),
-                'postExpression': ('dgmexpressions', 'expressionID'),
-                'durationAttributeID': ('dgmattribs', 'attributeID'),
-                'trackingSpeedAttributeID': ('dgmattribs', 'attributeID'),
-                'dischargeAttributeID': ('dgmattribs', 'attributeID'),
-                'rangeAttributeID': ('dgmattribs', 'attributeID'),
-                'falloffAttributeID': ('dgmattribs', 'attributeID'),
-                'fittingUsageChanceAttributeID': ('dgmattribs', 'attributeID')
-            },
-            'dgmexpressions': {
-                'arg1': ('dgmexpressions', 'expressionID'),
-                'arg2': ('dgmexpressions', 'expressionID'),
-                'expressionTypeID': ('evetypes', 'typeID'),
-                'expressionGroupID': ('evegroups', 'groupID'),
-                'expressionAttributeID': ('dgmattribs', 'attributeID')
-            },
-            'dgmtypeattribs': {
-                'typeID': ('evetypes', 'typeID'),
-                'attributeID': ('dgmattribs', 'attributeID')
-            },
-            'dgmtypeeffects': {
-                'typeID': ('evetypes', 'typeID'),
-                'effectID': ('dgmeffects', 'effectID')
-            },
-            'evetypes': {
-                'groupID': ('evegroups', 'groupID')
-            }
-        }
-        for src_table_name, table_fks in foreign_keys.items():
-            for src_column_name, fk_target in table_fks.items():
-                tgt_table_name, tgt_column_name = fk_target
-                for row in self.data[src_table_name]:
-                    fk_value = row.get(src_column_name)
-                    # If there's no such field in a row or it is None,
-                    # this is not a valid FK reference
-                    if fk_value is None:
-                        continue
-                    tgt_values = tgt_data.setdefault((tgt_table_name, tgt_column_name), set())
-                    tgt_values.add(fk_value)
-
-    def _get_targets_yaml(self, tgt_data):
-        """
-        Fill dictionary with target references taken from data
-        stored in YAML format
-        """
-        for effect_row in self.data['dgmeffects']:
-            effect_id = effect_row['effectID']
-            try:
-                types, groups, attrs = self._yaml_modinfo_relations[effect_id]
-            except KeyError:
+        Index trashed rows by values which can be used to
+        reference them, so that rows can be restored without
+        scanning whole trashed tables.
+
+        Return value:
+        Amount of indexed rows
+        """
+        # Format: {(target table name, target column name): {value: [row indices]}}
+        self._tgt_index = {}
+        tgt_specs = set(chain(*(table_fks.values() for table_fks in FOREIGN_KEYS.values())))
+        tgt_specs.update((
+            ('evetypes', 'typeID'),
+            ('evegroups', 'groupID'),
+            ('dgmattribs', 'attributeID')
+        ))
+        # Rows of auxiliary tables are referenced by type ID
+        tgt_specs.update((table_name, 'typeID') for table_name in AUX_TABLES)
+        indexed = 0
+        for tgt_table_name, tgt_column_name in tgt_specs:
+            column_index = self._tgt_index[(tgt_table_name, tgt_column_name)] = {}
+            column = self.data[tgt_table_name].column(tgt_column_name)
+            for index in self.trashed_data[tgt_table_name]:
+                value = column[index]
+                if value is None or value is Table.MISSING:
+                    continue
+                column_index.setdefault(value, []).append(index)
+                indexed += 1
+        return indexed
+
+    def _restore_referenced(self):
+        """
+        Restore all trashed rows which are referenced by rows
+        in actual data. Rows of actual data are put to worklist,
+        and every row restored while processing the worklist
+        is put there too, to restore rows it references; thus
+        each row is processed only once.
+
+        Return value:
+        Amount of restored rows
+        """
+        # Format: [(table name, row index)]
+        worklist = [(n, i) for n, t in self.data.items() for i in t.rows]
+        # External types are put to worklist with None in
+        # place of table name and type ID in place of index
+        worklist.extend((None, type_id) for type_id in self.kept_external_types)
+        external_types = self._external_types
+        restored = 0
+        while worklist:
+            table_name, index = worklist.pop()
+            if table_name is None:
+                _, references = external_types[index]
+            else:
+                references = self._get_references(table_name, index)
+            for tgt_table_name, tgt_column_name, value in references:
+                if (
+                    tgt_table_name == 'evetypes' and value in external_types and
+                    value not in self.kept_external_types
+                ):
+                    self.kept_external_types.add(value)
+                    worklist.append((None, value))
+                # Once rows are restored, they're removed from index,
+                # so that we do not go through them again
+                tgt_rows = self._tgt_index[(tgt_table_name, tgt_column_name)].pop(value, ())
+                trash_table = self.trashed_data[tgt_table_name]
+                to_restore = set(i for i in tgt_rows if i in trash_table)
+                if to_restore:
+                    self._restore_data(tgt_table_name, to_restore)
+                    worklist.extend((tgt_table_name, i) for i in to_restore)
+                    restored += len(to_restore)
+        return restored
+
+    def _get_references(self, table_name, index):
+        """
+        Get references which row of actual data makes
+        to other rows.
+
+        Return value:
+        List with (target table name, target column
+        name, value) tuples
+        """
+        table = self.data[table_name]
+        references = self._get_fk_references(table, table_name, index)
+        # As we filter whole database using evetypes table, restore
+        # rows in tables, which complement evetypes or serve as m:n
+        # mapping between evetypes and other tables
+        if table_name == 'evetypes':
+            for aux_table_name in AUX_TABLES:
+                references.append((aux_table_name, 'typeID', table.get(index, 'typeID')))
+        # Effects may also reference entities in modifier info
+        if table_name == 'dgmeffects':
+            references.extend(self._get_references_yaml(table.get(index, 'effectID')))
+        return references
+
+    @staticmethod
+    def _get_fk_references(table, table_name, index):
+        """
+        Get references which row makes via its foreign keys.
+
+        Return value:
+        List with (target table name, target column
+        name, value) tuples
+        """
+        references = []
+        for src_column_name, fk_target in FOREIGN_KEYS.get(table_name, {}).items():
+            fk_value = table.get(index, src_column_name)
+            # If there's no such field in a row or it is None,
+            # this is not a valid FK reference
+            if fk_value is None:
                 continue
-            for references, tgt_table_name, tgt_column_name in (
-                (types, 'evetypes', 'typeID'),
-                (groups, 'evegroups', 'groupID'),
-                (attrs, 'dgmattribs', 'attributeID')
-            ):
-                # If there're any references for given entity, add them to
-                # dictionary
-                if len(references) > 0:
-                    tgt_values = tgt_data.setdefault((tgt_table_name, tgt_column_name), set())
-                    tgt_values.update(references)
+            references.append((fk_target[0], fk_target[1], fk_value))
+        return references
+
+    def get_type_references(self, data):
+        """
+        Collect data about types which cleanup relies on.
+
+        Required arguments:
+        data -- data to collect info from
+
+        Return value:
+        Dictionary in {type ID: (group ID, references)} format, where
+        references are (target table name, target column name, value)
+        tuples, made by rows of type to rows of other tables. Types
+        which have no row in evetypes table are not included
+        """
+        # Format: {type ID: (group ID, references)}
+        type_references = {}
+        evetypes = data['evetypes']
+        for index in evetypes:
+            type_references[evetypes.get(index, 'typeID')] = (
+                evetypes.get(index, 'groupID'),
+                self._get_fk_references(evetypes, 'evetypes', index)
+            )
+        for table_name in AUX_TABLES:
+            table = data[table_name]
+            for index in table:
+                try:
+                    _, references = type_references[table.get(index, 'typeID')]
+                except KeyError:
+                    continue
+                # Rows of type reference their own type only
+                references.extend(
+                    r for r in self._get_fk_references(table, table_name, index)
+                    if r[0] != 'evetypes'
+                )
+        return type_references
+
+    def _get_references_yaml(self, effect_id):
+        """
+        Get references to other entities from modifier
+        info YAML of effect with passed ID.
+
+        Return value:
+        Iterable with (target table name, target column
+        name, value) tuples
+        """
+        try:
+            types, groups, attrs = self._yaml_modinfo_relations[effect_id]
+        except KeyError:
+            return ()
+        references = []
+        for values, tgt_table_name, tgt_column_name in (
+            (types, 'evetypes', 'typeID'),
+            (groups, 'evegroups', 'groupID'),
+            (attrs, 'dgmattribs', 'attributeID')
+        ):
+            references.extend((tgt_table_name, tgt_column_name, value) for value in values)
+        return references
 
     @CachedProperty
     def _yaml_modinfo_relations(self):
         """
         Generate auxiliary map to avoid re-parsing YAML
-        on each cleanup cycle. It is used when collecting
-        data about references from modifier info YAMLs.
+        each time references of effect are requested. It is
+        used when collecting data about references from
+        modifier info YAMLs.
         """
 
         # Helper function to fetch actual attribute values
@@ -247,17 +399,17 @@ class Cleaner:
         relations = {}
         # Cycle through both data and trashed data, to make sure all rows are
         # processed regardless of stage during which this property is accessed
-        for effect_row in chain(self.data['dgmeffects'], self.trashed_data['dgmeffects']):
+        dgmeffects = self.data['dgmeffects']
+        for index in chain(dgmeffects.rows, self.trashed_data['dgmeffects']):
             # We do not need anything here if modifier info is empty
-            modinfos_yaml = effect_row.get('modifierInfo')
+            modinfos_yaml = dgmeffects.get(index, 'modifierInfo')
             if modinfos_yaml is None:
                 continue
+            effect_id = dgmeffects.get(index, 'effectID')
             # Skip row in case of any YAML parsing errors
             try:
-                modinfos = yaml.safe_load(modinfos_yaml)
-            except KeyboardInterrupt:
-                raise
-            except:
+                modinfos = self._modinfo_cache.get(effect_id, modinfos_yaml)
+            except Exception:
                 continue
             # Modinfos should be basic python iterable
             if not isinstance(modinfos, (list, tuple, set)):
@@ -277,7 +429,7 @@ class Cleaner:
                 continue
             # Otherwise, add all the data we've gathered for current
             # effect to container
-            relations[effect_row['effectID']] = (types, groups, attrs)
+            relations[effect_id] = (types, groups, attrs)
         return relations
 
     def _report_results(self):
@@ -299,42 +451,42 @@ class Cleaner:
             msg = 'cleaned: {}'.format(', '.join(table_msgs))
             logger.info(msg)
 
-    def _pump_data(self, table_name, datarows):
+    def _pump_data(self, table_name, indices):
         """
         Auxiliary method, mark data rows as strong.
 
         Required arguments:
         table_name -- name of table for which we're pumping data
-        datarows -- set with rows to pump
+        indices -- set with indices of rows to pump
         """
         strong_rows = self.strong_data.setdefault(table_name, set())
-        strong_rows.update(datarows)
+        strong_rows.update(indices)
 
-    def _trash_data(self, table_name, datarows):
+    def _trash_data(self, table_name, indices):
         """
         Auxiliary method, mark data rows as pending removal.
 
         Required arguments:
         table_name -- name of table for which we're removing data
-        datarows -- set with rows to remove
+        indices -- set with indices of rows to remove
         """
         data_table = self.data[table_name]
         trash_table = self.trashed_data.setdefault(table_name, set())
         # Update both trashed data and source data
-        trash_table.update(datarows)
-        data_table.difference_update(datarows)
+        trash_table.update(indices)
+        data_table.discard(indices)
 
-    def _restore_data(self, table_name, datarows):
+    def _restore_data(self, table_name, indices):
         """
         Auxiliary method, move data from trash back to actual
         data container.
 
         Required arguments:
         table_name -- name of table for which we're restoring data
-        datarows -- set with rows to restore
+        indices -- set with indices of rows to restore
         """
         data_table = self.data[table_name]
         trash_table = self.trashed_data[table_name]
         # Update both trashed data and source data
-        data_table.update(datarows)
-        trash_table.difference_update(datarows)
+        data_table.restore(indices)
+        trash_table.difference_update(indices)
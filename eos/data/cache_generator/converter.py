@@ -19,27 +19,65 @@
 # ===============================================================================
 
 
-import re
-from logging import getLogger
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+from logging import DEBUG, Formatter, Handler, getLogger
 
 from eos.const.eve import Attribute, Operand
-from eos.util.frozen_dict import FrozenDict
-from .modifier_builder import ModifierBuilder
+from eos.data.charge_compatibility import get_allowed_charge_groups, is_charge_compatible
+from .modifier_builder import MemoStats, ModifierBuilder, ModifierInfoCache
+from .table import Table
 
 
 logger = getLogger(__name__)
 
 
+# Fields of modifier which define it
+MODIFIER_FIELDS = (
+    'state',
+    'scope',
+    'src_attr',
+    'operator',
+    'tgt_attr',
+    'domain',
+    'filter_type',
+    'filter_value'
+)
+
+
 class Converter:
     """
     Class responsible for transforming data structure,
     like moving data around or converting whole data
     structure.
+
+    Optional arguments:
+    workers -- amount of processes used to build modifiers,
+    when 1, everything is done in current process
+    modinfo_cache -- cache of parsed modifier infos to use,
+    when not specified, private cache is used
     """
 
-    def normalize(self, data):
-        """ Make data more consistent."""
+    def __init__(self, workers=1, modinfo_cache=None):
+        self._workers = workers
+        if modinfo_cache is None:
+            modinfo_cache = ModifierInfoCache()
+        self._modinfo_cache = modinfo_cache
+
+    def normalize(self, data, name_data=None):
+        """
+        Make data more consistent.
+
+        Required arguments:
+        data -- data to normalize
+
+        Optional arguments:
+        name_data -- data which is used to convert symbolic
+        references into IDs, when not specified, data itself
+        is used
+        """
         self.data = data
+        self._name_data = name_data if name_data is not None else data
         self._move_attribs()
         self._convert_expression_symbolic_references()
 
@@ -60,41 +98,39 @@ class Converter:
         # defined in table
         defined_pairs = set()
         dgmtypeattribs = self.data['dgmtypeattribs']
-        for row in dgmtypeattribs:
-            if row['attributeID'] not in attr_ids:
+        typeattr_type_ids = dgmtypeattribs.column('typeID')
+        typeattr_attr_ids = dgmtypeattribs.column('attributeID')
+        for index in dgmtypeattribs.rows:
+            if typeattr_attr_ids[index] not in attr_ids:
                 continue
-            defined_pairs.add((row['typeID'], row['attributeID']))
+            defined_pairs.add((typeattr_type_ids[index], typeattr_attr_ids[index]))
         attrs_skipped = 0
-        new_evetypes = set()
-        # Cycle through all evetypes, for each row moving each its field
-        # either to different table or container for updated rows
-        for row in self.data['evetypes']:
-            type_id = row['typeID']
-            new_row = {}
-            for field, value in row.items():
-                if field in atrrib_map:
-                    # If row didn't have such attribute defined, skip it
-                    if value is None:
-                        continue
-                    # If such attribute already exists in dgmtypeattribs,
-                    # do not modify it - values from dgmtypeattribs table
-                    # have priority
-                    attr_id = atrrib_map[field]
-                    if (type_id, attr_id) in defined_pairs:
-                        attrs_skipped += 1
-                        continue
-                    # Generate row and add it to proper attribute table
-                    dgmtypeattribs.add(FrozenDict({
-                        'typeID': type_id,
-                        'attributeID': attr_id,
-                        'value': value
-                    }))
-                else:
-                    new_row[field] = value
-            new_evetypes.add(FrozenDict(new_row))
-        # Update evetypes with rows which do not contain attributes
-        self.data['evetypes'].clear()
-        self.data['evetypes'].update(new_evetypes)
+        evetypes = self.data['evetypes']
+        type_ids = evetypes.column('typeID')
+        # Cycle through all evetypes, for each row moving each its
+        # attribute field to attribute table
+        for index in evetypes:
+            type_id = type_ids[index]
+            for field, attr_id in atrrib_map.items():
+                value = evetypes.get(index, field)
+                # If row didn't have such attribute defined, skip it
+                if value is None:
+                    continue
+                # If such attribute already exists in dgmtypeattribs,
+                # do not modify it - values from dgmtypeattribs table
+                # have priority
+                if (type_id, attr_id) in defined_pairs:
+                    attrs_skipped += 1
+                    continue
+                # Generate row and add it to proper attribute table
+                dgmtypeattribs.append({
+                    'typeID': type_id,
+                    'attributeID': attr_id,
+                    'value': value
+                })
+        # Remove attribute fields from evetypes
+        for field in atrrib_map:
+            evetypes.drop_column(field)
         if attrs_skipped > 0:
             msg = '{} built-in attributes already have had value in dgmtypeattribs and were skipped'.format(
                 attrs_skipped)
@@ -107,48 +143,52 @@ class Converter:
         """
         successes = 0
         failures = 0
-        data = self.data
-        dgmexpressions = data['dgmexpressions']
-        replacement_desc = (
-            ('dgmattribs', 'attributeID', 'attributeName', 'expressionAttributeID', Operand.def_attr),
-            ('evegroups', 'groupID', 'groupName_en-us', 'expressionGroupID', Operand.def_grp),
-            ('evetypes', 'typeID', 'typeName_en-us', 'expressionTypeID', Operand.def_type)
-        )
-        for entry in replacement_desc:
-            entity_table, id_column, symname_column, tgt_column, operand = entry
-            name_id_map = {}
-            for entity_row in sorted(data[entity_table], key=lambda row: row['table_pos']):
-                entity_id = entity_row[id_column]
-                entity_name_normal = entity_row.get(symname_column)
-                if not entity_name_normal:
-                    continue
-                ids_normal = name_id_map.setdefault(entity_name_normal, [])
-                ids_normal.append(entity_id)
-                # Entities can be referred via names with stripped space
-                entity_name_stripped = re.sub('\s', '', entity_name_normal)
-                # Do not add id of entity against stripped name, if it's
-                # already stripped
-                if entity_name_stripped == entity_name_normal:
-                    continue
-                ids_stripped = name_id_map.setdefault(entity_name_stripped, [])
-                ids_stripped.append(entity_id)
+        dgmexpressions = self.data['dgmexpressions']
+        # Format: {operand: (entity table name, ID column, symbolic name
+        #   column, target column in dgmexpressions)}
+        replacement_desc = {
+            Operand.def_attr: ('dgmattribs', 'attributeID', 'attributeName', 'expressionAttributeID'),
+            Operand.def_grp: ('evegroups', 'groupID', 'groupName_en-us', 'expressionGroupID'),
+            Operand.def_type: ('evetypes', 'typeID', 'typeName_en-us', 'expressionTypeID')
+        }
+        # Single pass over expressions to find rows which need
+        # conversion, grouped by operand
+        # Format: {operand: [expression indices]}
+        pending = {}
+        operands = dgmexpressions.column('operandID')
+        for exp_index in dgmexpressions:
+            operand = operands[exp_index]
+            if operand not in replacement_desc:
+                continue
+            # If entity is already referenced via ID, nothing
+            # to do here
+            if dgmexpressions.get(exp_index, replacement_desc[operand][3]) is not None:
+                continue
+            pending.setdefault(operand, []).append(exp_index)
+        # Values of all converted expressions are removed at once
+        # Format: {expression index: None}
+        value_replacements = {}
+        for operand, (entity_table_name, id_column, symname_column, tgt_column) in replacement_desc.items():
+            exp_indices = pending.get(operand)
+            if not exp_indices:
+                continue
+            # Index is built only for tables which are actually
+            # referenced via symbolic names
+            name_id_map = self._get_name_id_map(self._name_data[entity_table_name], id_column, symname_column)
             # Set to keep symbolic names about which we've already
             # logged warnings
             warned_conflicts = set()
-            # We're modifying only rows with specific operands
-            for exp_row in filter(lambda r: r['operandID'] == operand, dgmexpressions):
-                exp_entity_id = exp_row[tgt_column]
-                # If entity is already referenced via ID, nothing
-                # to do here
-                if exp_entity_id is not None:
-                    continue
-                sym_name = exp_row['expressionValue']
+            # Format: {expression index: entity ID}
+            id_replacements = {}
+            for exp_index in exp_indices:
+                sym_name = dgmexpressions.get(exp_index, 'expressionValue')
                 # If we don't have expression value in our name-id map,
                 # then we can't help anyhow too
-                if sym_name not in name_id_map:
+                try:
+                    repl_ids = name_id_map[sym_name]
+                except (KeyError, TypeError):
                     failures += 1
                     continue
-                repl_ids = name_id_map[sym_name]
                 repl_id = repl_ids[0]
                 if len(repl_ids) > 1:
                     if sym_name not in warned_conflicts:
@@ -156,123 +196,230 @@ class Converter:
                             id_column, sym_name, ', '.join(str(i) for i in repl_ids), repl_id)
                         logger.warning(msg)
                         warned_conflicts.add(sym_name)
-                # As rows are frozen dicts, we compose new mutable dict, update
-                # data there, freeze it, and add to replacement maps
-                new_exp_row = {}
-                new_exp_row.update(exp_row)
-                new_exp_row['expressionValue'] = None
-                new_exp_row[tgt_column] = repl_id
-                new_exp_row = FrozenDict(new_exp_row)
-                dgmexpressions.remove(exp_row)
-                dgmexpressions.add(new_exp_row)
+                value_replacements[exp_index] = None
+                id_replacements[exp_index] = repl_id
                 successes += 1
+            dgmexpressions.update(tgt_column, id_replacements)
+        dgmexpressions.update('expressionValue', value_replacements)
         # Report results to log, it will help to indicate when CCP finally stops
         # using literal references, and we can get rid of this conversion
         msg = 'conversion of literal references to IDs in dgmexpressions: {} successful, {} failed'.format(
             successes, failures)
         logger.info(msg)
 
-    def convert(self, data):
+    def _get_name_id_map(self, entity_table, id_column, symname_column):
+        """
+        Compose map between symbolic names of entities and their IDs.
+        Entities can be referred to via both their names and names with
+        whitespace stripped.
+
+        Return value:
+        Dictionary in {symbolic name: [entity IDs]} format
+        """
+        name_id_map = {}
+        ids = entity_table.column(id_column)
+        names = entity_table.column(symname_column)
+        for entity_index in entity_table:
+            entity_name_normal = names[entity_index]
+            if entity_name_normal is Table.MISSING or not entity_name_normal:
+                continue
+            entity_id = ids[entity_index]
+            if entity_id is Table.MISSING:
+                entity_id = None
+            name_id_map.setdefault(entity_name_normal, []).append(entity_id)
+            # Do not add ID of entity against stripped name, if it's
+            # already stripped
+            entity_name_stripped = ''.join(entity_name_normal.split())
+            if entity_name_stripped == entity_name_normal:
+                continue
+            name_id_map.setdefault(entity_name_stripped, []).append(entity_id)
+        return name_id_map
+
+    def convert(self, data, reusable_builds=None, keep_builds=False, extra_types=None):
         """
         Convert database-like data structure to eos-
         specific one.
+
+        Optional arguments:
+        reusable_builds -- results of modifier building made during
+        previous run, in {effect ID: (modifier rows, build status,
+        log entries)} format; modifiers for listed effects are not
+        built again, and log entries are emitted instead
+        keep_builds -- when True, results of modifier building are
+        stored in effect_builds attribute in the same format
+        extra_types -- iterable with type rows converted earlier,
+        which are added to types converted out of data
+
+        Counters of expression subtree memoization are stored
+        in etree_memo_stats attribute.
         """
-        data = self._assemble(data)
-        self._build_modifiers(data)
+        data = self._assemble(data, extra_types or ())
+        self._build_modifiers(data, reusable_builds or {}, keep_builds)
         return data
 
-    def _assemble(self, data):
+    def _assemble(self, data, extra_types):
         """
         Use passed data to compose object-like data rows,
         as in, to 'assemble' objects.
         """
         # Before actually generating rows, we need to collect
         # some data in convenient form
-        # Format: {type ID: type row}
-        dgmeffects_keyed = {}
-        for row in data['dgmeffects']:
-            dgmeffects_keyed[row['effectID']] = row
-        # Format: {group ID: group row}
-        evegroups_keyed = {}
-        for row in data['evegroups']:
-            evegroups_keyed[row['groupID']] = row
+        # Format: {group ID: category ID}
+        group_category_map = {}
+        evegroups = data['evegroups']
+        for index in evegroups:
+            group_category_map[evegroups.get(index, 'groupID')] = evegroups.get(index, 'categoryID')
+        dgmtypeeffects = data['dgmtypeeffects']
+        typeeff_type_ids = dgmtypeeffects.column('typeID')
+        typeeff_effect_ids = dgmtypeeffects.column('effectID')
+        typeeff_defaults = dgmtypeeffects.column('isDefault')
         # Format: {type ID: default effect ID}
         type_defeff_map = {}
-        for row in data['dgmtypeeffects']:
-            if row.get('isDefault') is True:
-                type_defeff_map[row['typeID']] = row['effectID']
         # Format: {type ID: [effect IDs]}
         type_effects = {}
-        for row in data['dgmtypeeffects']:
-            type_effects_row = type_effects.setdefault(row['typeID'], [])
-            type_effects_row.append(row['effectID'])
+        for index in dgmtypeeffects:
+            type_id = typeeff_type_ids[index]
+            effect_id = typeeff_effect_ids[index]
+            if typeeff_defaults[index] is True:
+                type_defeff_map[type_id] = effect_id
+            type_effects_row = type_effects.setdefault(type_id, [])
+            type_effects_row.append(effect_id)
+        dgmtypeattribs = data['dgmtypeattribs']
+        typeattr_type_ids = dgmtypeattribs.column('typeID')
+        typeattr_attr_ids = dgmtypeattribs.column('attributeID')
+        typeattr_values = dgmtypeattribs.column('value')
         # Format: {type ID: {attr ID: value}}
         type_attribs = {}
-        for row in data['dgmtypeattribs']:
-            type_attribs_row = type_attribs.setdefault(row['typeID'], {})
-            type_attribs_row[row['attributeID']] = row['value']
+        for index in dgmtypeattribs:
+            type_attribs_row = type_attribs.setdefault(typeattr_type_ids[index], {})
+            type_attribs_row[typeattr_attr_ids[index]] = typeattr_values[index]
 
         # We will build new data structure from scratch
         assembly = {}
 
         types = []
-        for row in data['evetypes']:
-            type_id = row['typeID']
-            group = row.get('groupID')
+        evetypes = data['evetypes']
+        for index in evetypes:
+            type_id = evetypes.get(index, 'typeID')
+            group = evetypes.get(index, 'groupID')
             type_ = {
                 'type_id': type_id,
                 'group': group,
-                'category': evegroups_keyed.get(group, {}).get('categoryID'),
+                'category': group_category_map.get(group),
                 'effects': type_effects.get(type_id, []),
                 'attributes': type_attribs.get(type_id, {}),
                 'default_effect': type_defeff_map.get(type_id)
             }
             types.append(type_)
+        types.extend(extra_types)
         assembly['types'] = types
 
         attributes = []
-        for row in data['dgmattribs']:
+        dgmattribs = data['dgmattribs']
+        for index in dgmattribs:
             attribute = {
-                'attribute_id': row['attributeID'],
-                'max_attribute': row.get('maxAttributeID'),
-                'default_value': row.get('defaultValue'),
-                'high_is_good': row.get('highIsGood'),
-                'stackable': row.get('stackable')
+                'attribute_id': dgmattribs.get(index, 'attributeID'),
+                'max_attribute': dgmattribs.get(index, 'maxAttributeID'),
+                'default_value': dgmattribs.get(index, 'defaultValue'),
+                'high_is_good': dgmattribs.get(index, 'highIsGood'),
+                'stackable': dgmattribs.get(index, 'stackable')
             }
             attributes.append(attribute)
         assembly['attributes'] = attributes
 
         effects = []
-        assembly['effects'] = []
-        for row in data['dgmeffects']:
+        dgmeffects = data['dgmeffects']
+        for index in dgmeffects:
+            effect_id = dgmeffects.get(index, 'effectID')
             effect = {
-                'effect_id': row['effectID'],
-                'effect_category': row.get('effectCategory'),
-                'is_offensive': row.get('isOffensive'),
-                'is_assistance': row.get('isAssistance'),
-                'duration_attribute': row.get('durationAttributeID'),
-                'discharge_attribute': row.get('dischargeAttributeID'),
-                'range_attribute': row.get('rangeAttributeID'),
-                'falloff_attribute': row.get('falloffAttributeID'),
-                'tracking_speed_attribute': row.get('trackingSpeedAttributeID'),
-                'fitting_usage_chance_attribute': row.get('fittingUsageChanceAttributeID'),
-                'pre_expression': row.get('preExpression'),
-                'post_expression': row.get('postExpression'),
-                'modifier_info': row.get('modifierInfo')
+                'effect_id': effect_id,
+                'effect_category': dgmeffects.get(index, 'effectCategory'),
+                'is_offensive': dgmeffects.get(index, 'isOffensive'),
+                'is_assistance': dgmeffects.get(index, 'isAssistance'),
+                'duration_attribute': dgmeffects.get(index, 'durationAttributeID'),
+                'discharge_attribute': dgmeffects.get(index, 'dischargeAttributeID'),
+                'range_attribute': dgmeffects.get(index, 'rangeAttributeID'),
+                'falloff_attribute': dgmeffects.get(index, 'falloffAttributeID'),
+                'tracking_speed_attribute': dgmeffects.get(index, 'trackingSpeedAttributeID'),
+                'fitting_usage_chance_attribute': dgmeffects.get(index, 'fittingUsageChanceAttributeID'),
+                'pre_expression': dgmeffects.get(index, 'preExpression'),
+                'post_expression': dgmeffects.get(index, 'postExpression'),
+                'modifier_info': self._get_modifier_info(effect_id, dgmeffects.get(index, 'modifierInfo'))
             }
             effects.append(effect)
         assembly['effects'] = effects
 
-        assembly['expressions'] = list(data['dgmexpressions'])
+        dgmexpressions = data['dgmexpressions']
+        assembly['expressions'] = [dgmexpressions.row(index) for index in dgmexpressions]
+
+        assembly['compatible_charges'] = self._index_compatible_charges(types)
 
         return assembly
 
-    def _build_modifiers(self, data):
+    def _index_compatible_charges(self, types):
+        """
+        Find out which charges can be loaded into each type
+        which restricts groups of charges it can load.
+
+        Required arguments:
+        types -- assembled type rows
+
+        Return value:
+        List with rows in {'type_id': container type ID,
+        'charges': [charge type IDs]} format
+        """
+        # Format: {group ID: [type rows]}
+        group_types = {}
+        for type_row in types:
+            group_types.setdefault(type_row['group'], []).append(type_row)
+        index = []
+        for container_row in types:
+            container_attrs = container_row['attributes']
+            allowed_groups = get_allowed_charge_groups(container_attrs)
+            if not allowed_groups:
+                continue
+            charge_ids = []
+            for group in allowed_groups:
+                for charge_row in group_types.get(group, ()):
+                    if is_charge_compatible(container_attrs, group, charge_row['attributes']):
+                        charge_ids.append(charge_row['type_id'])
+            index.append({'type_id': container_row['type_id'], 'charges': sorted(charge_ids)})
+        return index
+
+    def _get_modifier_info(self, effect_id, modifier_info_yaml):
+        """
+        Get modifier info for effect row. Parsed modifier info is
+        taken from cache; if it cannot be parsed into list, YAML is
+        returned as-is, and modifier builder handles it.
+        """
+        if not isinstance(modifier_info_yaml, str) or not modifier_info_yaml:
+            return modifier_info_yaml
+        try:
+            modifier_info = self._modinfo_cache.get(effect_id, modifier_info_yaml)
+        except KeyboardInterrupt:
+            raise
+        except Exception:
+            return modifier_info_yaml
+        if not isinstance(modifier_info, list):
+            return modifier_info_yaml
+        return modifier_info
+
+    def _build_modifiers(self, data, reusable_builds, keep_builds):
         """
         Replace expressions with generated out of
         them modifiers.
         """
-        builder = ModifierBuilder(data['expressions'])
+        # Sort rows by ID so we numerate modifiers in deterministic way
+        effect_rows = sorted(data['effects'], key=lambda row: row['effect_id'])
+        rows_to_build = [r for r in effect_rows if r['effect_id'] not in reusable_builds]
+        self.etree_memo_stats = MemoStats(0, 0, 0)
+        builder = None
+        if self._workers > 1:
+            build_results = self._build_parallel(data['expressions'], rows_to_build)
+        else:
+            builder = ModifierBuilder(data['expressions'])
+            build_results = self._build_serial(builder, rows_to_build, keep_builds)
+        self.effect_builds = {}
         # Lists effects, which are using given modifier
         # Format: {modifier row: [effect IDs]}
         modifier_effect_map = {}
@@ -280,70 +427,199 @@ class Converter:
         # Format: {modifier row: modifier ID}
         modifier_id_map = {}
         modifier_id = 1
-        # Sort rows by ID so we numerate modifiers in deterministic way
-        for effect_row in sorted(data['effects'], key=lambda row: row['effect_id']):
-            modifiers, build_status = builder.build(effect_row)
+        for effect_row in effect_rows:
+            effect_id = effect_row['effect_id']
+            if effect_id in reusable_builds:
+                modifier_rows, build_status, log_entries = reusable_builds[effect_id]
+                for logger_name, level, msg in log_entries:
+                    getLogger(logger_name).log(level, msg)
+            else:
+                modifier_rows, build_status, log_entries = next(build_results)
+            if keep_builds is True:
+                self.effect_builds[effect_id] = (modifier_rows, build_status, log_entries)
             # Update effects: add modifier build status and remove
             # fields which we needed only for this process
             effect_row['build_status'] = build_status
             del effect_row['pre_expression']
             del effect_row['post_expression']
             del effect_row['modifier_info']
-            for modifier in modifiers:
-                # Convert modifiers into frozen datarows to use
-                # them in conversion process
-                frozen_modifier = self._freeze_modifier(modifier)
+            # Modifier rows are tuples with values of modifier
+            # fields, thus equal modifiers have equal rows
+            for modifier_row in modifier_rows:
                 # Gather data about which effects use which modifier
-                used_by_effects = modifier_effect_map.setdefault(frozen_modifier, [])
-                used_by_effects.append(effect_row['effect_id'])
+                used_by_effects = modifier_effect_map.setdefault(modifier_row, [])
+                used_by_effects.append(effect_id)
                 # Assign ID only to each unique modifier
-                if frozen_modifier not in modifier_id_map:
-                    modifier_id_map[frozen_modifier] = modifier_id
+                if modifier_row not in modifier_id_map:
+                    modifier_id_map[modifier_row] = modifier_id
                     modifier_id += 1
+        # Let builder to clean up after itself
+        build_results.close()
+        if builder is not None:
+            self.etree_memo_stats = builder.etree_memo_stats
 
         # Compose reverse to modifier_effect_map dictionary
         # Format: {effect ID: [modifier rows]}
         effect_modifier_map = {}
-        for frozen_modifier, effect_ids in modifier_effect_map.items():
+        for modifier_row, effect_ids in modifier_effect_map.items():
             for effect_id in effect_ids:
                 effect_modifiers = effect_modifier_map.setdefault(effect_id, [])
-                effect_modifiers.append(frozen_modifier)
+                effect_modifiers.append(modifier_row)
 
         # For each effect, add IDs of each modifiers it uses
         for effect_row in data['effects']:
             modifier_ids = []
-            for frozen_modifier in effect_modifier_map.get(effect_row['effect_id'], ()):
-                modifier_ids.append(modifier_id_map[frozen_modifier])
+            for modifier_row in effect_modifier_map.get(effect_row['effect_id'], ()):
+                modifier_ids.append(modifier_id_map[modifier_row])
             effect_row['modifiers'] = modifier_ids
 
         # Replace expressions table with modifiers
         del data['expressions']
         modifiers = []
-        for frozen_modifier, modifier_id in modifier_id_map.items():
-            modifier = {}
-            modifier.update(frozen_modifier)
+        for modifier_row, modifier_id in modifier_id_map.items():
+            modifier = dict(zip(MODIFIER_FIELDS, modifier_row))
             modifier['modifier_id'] = modifier_id
             modifiers.append(modifier)
         data['modifiers'] = modifiers
 
-    def _freeze_modifier(self, modifier):
+    def _build_serial(self, builder, effect_rows, capture_logs):
         """
-        Converts modifier into frozendict with its keys and
-        values assigned according to modifier's ones.
+        Build modifiers for passed effects in current process.
+
+        Required arguments:
+        builder -- modifier builder to use
+        effect_rows -- iterable with effect rows
+        capture_logs -- when True, log entries produced during
+        building are collected too
+
+        Return value:
+        Iterable with (modifier rows, build status, log entries)
+        tuples, in order of passed effect rows
         """
-        # Fields which we need to write into row
-        fields = (
-            'state',
-            'scope',
-            'src_attr',
-            'operator',
-            'tgt_attr',
-            'domain',
-            'filter_type',
-            'filter_value'
-        )
-        modifier_row = {}
-        for field in fields:
-            modifier_row[field] = getattr(modifier, field)
-        frozen_row = FrozenDict(modifier_row)
-        return frozen_row
+        log_buffer = _RecordBuffer()
+        root_logger = getLogger()
+        for effect_row in effect_rows:
+            log_buffer.records = []
+            if capture_logs is True:
+                root_logger.addHandler(log_buffer)
+            try:
+                modifiers, build_status = builder.build(effect_row)
+            finally:
+                root_logger.removeHandler(log_buffer)
+            yield (
+                [_get_modifier_row(modifier) for modifier in modifiers],
+                build_status,
+                [_get_log_entry(record) for record in log_buffer.records]
+            )
+
+    def _build_parallel(self, expressions, effect_rows):
+        """
+        Build modifiers for passed effects using pool of processes.
+        Effects are split into chunks, each worker builds modifiers
+        for whole chunk and passes back results alongside with log
+        records it produced. Results and log records are merged in
+        order of passed effect rows, so outcome does not depend on
+        which worker finished first. Subtree memoization counters
+        of workers are summed into etree_memo_stats attribute.
+
+        Required arguments:
+        expressions -- iterable with expression rows
+        effect_rows -- iterable with effect rows
+
+        Return value:
+        Iterable with (modifier rows, build status, log entries)
+        tuples, in order of passed effect rows
+        """
+        # Several chunks per worker, so that workers which got
+        # chunks with simple effects do not sit idle
+        chunk_size = max(1, -(-len(effect_rows) // (self._workers * 4)))
+        chunks = [effect_rows[i:i + chunk_size] for i in range(0, len(effect_rows), chunk_size)]
+        with ProcessPoolExecutor(
+            max_workers=self._workers,
+            initializer=_init_worker,
+            initargs=(expressions,)
+        ) as executor:
+            for chunk_results, chunk_memo_stats in executor.map(_build_chunk, chunks):
+                self.etree_memo_stats = MemoStats(*(
+                    total + chunk for total, chunk in zip(self.etree_memo_stats, chunk_memo_stats)))
+                for modifier_rows, build_status, log_records in chunk_results:
+                    for record in log_records:
+                        record_logger = getLogger(record.name)
+                        if record_logger.isEnabledFor(record.levelno):
+                            record_logger.handle(record)
+                    yield modifier_rows, build_status, [_get_log_entry(record) for record in log_records]
+
+
+class _RecordBuffer(Handler):
+    """
+    Log handler which stores records, used to pass them from
+    worker processes to parent and to remember log output of
+    modifier building.
+    """
+
+    def __init__(self):
+        super().__init__(level=DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        # Record is shared with other handlers, thus work on
+        # its copy. Format message in advance, as arguments
+        # and exception info may be not picklable
+        record = copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        self.records.append(record)
+
+
+# Builder instance, each worker process has its own
+_worker_builder = None
+_worker_log_buffer = None
+
+
+def _init_worker(expressions):
+    """Prepare worker process for building modifiers."""
+    global _worker_builder, _worker_log_buffer
+    _worker_builder = ModifierBuilder(expressions)
+    # Capture everything, parent process decides
+    # which records actually need to be emitted
+    _worker_log_buffer = _RecordBuffer()
+    root_logger = getLogger()
+    root_logger.handlers = [_worker_log_buffer]
+    root_logger.setLevel(DEBUG)
+
+
+def _build_chunk(effect_rows):
+    """
+    Build modifiers for chunk of effects in worker process.
+
+    Required arguments:
+    effect_rows -- list with effect rows
+
+    Return value:
+    Tuple with list of (modifier rows, build status, log records)
+    tuples, one per passed effect row, and counters of subtree
+    memoization accumulated during processing of the chunk
+    """
+    memo_stats_before = _worker_builder.etree_memo_stats
+    chunk_results = []
+    for effect_row in effect_rows:
+        _worker_log_buffer.records = []
+        modifiers, build_status = _worker_builder.build(effect_row)
+        modifier_rows = [_get_modifier_row(modifier) for modifier in modifiers]
+        chunk_results.append((modifier_rows, build_status, _worker_log_buffer.records))
+    memo_stats = MemoStats(*(
+        after - before for after, before in zip(_worker_builder.etree_memo_stats, memo_stats_before)))
+    return chunk_results, memo_stats
+
+
+def _get_modifier_row(modifier):
+    """Convert modifier into tuple with values of its fields."""
+    return tuple(getattr(modifier, field) for field in MODIFIER_FIELDS)
+
+
+def _get_log_entry(record):
+    """Convert log record into (logger name, level, message) tuple."""
+    return record.name, record.levelno, record.getMessage()
@@ -19,22 +19,54 @@
 # ===============================================================================
 
 
-from eos.util.frozen_dict import FrozenDict
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+
 from .checker import Checker
 from .cleaner import Cleaner
 from .converter import Converter
+from .modifier_builder import ModifierInfoCache
+from .profiler import GeneratorProfiler
+from .snapshot import TYPE_TABLES, BuildSnapshot, TypeRecord
+from .table import Table
+
+
+logger = getLogger(__name__)
 
 
 class CacheGenerator:
     """
     Refactors and optimizes data into format suitable
     for Eos.
+
+    Optional arguments:
+    workers -- when more than 1, generator runs in parallel mode:
+    tables are fetched concurrently, and modifiers are built by
+    pool of specified amount of processes. Output is the same
+    as in serial mode.
+    snapshot_path -- path to file where intermediate data of the run
+    is saved. If file contains data saved by previous run, only rows
+    of types touched by changes in data are normalized, cleaned and
+    converted, and only modifiers of effects touched by changes are
+    built; rows of other tables are processed in full.
+    modinfo_cache_path -- path to file where parsed modifier infos
+    are kept between runs.
+    report_path -- path to file where report about the run is
+    written as JSON, usually next to the cache file. Regardless of
+    this option, report is available in report attribute after run.
     """
 
-    def __init__(self):
+    def __init__(self, workers=1, snapshot_path=None, modinfo_cache_path=None, report_path=None):
+        self._workers = workers
+        self._snapshot_path = snapshot_path
+        self._report_path = report_path
+        self.report = None
+        # Modifier infos are needed by both cleaner and converter,
+        # thus parse them only once
+        self._modinfo_cache = ModifierInfoCache(path=modinfo_cache_path)
         self._checker = Checker()
-        self._cleaner = Cleaner()
-        self._converter = Converter()
+        self._cleaner = Cleaner(modinfo_cache=self._modinfo_cache)
+        self._converter = Converter(workers=workers, modinfo_cache=self._modinfo_cache)
 
     def run(self, data_handler):
         """
@@ -47,13 +79,6 @@ class CacheGenerator:
         Dictionary in {entity type: [{field name: field value}]
         format
         """
-        # Put all the data we need into single dictionary
-        # Format, as usual, {table name: table}, where table
-        # is set of rows, which are represented by frozendicts
-        # {fieldName: fieldValue}. Combination of sets and
-        # frozendicts is used to speed up several stages of
-        # the generator.
-        data = {}
         tables = {
             'evetypes': data_handler.get_evetypes,
             'evegroups': data_handler.get_evegroups,
@@ -64,39 +89,184 @@ class CacheGenerator:
             'dgmexpressions': data_handler.get_dgmexpressions
         }
 
-        for tablename, method in tables.items():
-            table_pos = 0
-            # For faster processing of various operations,
-            # freeze table rows and put them into set
-            table = set()
-            for row in method():
-                # During  further generator stages. some of rows
-                # may fall in risk groups, where all rows but one
-                # need to be removed. To deterministically remove rows
-                # based on position in original data, write position
-                # to each row
-                row['table_pos'] = table_pos
-                table_pos += 1
-                table.add(FrozenDict(row))
-            data[tablename] = table
+        # Put all the data we need into single dictionary
+        # Format, as usual, {table name: table}, where table
+        # stores rows in columnar format. Rows are referred
+        # to by their indices, which are positions of rows in
+        # original data; this way rows can be moved around and
+        # processed in deterministic order without hashing and
+        # copying them.
+        profiler = GeneratorProfiler()
+        if self._workers > 1:
+            # Fetching is mostly I/O-bound, so threads are enough
+            # to make table fetches overlap
+            with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+                futures = {
+                    n: executor.submit(profiler.run_stage, 'fetch {}'.format(n), None, self._fetch_table, n, m)
+                    for n, m in tables.items()
+                }
+                data = {n: f.result()[n] for n, f in futures.items()}
+        else:
+            data = {}
+            for n, m in tables.items():
+                data.update(profiler.run_stage('fetch {}'.format(n), None, self._fetch_table, n, m))
 
         # Run pre-cleanup checks, as cleaning and further stages
         # rely on some assumptions about the data
-        self._checker.pre_cleanup(data)
+        profiler.run_stage('pre-cleanup check', data, self._checker.pre_cleanup, data)
+
+        self._modinfo_cache.load()
+        if self._snapshot_path is None:
+            data = self._process(profiler, data)
+        else:
+            data = self._process_incremental(profiler, data)
+        self._modinfo_cache.dump()
 
-        # Also normalize the data to make data structure
-        # more consistent, and thus easier to clean properly
-        self._converter.normalize(data)
+        self.report = profiler.make_report(
+            data['effects'], self._cleaner.report, self._converter.etree_memo_stats)
+        if self._report_path is not None:
+            self.report.dump(self._report_path)
+
+        return data
+
+    def _process(self, profiler, data):
+        """
+        Normalize, clean and convert checked data.
+
+        Return value:
+        Converted data
+        """
+        # Normalize the data to make data structure more
+        # consistent, and thus easier to clean properly
+        profiler.run_stage('normalization', data, self._converter.normalize, data)
 
         # Clean our container out of unwanted data
-        self._cleaner.clean(data)
+        profiler.run_stage('cleanup', data, self._cleaner.clean, data)
 
         # Verify that our data is ready for conversion
-        self._checker.pre_convert(data)
+        profiler.run_stage('pre-conversion check', data, self._checker.pre_convert, data)
 
         # Convert data into Eos-specific format. Here tables are
-        # no longer represented by sets of frozendicts, but by
+        # no longer represented by columnar tables, but by
         # list of dicts
-        data = self._converter.convert(data)
+        return profiler.run_stage('conversion', data, self._converter.convert, data)
 
-        return data
+    def _process_incremental(self, profiler, data):
+        """
+        Normalize, clean and convert checked data, processing only
+        types touched by changes since previous run, and save
+        intermediate data for the next run.
+
+        Return value:
+        Converted data
+        """
+        snapshot = BuildSnapshot.load(self._snapshot_path)
+        digests = BuildSnapshot.hash_types(data)
+        group_categories = BuildSnapshot.get_group_categories(data)
+        if snapshot is None:
+            dirty_types = set(digests)
+            # Format: {type ID: TypeRecord}
+            old_records = {}
+        else:
+            dirty_types = snapshot.get_dirty_types(digests, group_categories)
+            old_records = dict(
+                (type_id, record) for type_id, record in snapshot.types.items()
+                if type_id in digests and type_id not in dirty_types
+            )
+        # Unchanged types take part in cleanup without their rows.
+        # If some of them are kept, but were never converted, they
+        # are processed along with changed types, which requires
+        # to process data again
+        while True:
+            if old_records:
+                subset = self._get_subset(data, dirty_types)
+            else:
+                subset = data
+            external_types = dict(
+                (type_id, (record.group, record.references)) for type_id, record in old_records.items()
+                if record.references is not None
+            )
+            profiler.run_stage('normalization', subset, self._converter.normalize, subset, name_data=data)
+            type_references = self._cleaner.get_type_references(subset)
+            profiler.run_stage('cleanup', subset, self._cleaner.clean, subset, external_types=external_types)
+            unconverted = set(
+                type_id for type_id in self._cleaner.kept_external_types
+                if old_records[type_id].row is None
+            )
+            if not unconverted:
+                break
+            dirty_types.update(unconverted)
+            for type_id in unconverted:
+                del old_records[type_id]
+        profiler.run_stage('pre-conversion check', subset, self._checker.pre_convert, subset)
+
+        # Compare rows which define modifiers against data of
+        # previous run, to know which effects do not need their
+        # modifiers rebuilt
+        row_hashes = BuildSnapshot.hash_rows(subset)
+        if snapshot is None:
+            reusable_builds = {}
+        else:
+            reusable_builds = snapshot.get_reusable_builds(subset, snapshot.diff(row_hashes))
+            msg = (
+                'diff against previous run: {} types out of {} changed; '
+                'reusing modifiers of {} effects out of {}'
+            ).format(len(dirty_types), len(digests), len(reusable_builds), len(subset['dgmeffects']))
+            logger.info(msg)
+
+        extra_types = [
+            record.row for type_id, record in old_records.items()
+            if type_id in self._cleaner.kept_external_types
+        ]
+        converted = profiler.run_stage(
+            'conversion', subset, self._converter.convert, subset,
+            reusable_builds=reusable_builds, keep_builds=True, extra_types=extra_types
+        )
+
+        # Format: {type ID: TypeRecord}
+        records = {}
+        type_rows = dict((row['type_id'], row) for row in converted['types'])
+        for type_id, digest in digests.items():
+            try:
+                records[type_id] = old_records[type_id]
+            except KeyError:
+                group, references = type_references.get(type_id, (None, None))
+                records[type_id] = TypeRecord(digest, group, references, type_rows.get(type_id))
+        snapshot = BuildSnapshot(records, group_categories, row_hashes, self._converter.effect_builds)
+        snapshot.dump(self._snapshot_path)
+        return converted
+
+    def _get_subset(self, data, type_ids):
+        """
+        Compose data out of rows of passed types and all rows of
+        tables which do not hold rows of types. Rows are copied to
+        new tables, thus passed data is not changed when composed
+        data is processed.
+
+        Return value:
+        Data in {table name: table} format
+        """
+        subset = {}
+        for table_name, table in data.items():
+            subset_table = subset[table_name] = Table()
+            if table_name in TYPE_TABLES:
+                type_column = table.column('typeID')
+                indices = (i for i in table if type_column[i] in type_ids)
+            else:
+                indices = table
+            for index in indices:
+                subset_table.append(table.row(index))
+        return subset
+
+    def _fetch_table(self, table_name, method):
+        """
+        Fetch table using passed data handler method.
+
+        Return value:
+        Dictionary with columnar table with fetched
+        rows, in {table name: table} format
+        """
+        table = Table()
+        for row in method():
+            table.append(row)
+        return {table_name: table}
@@ -26,3 +26,5 @@ which help it to work with raw data.
 
 
 from .builder import ModifierBuilder
+from .expression_tree import MemoStats
+from .modifier_info import ModifierInfoCache
@@ -33,18 +33,29 @@ class ModifierBuilder:
         self._tree = Effect2Modifiers(expressions)
         self._info = Info2Modifiers()
 
+    @property
+    def etree_memo_stats(self):
+        """
+        Return counters of expression subtree memoization,
+        accumulated over lifetime of builder.
+        """
+        return self._tree.memo_stats
+
     def build(self, effect_row):
         """
         Generate modifiers using passed data.
 
         Required arguments:
         effect_row -- effect row with effect category, pre-/post-
-        expression ID, modifier info data.
+        expression ID, modifier info data (YAML or parsed list).
 
         Return value:
         Tuple with list of modifiers and effect build status
         """
-        if effect_row['modifier_info']:
+        modifier_info = effect_row['modifier_info']
+        # Modifier info comes either as YAML or as already
+        # parsed list, empty YAML means there's no modifier info
+        if isinstance(modifier_info, list) or modifier_info:
             modifiers, build_status = self._info.convert(effect_row)
         # When no modifierInfo specified, use expression trees
         # to make modifiers
@@ -26,3 +26,4 @@ which help it to work with raw data.
 
 
 from .effect2modifiers import Effect2Modifiers
+from .etree2actions import MemoStats
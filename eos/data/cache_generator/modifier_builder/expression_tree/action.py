@@ -73,6 +73,38 @@ class Action:
         # set to true if required skill is carrier of modification
         self.tgt_skillrq_self = False
 
+    @property
+    def key(self):
+        """
+        Return hashable key of action. Key of action is equal
+        to mirror key of other action only when they are mirrors
+        of each other.
+        """
+        return (self.type,) + self._fields_key
+
+    @property
+    def mirror_key(self):
+        """Return key which mirrored version of action would have."""
+        try:
+            self_action_data = operand_data[self.type]
+        except KeyError:
+            self_action_mirror = None
+        else:
+            self_action_mirror = self_action_data.mirror
+        return (self_action_mirror,) + self._fields_key
+
+    @property
+    def _fields_key(self):
+        return (
+            self.src_attr,
+            self.operator,
+            self.tgt_attr,
+            self.domain,
+            self.tgt_group,
+            self.tgt_skillrq,
+            self.tgt_skillrq_self
+        )
+
     def is_mirror(self, other):
         """
         Check if passed action is mirrored version of self.
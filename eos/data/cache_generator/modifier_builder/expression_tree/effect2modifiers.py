@@ -41,6 +41,11 @@ class Effect2Modifiers:
     def __init__(self, expressions):
         self._etree2actions = ETree2Actions(expressions)
 
+    @property
+    def memo_stats(self):
+        """Return counters of expression subtree memoization."""
+        return self._etree2actions.memo_stats
+
     def convert(self, effect_row):
         """Generate Modifier objects out of passed data."""
         try:
@@ -86,25 +91,25 @@ class Effect2Modifiers:
             used_post_actions = set()
 
             # To get modifiers, we need two mirror actions, action which
-            # applies and action which undoes effect; cycle through
-            # pre-actions, which are applying ones
+            # applies and action which undoes effect; to avoid comparing
+            # each pre-action against each post-action, index post-actions
+            # by their keys, and look them up using mirror keys of pre-actions
+            # Format: {action key: [post-actions]}
+            keyed_post_actions = {}
+            for post_action in post_actions:
+                keyed_post_actions.setdefault(post_action.key, []).append(post_action)
             for pre_action in pre_actions:
-                # Cycle through post-actions
-                for post_action in post_actions:
-                    # Skip actions which we already used
-                    if post_action in used_post_actions:
-                        continue
-                    # If matching pre- and post-actions were detected
-                    if pre_action.is_mirror(post_action) is True:
-                        # Create actual modifier
-                        modifier = self._action_to_modifier(pre_action, effect_category_id)
-                        modifiers.append(modifier)
-                        # Mark used actions as used
-                        used_pre_actions.add(pre_action)
-                        used_post_actions.add(post_action)
-                        # We found  what we've been looking for in this
-                        # post_action loop, thus bail
-                        break
+                matching_post_actions = keyed_post_actions.get(pre_action.mirror_key)
+                # Skip pre-actions which have no unused mirrors
+                if not matching_post_actions:
+                    continue
+                post_action = matching_post_actions.pop()
+                # Create actual modifier
+                modifier = self._action_to_modifier(pre_action, effect_category_id)
+                modifiers.append(modifier)
+                # Mark used actions as used
+                used_pre_actions.add(pre_action)
+                used_post_actions.add(post_action)
 
             # If there're any actions which were not used for modifier
             # generation, mark current effect as partially parsed
@@ -19,6 +19,10 @@
 # ===============================================================================
 
 
+from collections import namedtuple
+from copy import copy
+from time import perf_counter
+
 from eos.const.eos import Domain, Operator
 from eos.const.eve import Operand
 from .action import Action
@@ -26,6 +30,21 @@ from .exception import ETree2ActionError, ExpressionFetchError, ActionValidation
 from .shared import operand_data, state_data
 
 
+class MemoStats(namedtuple('MemoStats', ('hits', 'misses', 'time_saved'))):
+    """
+    Counters of expression subtree memoization: amount of subtrees
+    taken from memo, amount of subtrees actually parsed and time
+    in seconds which would be spent on parsing memoized subtrees again.
+    """
+
+    @property
+    def reuse_rate(self):
+        total = self.hits + self.misses
+        if total == 0:
+            return 0
+        return self.hits / total
+
+
 class ETree2Actions:
     """
     Class is responsible for converting tree of Expression objects (which
@@ -38,6 +57,18 @@ class ETree2Actions:
         self._expressions = {}
         for exp_row in expressions:
             self._expressions[exp_row['expressionID']] = exp_row
+        # Results of parsing of subtrees, as many effects share
+        # parts of expression trees
+        # Format: {expression ID: (actions, skipped data flag, parse time)}
+        self._memo = {}
+        self._memo_hits = 0
+        self._memo_misses = 0
+        self._memo_time_saved = 0
+
+    @property
+    def memo_stats(self):
+        """Return MemoStats with counters of subtree memoization."""
+        return MemoStats(self._memo_hits, self._memo_misses, self._memo_time_saved)
 
     def convert(self, tree_root_id, effect_category_id):
         """
@@ -65,7 +96,39 @@ class ETree2Actions:
         return self._actions, self._skipped_data
 
     def _generic(self, expression):
-        """Generic entry point, used if we expect passed node to be meaningful"""
+        """
+        Generic entry point, used if we expect passed node to be meaningful.
+        Results of subtree parsing are memoized by ID of expression, thus
+        subtrees shared between effects are parsed only once.
+        """
+        expression_id = expression.get('expressionID')
+        try:
+            actions, skipped_data, parse_time = self._memo[expression_id]
+        except (KeyError, TypeError):
+            pass
+        else:
+            self._memo_hits += 1
+            self._memo_time_saved += parse_time
+            # Actions are stored in sets later, thus make sure
+            # each tree branch produces its own action objects
+            self._actions.extend(copy(action) for action in actions)
+            if skipped_data is True:
+                self._skipped_data = True
+            return
+        self._memo_misses += 1
+        parse_start = perf_counter()
+        actions_before = len(self._actions)
+        skipped_before = self._skipped_data
+        self._skipped_data = False
+        self._parse_generic(expression)
+        skipped_data = self._skipped_data
+        self._skipped_data = skipped_before or skipped_data
+        if expression_id is not None:
+            actions = tuple(copy(action) for action in self._actions[actions_before:])
+            self._memo[expression_id] = (actions, skipped_data, perf_counter() - parse_start)
+
+    def _parse_generic(self, expression):
+        """Parse node, whose result is not available in memo"""
         operand_id = expression.get('operandID')
         try:
             operand_meta = operand_data[operand_id]
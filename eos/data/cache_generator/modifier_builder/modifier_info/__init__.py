@@ -19,4 +19,5 @@
 # ===============================================================================
 
 
+from .cache import ModifierInfoCache, parse_modifier_info
 from .info2modifiers import Info2Modifiers
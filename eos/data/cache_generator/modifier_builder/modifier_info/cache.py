@@ -0,0 +1,140 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import bz2
+import json
+import os.path
+from logging import getLogger
+
+import yaml
+
+from eos import __version__ as eos_version
+
+
+logger = getLogger(__name__)
+
+
+# libyaml-based loader is several times faster than pure-Python
+# one, but it is not always available
+_yaml_loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def parse_modifier_info(modifier_info_yaml):
+    """
+    Parse modifier info YAML using the fastest available
+    safe loader.
+
+    Required arguments:
+    modifier_info_yaml -- string with YAML
+
+    Return value:
+    Parsed modifier info
+
+    Possible exceptions:
+    Any exception raised by YAML loader
+    """
+    return yaml.load(modifier_info_yaml, Loader=_yaml_loader)
+
+
+class ModifierInfoCache:
+    """
+    Storage of parsed modifier infos, shared between all
+    stages of cache generation which need modifier info
+    contents, so that YAML of each effect is parsed once.
+
+    Optional arguments:
+    path -- path to file where parsed modifier infos are
+    kept between runs; when not specified, they are kept
+    only in memory
+    """
+
+    def __init__(self, path=None):
+        self._path = path
+        # Entries are checked against YAML they were made from,
+        # thus changed modifier info is parsed again
+        # Format: {effect ID: (modifier info YAML, parsed modifier info)}
+        self._entries = {}
+
+    def get(self, effect_id, modifier_info_yaml):
+        """
+        Get parsed modifier info of effect.
+
+        Required arguments:
+        effect_id -- ID of effect
+        modifier_info_yaml -- modifier info YAML of effect
+
+        Return value:
+        Parsed modifier info
+
+        Possible exceptions:
+        Any exception raised by YAML loader; failures
+        are not cached
+        """
+        try:
+            entry_yaml, modifier_info = self._entries[effect_id]
+        except KeyError:
+            pass
+        else:
+            if entry_yaml == modifier_info_yaml:
+                return modifier_info
+        modifier_info = parse_modifier_info(modifier_info_yaml)
+        self._entries[effect_id] = (modifier_info_yaml, modifier_info)
+        return modifier_info
+
+    def load(self):
+        """Read parsed modifier infos persisted by previous run, if any."""
+        if self._path is None or not os.path.exists(self._path):
+            return
+        try:
+            with bz2.BZ2File(self._path, 'r') as file:
+                data = json.loads(file.read().decode('utf-8'))
+            # Other versions of Eos may use different loader
+            if data['eos_version'] != eos_version:
+                return
+            entries = {}
+            for effect_id, modifier_info_yaml, modifier_info in data['entries']:
+                entries[effect_id] = (modifier_info_yaml, modifier_info)
+        except (OSError, EOFError, ValueError, KeyError, TypeError):
+            msg = 'error during reading parsed modifier infos'
+            logger.error(msg)
+            return
+        entries.update(self._entries)
+        self._entries = entries
+
+    def dump(self):
+        """Persist parsed modifier infos, if path was specified."""
+        if self._path is None:
+            return
+        entries = []
+        for effect_id, (modifier_info_yaml, modifier_info) in sorted(self._entries.items()):
+            # YAML may contain data which cannot be represented
+            # by JSON as-is, do not persist such entries
+            try:
+                if json.loads(json.dumps(modifier_info)) != modifier_info:
+                    continue
+            except (TypeError, ValueError):
+                continue
+            entries.append([effect_id, modifier_info_yaml, modifier_info])
+        data = {'eos_version': eos_version, 'entries': entries}
+        cache_folder = os.path.dirname(self._path)
+        if cache_folder and os.path.isdir(cache_folder) is not True:
+            os.makedirs(cache_folder, mode=0o755)
+        with bz2.BZ2File(self._path, 'w') as file:
+            file.write(json.dumps(data).encode('utf-8'))
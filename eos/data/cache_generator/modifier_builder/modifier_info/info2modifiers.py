@@ -18,12 +18,12 @@
 # ===============================================================================
 
 
-import yaml
 from logging import getLogger
 
 from eos.const.eos import State, Domain, EffectBuildStatus, Scope, FilterType, Operator
 from eos.const.eve import EffectCategory
 from eos.data.cache_object import Modifier
+from .cache import parse_modifier_info
 from .exception import *
 
 
@@ -133,18 +133,20 @@ class Info2Modifiers:
         try:
             # Assume everything goes as we want
             build_status = EffectBuildStatus.ok_full
-            # Parse modifierInfo field (which is actually YAML)
-            modifier_infos_yaml = effect_row['modifier_info']
-            try:
-                modifier_infos = yaml.safe_load(modifier_infos_yaml)
-            except KeyboardInterrupt:
-                raise
-            except Exception:
-                effect_id = effect_row['effect_id']
-                msg = 'failed to parse modifier info YAML for effect {}'.format(effect_id)
-                logger.error(msg)
-                # We cannot recover any data in this case, thus return empty list
-                return (), EffectBuildStatus.error
+            # Parse modifierInfo field (which is actually YAML), unless
+            # it has been parsed already
+            modifier_infos = effect_row['modifier_info']
+            if isinstance(modifier_infos, str):
+                try:
+                    modifier_infos = parse_modifier_info(modifier_infos)
+                except KeyboardInterrupt:
+                    raise
+                except Exception:
+                    effect_id = effect_row['effect_id']
+                    msg = 'failed to parse modifier info YAML for effect {}'.format(effect_id)
+                    logger.error(msg)
+                    # We cannot recover any data in this case, thus return empty list
+                    return (), EffectBuildStatus.error
             # Go through modifier objects and attempt to convert them one-by-one
             modifiers = []
             for modifier_info in modifier_infos:
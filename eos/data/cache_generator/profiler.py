@@ -0,0 +1,160 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import json
+import os.path
+import sys
+from collections import namedtuple
+from time import perf_counter
+
+from eos.const.eos import EffectBuildStatus
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# Stats of single generator stage: its name, wall time in seconds,
+# growth of peak resident set size in bytes (None if it cannot be
+# measured on current platform), and amounts of rows in tables before
+# and after stage in {table name: rows} format
+StageStats = namedtuple('StageStats', ('name', 'time', 'rss_delta', 'rows_in', 'rows_out'))
+
+
+class GeneratorProfiler:
+    """
+    Collects stats of cache generator stages and composes
+    report out of them.
+    """
+
+    def __init__(self):
+        self.stages = []
+
+    def run_stage(self, name, data, method, *args, **kwargs):
+        """
+        Run generator stage and record its stats.
+
+        Required arguments:
+        name -- name of stage
+        data -- data stage works on, in {table name: table} format,
+        or None if stage has no input data
+        method -- method which runs stage; if it returns something
+        besides None, returned value is considered as stage's output
+        data, else passed data is
+
+        Return value:
+        Value returned by method
+        """
+        rows_in = _count_rows(data)
+        rss_before = _get_peak_rss()
+        time_before = perf_counter()
+        result = method(*args, **kwargs)
+        time = perf_counter() - time_before
+        rss_after = _get_peak_rss()
+        rss_delta = rss_after - rss_before if rss_before is not None else None
+        rows_out = _count_rows(result if result is not None else data)
+        self.stages.append(StageStats(name, time, rss_delta, rows_in, rows_out))
+        return result
+
+    def make_report(self, effects, cleanup_stages, etree_memo_stats):
+        """
+        Compose report about generator run.
+
+        Required arguments:
+        effects -- list with converted effect rows
+        cleanup_stages -- stats of cleanup stages
+        etree_memo_stats -- expression subtree memoization stats
+
+        Return value:
+        GeneratorReport instance
+        """
+        build_statuses = {status: 0 for status in EffectBuildStatus}
+        for effect_row in effects:
+            build_status = effect_row['build_status']
+            build_statuses[build_status] = build_statuses.get(build_status, 0) + 1
+        return GeneratorReport(self.stages, build_statuses, cleanup_stages, etree_memo_stats)
+
+
+class GeneratorReport:
+    """
+    Report about cache generator run.
+
+    Required arguments:
+    stages -- list with StageStats of generator stages
+    build_statuses -- amounts of effects per build status,
+    in {EffectBuildStatus: amount} format
+    cleanup_stages -- list with stats of cleanup stages
+    etree_memo_stats -- expression subtree memoization stats
+    """
+
+    def __init__(self, stages, build_statuses, cleanup_stages, etree_memo_stats):
+        self.stages = stages
+        self.build_statuses = build_statuses
+        self.cleanup_stages = cleanup_stages
+        self.etree_memo_stats = etree_memo_stats
+
+    def to_dict(self):
+        """Convert report into JSON-compatible dictionary."""
+        return {
+            'stages': [stage._asdict() for stage in self.stages],
+            'build_statuses': {
+                getattr(status, 'name', str(status)): amount
+                for status, amount in self.build_statuses.items()
+            },
+            'cleanup_stages': [stage._asdict() for stage in self.cleanup_stages],
+            'etree_memo': {
+                'hits': self.etree_memo_stats.hits,
+                'misses': self.etree_memo_stats.misses,
+                'time_saved': self.etree_memo_stats.time_saved,
+                'reuse_rate': self.etree_memo_stats.reuse_rate
+            }
+        }
+
+    def dump(self, path):
+        """
+        Write report to disk as JSON.
+
+        Required arguments:
+        path -- path to report file
+        """
+        report_folder = os.path.dirname(path)
+        if report_folder and os.path.isdir(report_folder) is not True:
+            os.makedirs(report_folder, mode=0o755)
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2, sort_keys=True)
+
+
+def _count_rows(data):
+    """Get amounts of rows in {table name: table} container."""
+    if data is None:
+        return {}
+    return {table_name: len(table) for table_name, table in data.items()}
+
+
+def _get_peak_rss():
+    """Get peak resident set size of current process in bytes."""
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports value in bytes, other systems - in kilobytes
+    if sys.platform == 'darwin':
+        return peak_rss
+    return peak_rss * 1024
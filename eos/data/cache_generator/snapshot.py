@@ -0,0 +1,321 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import bz2
+import json
+import os.path
+from collections import namedtuple
+from hashlib import md5
+from logging import getLogger
+
+from eos import __version__ as eos_version
+from .checker import PRIMARY_KEYS
+
+
+logger = getLogger(__name__)
+
+
+# Tables which hold rows of types; everything type relies on
+# besides category of its group is defined by its rows there
+TYPE_TABLES = ('evetypes', 'dgmtypeattribs', 'dgmtypeeffects')
+
+# Tables whose rows define modifiers of effects
+BUILD_TABLES = ('dgmeffects', 'dgmexpressions')
+
+
+# Data kept about single type: digest of its rows, ID of its
+# group and references to other entities its rows make (both
+# None if type has no row in evetypes), and converted type row
+# (None if type has never been converted)
+TypeRecord = namedtuple('TypeRecord', ('digest', 'group', 'references', 'row'))
+
+# Sentinel for values which are not defined
+_MISSING = object()
+
+
+class BuildSnapshot:
+    """
+    Intermediate results of cache generator run, which are kept
+    between runs so that next run normalizes, cleans and converts
+    only rows of types touched by changes in new data dump, and
+    builds only modifiers of effects touched by them. Rows of other
+    tables are few compared to rows of types, and are processed
+    in full on every run.
+
+    Required arguments:
+    types -- records of types, in {type ID: TypeRecord} format
+    group_categories -- categories of groups, in {group ID:
+    category ID} format
+    row_hashes -- hashes of rows of cleaned tables which define
+    modifiers, in {table name: {primary key: row hash}} format
+    effect_builds -- results of modifier building, in {effect ID:
+    (modifier rows, build status, log entries)} format; here, modifier
+    rows are tuples with modifier field values, and log entries are
+    (logger name, log level, message) tuples
+    """
+
+    def __init__(self, types, group_categories, row_hashes, effect_builds):
+        self.types = types
+        self.group_categories = group_categories
+        self.row_hashes = row_hashes
+        self.effect_builds = effect_builds
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read snapshot from disk.
+
+        Required arguments:
+        path -- path to snapshot file
+
+        Return value:
+        Snapshot, or None if there's no valid snapshot made by
+        this version of Eos at specified path
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with bz2.BZ2File(path, 'r') as file:
+                data = json.loads(file.read().decode('utf-8'))
+            # Snapshots made by other versions of Eos cannot be
+            # relied upon, as processing of data may differ
+            if data['eos_version'] != eos_version:
+                return None
+            types = {}
+            for type_id, digest, group, references, row in data['types']:
+                if references is not None:
+                    references = [tuple(reference) for reference in references]
+                if row is not None:
+                    row['attributes'] = dict(row['attributes'])
+                types[type_id] = TypeRecord(digest, group, references, row)
+            group_categories = dict(data['group_categories'])
+            row_hashes = {}
+            for table_name, table_hashes in data['row_hashes'].items():
+                row_hashes[table_name] = {tuple(pk): row_hash for pk, row_hash in table_hashes}
+            effect_builds = {}
+            for effect_id, modifier_rows, build_status, log_entries in data['effect_builds']:
+                effect_builds[effect_id] = (
+                    [tuple(row) for row in modifier_rows],
+                    build_status,
+                    [tuple(entry) for entry in log_entries]
+                )
+        except (OSError, EOFError, ValueError, KeyError, TypeError):
+            msg = 'error during reading generator snapshot'
+            logger.error(msg)
+            return None
+        return cls(types, group_categories, row_hashes, effect_builds)
+
+    def dump(self, path):
+        """
+        Write snapshot to disk.
+
+        Required arguments:
+        path -- path to snapshot file
+        """
+        types = []
+        for type_id, (digest, group, references, row) in self.types.items():
+            # Keys of JSON objects are strings, thus store
+            # attributes as list of pairs
+            if row is not None:
+                row = dict(row, attributes=list(row['attributes'].items()))
+            types.append([type_id, digest, group, references, row])
+        data = {
+            'eos_version': eos_version,
+            'types': types,
+            'group_categories': list(self.group_categories.items()),
+            'row_hashes': {
+                table_name: [[list(pk), row_hash] for pk, row_hash in table_hashes.items()]
+                for table_name, table_hashes in self.row_hashes.items()
+            },
+            'effect_builds': [
+                [effect_id, modifier_rows, build_status, log_entries]
+                for effect_id, (modifier_rows, build_status, log_entries) in self.effect_builds.items()
+            ]
+        }
+        cache_folder = os.path.dirname(path)
+        if cache_folder and os.path.isdir(cache_folder) is not True:
+            os.makedirs(cache_folder, mode=0o755)
+        with bz2.BZ2File(path, 'w') as file:
+            file.write(json.dumps(data).encode('utf-8'))
+
+    @staticmethod
+    def hash_types(data):
+        """
+        Calculate digests of rows of all types in passed data.
+
+        Required arguments:
+        data -- data in {table name: table} format
+
+        Return value:
+        Dictionary in {type ID: digest} format
+        """
+        # Format: {type ID: hash object}
+        type_hashes = {}
+        for table_name in TYPE_TABLES:
+            table = data[table_name]
+            type_ids = table.column('typeID')
+            for index in table:
+                type_id = type_ids[index]
+                try:
+                    type_hash = type_hashes[type_id]
+                except KeyError:
+                    type_hash = type_hashes[type_id] = md5()
+                fields = sorted(table.row(index).items())
+                type_hash.update(repr((table_name, fields)).encode('utf-8'))
+        return {type_id: type_hash.hexdigest() for type_id, type_hash in type_hashes.items()}
+
+    @staticmethod
+    def get_group_categories(data):
+        """
+        Get categories of all groups in passed data.
+
+        Required arguments:
+        data -- data in {table name: table} format
+
+        Return value:
+        Dictionary in {group ID: category ID} format
+        """
+        evegroups = data['evegroups']
+        return {evegroups.get(index, 'groupID'): evegroups.get(index, 'categoryID') for index in evegroups}
+
+    def get_dirty_types(self, digests, group_categories):
+        """
+        Find out which types have to be processed again. Type is
+        dirty when its rows have been changed, or when category
+        of its group has been changed.
+
+        Required arguments:
+        digests -- digests of rows of types of new data
+        group_categories -- categories of groups of new data
+
+        Return value:
+        Set with type IDs
+        """
+        old_categories = self.group_categories
+        changed_groups = set(
+            group_id for group_id in set(group_categories).union(old_categories)
+            if group_categories.get(group_id, _MISSING) != old_categories.get(group_id, _MISSING)
+        )
+        dirty_types = set()
+        for type_id, digest in digests.items():
+            record = self.types.get(type_id)
+            if record is None or record.digest != digest or record.group in changed_groups:
+                dirty_types.add(type_id)
+        return dirty_types
+
+    @staticmethod
+    def hash_rows(data):
+        """
+        Calculate hashes of all rows which define modifiers.
+
+        Required arguments:
+        data -- data in {table name: table} format
+
+        Return value:
+        Dictionary in {table name: {primary key: row hash}} format
+        """
+        row_hashes = {}
+        for table_name in BUILD_TABLES:
+            key_names = PRIMARY_KEYS[table_name]
+            table_hashes = row_hashes[table_name] = {}
+            table = data[table_name]
+            for index in table:
+                row = table.row(index)
+                pk = tuple(row[key_name] for key_name in key_names)
+                fields = sorted(row.items())
+                table_hashes[pk] = md5(repr(fields).encode('utf-8')).hexdigest()
+        return row_hashes
+
+    def diff(self, row_hashes):
+        """
+        Compare rows of snapshot and passed row hashes.
+
+        Required arguments:
+        row_hashes -- row hashes of new data
+
+        Return value:
+        Dictionary in {table name: (added keys, removed keys,
+        changed keys)} format
+        """
+        diff = {}
+        for table_name, new_hashes in row_hashes.items():
+            old_hashes = self.row_hashes.get(table_name, {})
+            added = set(new_hashes).difference(old_hashes)
+            removed = set(old_hashes).difference(new_hashes)
+            changed = set(
+                pk for pk in set(new_hashes).intersection(old_hashes)
+                if new_hashes[pk] != old_hashes[pk]
+            )
+            diff[table_name] = (added, removed, changed)
+        return diff
+
+    def get_reusable_builds(self, data, diff):
+        """
+        Find out results of which modifier builds can be reused
+        with new data. Build of effect is reusable when neither
+        effect row, nor any expressions of its expression trees
+        have been touched by the diff.
+
+        Required arguments:
+        data -- new cleaned data in {table name: table} format
+        diff -- diff between snapshot and new data
+
+        Return value:
+        Dictionary in {effect ID: (modifier rows, build status,
+        log entries)} format
+        """
+        touched_effects = set(pk[0] for pk in diff['dgmeffects'][0] | diff['dgmeffects'][2])
+        touched_expressions = set(pk[0] for keys in diff['dgmexpressions'] for pk in keys)
+        dgmexpressions = data['dgmexpressions']
+        # Format: {expression ID: (arg1, arg2)}
+        expressions = {}
+        for index in dgmexpressions:
+            expression_id = dgmexpressions.get(index, 'expressionID')
+            expressions[expression_id] = (dgmexpressions.get(index, 'arg1'), dgmexpressions.get(index, 'arg2'))
+        dgmeffects = data['dgmeffects']
+        reusable = {}
+        for index in dgmeffects:
+            effect_id = dgmeffects.get(index, 'effectID')
+            if effect_id in touched_effects or effect_id not in self.effect_builds:
+                continue
+            tree_root_ids = (dgmeffects.get(index, 'preExpression'), dgmeffects.get(index, 'postExpression'))
+            if self._tree_touched(tree_root_ids, expressions, touched_expressions):
+                continue
+            reusable[effect_id] = self.effect_builds[effect_id]
+        return reusable
+
+    def _tree_touched(self, tree_root_ids, expressions, touched_expressions):
+        """
+        Check if any expression of expression trees with
+        passed roots has been touched by the diff.
+        """
+        visited = set()
+        stack = [i for i in tree_root_ids if i is not None]
+        while stack:
+            expression_id = stack.pop()
+            if expression_id in visited:
+                continue
+            visited.add(expression_id)
+            if expression_id in touched_expressions:
+                return True
+            for arg in expressions.get(expression_id, ()):
+                if arg is not None:
+                    stack.append(arg)
+        return False
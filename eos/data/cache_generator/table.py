@@ -0,0 +1,170 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+class Table:
+    """
+    Columnar storage for rows of single table. Values are kept in
+    per-column lists, and each row is identified by its index - its
+    position in the list of added rows, which for data fetched from
+    data handler is position of row in original data. Rows are not
+    deleted from columns, table just tracks indices of rows which
+    are currently present in it, so that rows can be moved between
+    actual data and other containers by index.
+    """
+
+    # Sentinel for fields which are not defined in a row;
+    # it is different from None, which is valid value
+    MISSING = object()
+
+    def __init__(self):
+        # Format: {column name: [values]}
+        self.columns = {}
+        # Amount of rows ever added to table
+        self.size = 0
+        # Indices of rows which are currently in table
+        self.rows = set()
+        # Sorted list of indices of rows which are in table,
+        # None when it has to be built again
+        self.__order = None
+
+    def append(self, row):
+        """
+        Add row to table.
+
+        Required arguments:
+        row -- dictionary in {field name: field value} format
+
+        Return value:
+        Index of added row
+        """
+        index = self.size
+        columns = self.columns
+        for column_name in row:
+            if column_name not in columns:
+                columns[column_name] = [Table.MISSING] * index
+        for column_name, column in columns.items():
+            column.append(row.get(column_name, Table.MISSING))
+        self.size += 1
+        self.rows.add(index)
+        # New row always has the highest index
+        if self.__order is not None:
+            self.__order.append(index)
+        return index
+
+    def column(self, column_name):
+        """
+        Get list with values of column. If there's no such
+        column, read-only column which returns MISSING sentinel
+        for any row is returned.
+        """
+        try:
+            return self.columns[column_name]
+        except KeyError:
+            return _MISSING_COLUMN
+
+    def get(self, index, column_name, default=None):
+        """
+        Get value of field, or default if it's not defined.
+        """
+        try:
+            value = self.columns[column_name][index]
+        except KeyError:
+            return default
+        if value is Table.MISSING:
+            return default
+        return value
+
+    def set(self, index, column_name, value):
+        """
+        Set value of field.
+        """
+        try:
+            column = self.columns[column_name]
+        except KeyError:
+            column = self.columns[column_name] = [Table.MISSING] * self.size
+        column[index] = value
+
+    def update(self, column_name, values):
+        """
+        Set values of multiple fields of the same column.
+
+        Required arguments:
+        column_name -- name of column to update
+        values -- dictionary in {row index: value} format
+        """
+        try:
+            column = self.columns[column_name]
+        except KeyError:
+            column = self.columns[column_name] = [Table.MISSING] * self.size
+        for index, value in values.items():
+            column[index] = value
+
+    def drop_column(self, column_name):
+        """
+        Remove column from table, if it exists.
+        """
+        self.columns.pop(column_name, None)
+
+    def row(self, index):
+        """
+        Compose dictionary out of fields defined for row.
+
+        Return value:
+        Dictionary in {field name: field value} format
+        """
+        return {
+            column_name: column[index]
+            for column_name, column in self.columns.items()
+            if column[index] is not Table.MISSING
+        }
+
+    def discard(self, indices):
+        """
+        Remove rows with passed indices from table.
+        """
+        self.rows.difference_update(indices)
+        self.__order = None
+
+    def restore(self, indices):
+        """
+        Put rows with passed indices, which were removed
+        earlier, back to table.
+        """
+        self.rows.update(indices)
+        self.__order = None
+
+    def __iter__(self):
+        """Iterate over indices of rows in table, in order of their addition."""
+        if self.__order is None:
+            self.__order = sorted(self.rows)
+        return iter(self.__order)
+
+    def __len__(self):
+        return len(self.rows)
+
+
+class _MissingColumn:
+    """Read-only column, which has no fields defined."""
+
+    def __getitem__(self, index):
+        return Table.MISSING
+
+
+_MISSING_COLUMN = _MissingColumn()
@@ -50,6 +50,43 @@ class BaseCacheHandler(metaclass=ABCMeta):
     def get_fingerprint(self):
         ...
 
+    def get_type_hash(self, type_id):
+        """
+        Get hash of data which defines type, including its effects
+        and modifiers. Types with equal hashes in different cache
+        handlers are expected to behave the same way.
+
+        Required arguments:
+        type_id -- ID of type
+
+        Return value:
+        Hash as string, or None if it is not available
+        """
+        return None
+
+    def get_attributes_hash(self):
+        """
+        Get hash of metadata of all attributes.
+
+        Return value:
+        Hash as string, or None if it is not available
+        """
+        return None
+
+    def get_compatible_charges(self, type_id):
+        """
+        Get charges which can be loaded into type, as
+        defined by charge group, size and volume rules.
+
+        Required arguments:
+        type_id -- ID of container type
+
+        Return value:
+        Tuple with charge type IDs, or None if index is
+        not available
+        """
+        return None
+
     @abstractmethod
     def update_cache(self, data, fingerprint):
         """
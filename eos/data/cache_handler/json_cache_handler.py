@@ -22,9 +22,11 @@
 import bz2
 import json
 import os.path
+from hashlib import md5
 from logging import getLogger
 from weakref import WeakValueDictionary
 
+from eos.const.eve import Attribute as AttributeId
 from eos.data.cache_object import *
 from eos.util.repr import make_repr_str
 from .abc import BaseCacheHandler
@@ -43,16 +45,45 @@ class JsonCacheHandler(BaseCacheHandler):
 
     Required arguments:
     cache_path -- file name where on-disk cache will be stored (.json.bz2)
+
+    Optional arguments:
+    slim -- when True, cache is written using slim profile: types
+    keep only values of attributes which are used by Eos (referenced
+    by modifiers, effects or listed in keep_attributes), and values
+    equal to attribute's default value are dropped, as attribute
+    calculation falls back to default anyway
+    keep_attributes -- iterable with IDs of attributes whose values
+    are kept in slim profile in addition to ones Eos uses, e.g. those
+    which are displayed to user. Presence of these attributes on types
+    is preserved, i.e. their default values are not dropped
     """
 
-    def __init__(self, cache_path):
+    def __init__(self, cache_path, slim=False, keep_attributes=()):
         self._cache_path = os.path.abspath(cache_path)
+        self._slim = slim
+        # Attributes which Eos may check for presence on item,
+        # thus values of these are never dropped
+        self._keep_attributes = set(AttributeId).union(keep_attributes)
+        # Cache made using different profile is not valid
+        # for this handler
+        if slim is True:
+            kept_ids = ','.join(str(attr_id) for attr_id in sorted(self._keep_attributes))
+            self._profile = 'slim_{}'.format(md5(kept_ids.encode('utf-8')).hexdigest())
+        else:
+            self._profile = 'full'
         # Initialize memory data cache
         self.__type_data_cache = {}
         self.__attribute_data_cache = {}
         self.__effect_data_cache = {}
         self.__modifier_data_cache = {}
+        # Format: {container type ID: [charge type IDs]}, None
+        # when cache was made without charge index
+        self.__charge_index_cache = None
         self.__fingerprint = None
+        # Hashes are calculated on demand
+        # Format: {type ID: hash}
+        self.__type_hash_cache = {}
+        self.__attributes_hash = None
         # Initialize weakref object cache
         self.__type_obj_cache = WeakValueDictionary()
         self.__attribute_obj_cache = WeakValueDictionary()
@@ -67,12 +98,10 @@ class JsonCacheHandler(BaseCacheHandler):
             with bz2.BZ2File(self._cache_path, 'r') as file:
                 json_data = file.read().decode('utf-8')
                 data = json.loads(json_data)
-        except KeyboardInterrupt:
-            raise
         # If file doesn't exist, JSON load errors occur, or
         # anything else bad happens, do not load anything
         # and leave values as initialized
-        except:
+        except Exception:
             msg = 'error during reading cache'
             logger.error(msg)
         # Load data into data cache, if no errors occurred
@@ -189,11 +218,49 @@ class JsonCacheHandler(BaseCacheHandler):
     def get_fingerprint(self):
         return self.__fingerprint
 
+    def get_type_hash(self, type_id):
+        try:
+            return self.__type_hash_cache[type_id]
+        except KeyError:
+            pass
+        try:
+            type_data = self.__type_data_cache[str(type_id)]
+        except KeyError:
+            return None
+        effect_ids = list(type_data[3])
+        if type_data[4] is not None:
+            effect_ids.append(type_data[4])
+        effects_data = []
+        modifiers_data = []
+        for effect_id in effect_ids:
+            effect_data = self.__effect_data_cache.get(str(effect_id))
+            effects_data.append(effect_data)
+            if effect_data is None:
+                continue
+            for modifier_id in effect_data[10]:
+                modifiers_data.append(self.__modifier_data_cache.get(str(modifier_id)))
+        content = json.dumps((type_data, effects_data, modifiers_data))
+        type_hash = md5(content.encode('utf-8')).hexdigest()
+        self.__type_hash_cache[type_id] = type_hash
+        return type_hash
+
+    def get_attributes_hash(self):
+        if self.__attributes_hash is None:
+            content = json.dumps(self.__attribute_data_cache, sort_keys=True)
+            self.__attributes_hash = md5(content.encode('utf-8')).hexdigest()
+        return self.__attributes_hash
+
+    def get_compatible_charges(self, type_id):
+        if self.__charge_index_cache is None:
+            return None
+        return tuple(self.__charge_index_cache.get(str(type_id), ()))
+
     def update_cache(self, data, fingerprint):
         # Make light version of data and add fingerprint
         # to it
         data = self.__strip_data(data)
         data['fingerprint'] = fingerprint
+        data['profile'] = self._profile
         # Update disk cache
         cache_folder = os.path.dirname(self._cache_path)
         if os.path.isdir(cache_folder) is not True:
@@ -215,13 +282,21 @@ class JsonCacheHandler(BaseCacheHandler):
         """
         slim_data = {}
 
+        if self._slim is True:
+            attr_filter = self.__get_slim_attr_filter(data)
+        else:
+            attr_filter = None
+
         slim_types = {}
         for type_row in data['types']:
             type_id = type_row['type_id']
+            type_attrs = type_row['attributes'].items()
+            if attr_filter is not None:
+                type_attrs = filter(attr_filter, type_attrs)
             slim_types[type_id] = (
                 type_row['group'],
                 type_row['category'],
-                tuple(type_row['attributes'].items()),  # Dictionary -> tuple
+                tuple(type_attrs),  # Dictionary -> tuple
                 tuple(type_row['effects']),  # List -> tuple
                 type_row['default_effect']
             )
@@ -271,8 +346,51 @@ class JsonCacheHandler(BaseCacheHandler):
             )
         slim_data['modifiers'] = slim_modifiers
 
+        # Charge index is absent in data made by older generators
+        if 'compatible_charges' in data:
+            slim_charges = {}
+            for index_row in data['compatible_charges']:
+                slim_charges[index_row['type_id']] = tuple(index_row['charges'])
+            slim_data['compatible_charges'] = slim_charges
+
         return slim_data
 
+    def __get_slim_attr_filter(self, data):
+        """
+        Compose filter for (attribute ID, value) pairs of types,
+        which tells which pairs are needed in slim profile.
+        """
+        defaults = {}
+        for attr_row in data['attributes']:
+            defaults[attr_row['attribute_id']] = attr_row['default_value']
+        # Attributes which are read by attribute calculator, their
+        # values on types are needed only when they differ from default
+        calculated_attrs = set()
+        for modifier_row in data['modifiers']:
+            calculated_attrs.add(modifier_row['src_attr'])
+            calculated_attrs.add(modifier_row['tgt_attr'])
+        for effect_row in data['effects']:
+            for field in (
+                'duration_attribute', 'discharge_attribute', 'range_attribute',
+                'falloff_attribute', 'tracking_speed_attribute', 'fitting_usage_chance_attribute'
+            ):
+                calculated_attrs.add(effect_row[field])
+        # Attributes which cap values of calculated attributes
+        for attr_row in data['attributes']:
+            if attr_row['attribute_id'] in calculated_attrs:
+                calculated_attrs.add(attr_row['max_attribute'])
+        keep_attributes = self._keep_attributes
+
+        def attr_filter(attr_entry):
+            attr_id, value = attr_entry
+            if attr_id in keep_attributes:
+                return True
+            if attr_id in calculated_attrs:
+                return value != defaults.get(attr_id)
+            return False
+
+        return attr_filter
+
     def __update_mem_cache(self, data):
         """
         Loads data into memory data cache.
@@ -284,14 +402,22 @@ class JsonCacheHandler(BaseCacheHandler):
         self.__attribute_data_cache = data['attributes']
         self.__effect_data_cache = data['effects']
         self.__modifier_data_cache = data['modifiers']
-        self.__fingerprint = data['fingerprint']
+        self.__charge_index_cache = data.get('compatible_charges')
+        # Report no fingerprint if cache was made using different
+        # profile, so that cache is regenerated
+        if data.get('profile', 'full') == self._profile:
+            self.__fingerprint = data['fingerprint']
+        else:
+            self.__fingerprint = None
         # Also clear object cache to make sure objects composed
         # from old data are gone
+        self.__type_hash_cache.clear()
+        self.__attributes_hash = None
         self.__type_obj_cache.clear()
         self.__attribute_obj_cache.clear()
         self.__effect_obj_cache.clear()
         self.__modifier_obj_cache.clear()
 
     def __repr__(self):
-        spec = [['cache_path', '_cache_path']]
+        spec = [['cache_path', '_cache_path'], ['slim', '_slim']]
         return make_repr_str(self, spec)
@@ -21,7 +21,7 @@
 
 from eos.const.eos import Slot, State
 from eos.const.eve import Attribute, Effect, EffectCategory
-from eos.util.cached_property import CachedProperty
+from eos.util.cached_property import SlotCachedProperty
 
 
 class Type:
@@ -30,6 +30,14 @@ class Type:
     incursion system-wide effects are actually items.
     """
 
+    # Many types are kept in memory, thus they do not
+    # carry instance dictionary
+    __slots__ = (
+        'id', 'group', 'category', 'attributes', 'effects', 'default_effect',
+        '_cached_required_skills', '_cached_max_state', '_cached_is_targeted',
+        '_cached_slots', '__weakref__'
+    )
+
     def __init__(
         self,
         type_id=None,
@@ -79,7 +87,7 @@ class Type:
         Attribute.required_skill_6: Attribute.required_skill_6_level
     }
 
-    @CachedProperty
+    @SlotCachedProperty
     def required_skills(self):
         """
         Get skill requirements.
@@ -103,7 +111,7 @@ class Type:
             required_skills[int(srq)] = int(srq_lvl)
         return required_skills
 
-    @CachedProperty
+    @SlotCachedProperty
     def max_state(self):
         """
         Get highest state this type is allowed to take.
@@ -121,7 +129,7 @@ class Type:
             max_state = max(max_state, effect._state)
         return max_state
 
-    @CachedProperty
+    @SlotCachedProperty
     def is_targeted(self):
         """
         Report if type is targeted or not. Targeted types cannot be
@@ -150,7 +158,7 @@ class Type:
         Effect.subsystem: Slot.subsystem
     }
 
-    @CachedProperty
+    @SlotCachedProperty
     def slots(self):
         """
         Get types of slots this type occupies.
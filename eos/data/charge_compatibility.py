@@ -0,0 +1,102 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+"""
+Rules which define if charge can be loaded into container. They
+operate on original item data, thus can be used both by fit
+restriction registers and during data processing.
+"""
+
+
+from eos.const.eve import Attribute
+
+
+CHARGE_GROUP_ATTRS = (
+    Attribute.charge_group_1,
+    Attribute.charge_group_2,
+    Attribute.charge_group_3,
+    Attribute.charge_group_4,
+    Attribute.charge_group_5
+)
+
+
+def get_allowed_charge_groups(container_attrs):
+    """
+    Get groups of charges which container can load.
+
+    Required arguments:
+    container_attrs -- map with original container
+    attributes, in {attribute ID: value} format
+
+    Return value:
+    Tuple with allowed charge group IDs; empty tuple
+    means that container does not restrict charge group
+    """
+    allowed_groups = set()
+    for restriction_attr in CHARGE_GROUP_ATTRS:
+        allowed_groups.add(container_attrs.get(restriction_attr))
+    allowed_groups.discard(None)
+    return tuple(allowed_groups)
+
+
+def charge_group_fits(container_attrs, charge_group):
+    """Check if container can load charge of passed group."""
+    allowed_groups = get_allowed_charge_groups(container_attrs)
+    return not allowed_groups or charge_group in allowed_groups
+
+
+def charge_size_fits(container_attrs, charge_attrs):
+    """
+    Check if charge size matches container size. If container
+    does not specify size, charge of any size can be loaded.
+    """
+    if Attribute.charge_size not in container_attrs:
+        return True
+    return container_attrs[Attribute.charge_size] == charge_attrs.get(Attribute.charge_size)
+
+
+def charge_volume_fits(container_attrs, charge_attrs):
+    """
+    Check if single charge fits into container. Volume and
+    capacity are assumed to be 0 when not specified.
+    """
+    return charge_attrs.get(Attribute.volume, 0) <= container_attrs.get(Attribute.capacity, 0)
+
+
+def is_charge_compatible(container_attrs, charge_group, charge_attrs):
+    """
+    Check if charge can be loaded into container.
+
+    Required arguments:
+    container_attrs -- map with original container
+    attributes, in {attribute ID: value} format
+    charge_group -- group ID of charge
+    charge_attrs -- map with original charge attributes,
+    in {attribute ID: value} format
+
+    Return value:
+    True if charge passes group, size and volume checks,
+    else False
+    """
+    return (
+        charge_group_fits(container_attrs, charge_group) and
+        charge_size_fits(container_attrs, charge_attrs) and
+        charge_volume_fits(container_attrs, charge_attrs)
+    )
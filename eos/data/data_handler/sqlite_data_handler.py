@@ -19,6 +19,7 @@
 
 
 import sqlite3
+from urllib.request import pathname2url
 
 from eos.util.repr import make_repr_str
 from .abc import BaseDataHandler
@@ -28,16 +29,48 @@ from .abc import BaseDataHandler
 sqlite3.register_converter('BOOLEAN', lambda v: int(v) == 1)
 
 
+# Columns which are actually used by cache generator, all others (like
+# descriptions or names in languages we do not use) are not even requested
+# from database. Names are needed by converter to resolve symbolic references
+# in expressions
+PROJECTIONS = {
+    'evetypes': ('typeID', 'groupID', 'typeName_en-us', 'radius', 'mass', 'volume', 'capacity'),
+    'evegroups': ('groupID', 'categoryID', 'groupName_en-us'),
+    'dgmattribs': ('attributeID', 'attributeName', 'maxAttributeID', 'defaultValue', 'highIsGood', 'stackable'),
+    'dgmtypeattribs': ('typeID', 'attributeID', 'value'),
+    'dgmeffects': (
+        'effectID', 'effectCategory', 'isOffensive', 'isAssistance', 'durationAttributeID',
+        'dischargeAttributeID', 'rangeAttributeID', 'falloffAttributeID', 'trackingSpeedAttributeID',
+        'fittingUsageChanceAttributeID', 'preExpression', 'postExpression', 'modifierInfo'
+    ),
+    'dgmtypeeffects': ('typeID', 'effectID', 'isDefault'),
+    'dgmexpressions': (
+        'expressionID', 'operandID', 'arg1', 'arg2', 'expressionValue',
+        'expressionTypeID', 'expressionGroupID', 'expressionAttributeID'
+    )
+}
+
+
 class SQLiteDataHandler(BaseDataHandler):
     """
     Handler for loading data from SQLite database. Data should be in Phobos-like
     format, for details on it refer to JSON data handler doc string.
+
+    Database is opened in read-only mode, and only columns needed by
+    cache generator are requested. Rows are not materialized all at
+    once, table getters return iterators which stream rows from database.
+
+    Required arguments:
+    dbpath -- path to SQLite database file
+
+    Optional arguments:
+    mmap_size -- amount of bytes of database file which SQLite is allowed
+    to memory-map, by default memory-mapped I/O is not used
     """
 
-    def __init__(self, dbpath):
-        conn = sqlite3.connect(dbpath, detect_types=sqlite3.PARSE_DECLTYPES)
-        conn.row_factory = sqlite3.Row
-        self.cursor = conn.cursor()
+    def __init__(self, dbpath, mmap_size=None):
+        self.dbpath = dbpath
+        self.mmap_size = mmap_size
 
     def get_evetypes(self):
         return self.__fetch_table('evetypes')
@@ -61,15 +94,56 @@ class SQLiteDataHandler(BaseDataHandler):
         return self.__fetch_table('dgmexpressions')
 
     def __fetch_table(self, tablename):
-        self.cursor.execute('SELECT * FROM {}'.format(tablename))
-        return [dict(row) for row in self.cursor]
+        """
+        Stream rows of requested table, limited to columns
+        generator needs.
+
+        Required arguments:
+        tablename -- name of table to fetch
+
+        Return value:
+        iterator over rows in {column name: value} format
+        """
+        conn = self.__connect()
+        try:
+            # Dumps of different age have slightly different set of
+            # columns, so request only those which are actually there
+            present = set(row['name'] for row in conn.execute('PRAGMA table_info({})'.format(tablename)))
+            columns = tuple(c for c in PROJECTIONS[tablename] if c in present)
+            cursor = conn.execute('SELECT {} FROM {}'.format(
+                ', '.join('"{}"'.format(c) for c in columns),
+                tablename
+            ))
+            for row in cursor:
+                yield dict(zip(columns, row))
+        finally:
+            conn.close()
 
     def get_version(self):
-        self.cursor.execute('SELECT field_value FROM phbmetadata WHERE field_name = "client_build"')
-        for row in self.cursor:
-            return row[0]
-        else:
-            return None
+        conn = self.__connect()
+        try:
+            cursor = conn.execute('SELECT field_value FROM phbmetadata WHERE field_name = "client_build"')
+            for row in cursor:
+                return row[0]
+            else:
+                return None
+        finally:
+            conn.close()
+
+    def __connect(self):
+        """
+        Open new read-only connection to database. Every fetch uses
+        its own connection, so that several tables can be streamed
+        at the same time.
+        """
+        uri = 'file:{}?mode=ro'.format(pathname2url(self.dbpath))
+        conn = sqlite3.connect(uri, uri=True, detect_types=sqlite3.PARSE_DECLTYPES)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA query_only = ON')
+        if self.mmap_size is not None:
+            conn.execute('PRAGMA mmap_size = {:d}'.format(self.mmap_size))
+        return conn
 
     def __repr__(self):
-        return make_repr_str(self, ())
+        spec = ['dbpath']
+        return make_repr_str(self, spec)
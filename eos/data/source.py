@@ -50,7 +50,7 @@ class SourceManager:
     default = None
 
     @classmethod
-    def add(cls, alias, data_handler, cache_handler, make_default=False):
+    def add(cls, alias, data_handler, cache_handler, make_default=False, cache_generator=None):
         """
         Add source to source manager - this includes initializing
         all facilities hidden behind name 'source'. After source
@@ -66,6 +66,9 @@ class SourceManager:
         Optional arguments:
         make_default -- marks passed source default; it will be used
         by default for instantiating new fits
+        cache_generator -- cache generator to use if cache needs to be
+        updated, e.g. one set up to run in parallel mode; if not specified,
+        generator with default settings is used
         """
         logger.info('adding source with alias "{}"'.format(alias))
         if alias in cls._sources:
@@ -86,7 +89,9 @@ class SourceManager:
                 logger.info(msg)
 
             # Generate cache, apply customizations and write it
-            cache_data = CacheGenerator().run(data_handler)
+            if cache_generator is None:
+                cache_generator = CacheGenerator()
+            cache_data = cache_generator.run(data_handler)
             CacheCustomizer().run_builtin(cache_data)
             cache_handler.update_cache(cache_data, current_fp)
 
@@ -19,4 +19,7 @@
 # ===============================================================================
 
 
+from .change import ChargeChange, EquipChange, StateChange
 from .fit import Fit
+from .frozen import FrozenFit
+from .pool import FitPool
@@ -24,5 +24,6 @@ from collections import namedtuple
 
 # Each affector must have 2 components - carrier holder (source data
 # for changes and unique identifier) and modifier (which describes whom and
-# how to modify), this tuple represents it
+# how to modify), this tuple represents it. Named tuples have no
+# instance dictionary, thus affectors are as compact as slotted objects
 Affector = namedtuple('Affector', ('source_holder', 'modifier'))
@@ -84,6 +84,10 @@ MULTIPLICATIONS = (
     Operator.post_percent
 )
 
+# Marks attributes which had no calculated value, used
+# when map reports its changes to fit overlay
+_NOT_CALCULATED = object()
+
 # Following attributes have limited precision - only
 # to second number after point
 LIMITED_PRECISION = (
@@ -102,6 +106,9 @@ class MutableAttributeMap:
     holder -- holder, to which this map is assigned
     """
 
+    # Every holder has its own map
+    __slots__ = ('__holder', '__modified_attributes', '_cap_map', '__shared')
+
     def __init__(self, holder):
         # Reference to holder for internal needs
         self.__holder = holder
@@ -114,6 +121,9 @@ class MutableAttributeMap:
         # when needed.
         # Format {capping attribute ID: {capped attribute IDs}}
         self._cap_map = None
+        # When set, containers above are shared with maps of
+        # holder copies, and should be copied before changing
+        self.__shared = False
 
     def __getitem__(self, attr):
         # Special handling for skill level attribute
@@ -137,6 +147,8 @@ class MutableAttributeMap:
             val = self.__modified_attributes[attr]
         # Else, we have to run full calculation process
         except KeyError:
+            self.__record(attr)
+            self.__unshare()
             try:
                 val = self.__modified_attributes[attr] = self.__calculate(attr)
             except BaseValueError as e:
@@ -166,21 +178,67 @@ class MutableAttributeMap:
             yield k
 
     def __delitem__(self, attr):
+        # Do nothing if value wasn't calculated
+        if attr not in self.__modified_attributes:
+            return
+        # Fit overlay which is being discarded puts all
+        # values back on its own
+        overlay = getattr(self.__holder._fit, '_calc_overlay', None)
+        if overlay is not None and overlay.reverting:
+            return
+        self.__record(attr)
+        self.__unshare()
         # Clear the value in our calculated attributes dictionary
-        try:
-            del self.__modified_attributes[attr]
-        # Do nothing if it wasn't calculated
-        except KeyError:
-            pass
+        del self.__modified_attributes[attr]
         # And make sure all other attributes relying on it
         # are cleared too
-        else:
-            self.__holder._fit._link_tracker.clear_holder_attribute_dependents(self.__holder, attr)
+        self.__holder._fit._link_tracker.clear_holder_attribute_dependents(self.__holder, attr)
+        self.__clear_volatile_dependents(attr)
 
     def __setitem__(self, attr, value):
         # Write value and clear all attributes relying on it
+        self.__record(attr)
+        self.__unshare()
         self.__modified_attributes[attr] = value
         self.__holder._fit._link_tracker.clear_holder_attribute_dependents(self.__holder, attr)
+        self.__clear_volatile_dependents(attr)
+
+    def __record(self, attr):
+        """
+        Report value of attribute which is about to change to
+        fit overlay, if fit has any.
+        """
+        overlay = getattr(self.__holder._fit, '_calc_overlay', None)
+        if overlay is not None:
+            overlay.record_attr(self, attr, self.__modified_attributes.get(attr, _NOT_CALCULATED))
+
+    def _restore(self, values):
+        """
+        Put back values reported to fit overlay, without
+        touching anything relying on them.
+
+        Required arguments:
+        values -- dictionary with values in {attribute ID: value} format
+        """
+        self.__unshare()
+        modified_attributes = self.__modified_attributes
+        for attr, value in values.items():
+            if value is _NOT_CALCULATED:
+                modified_attributes.pop(attr, None)
+            else:
+                modified_attributes[attr] = value
+
+    def __clear_volatile_dependents(self, attr):
+        """
+        Notify holder that value of attribute has changed, so
+        that it could drop data it cached using this attribute.
+        """
+        try:
+            method = self.__holder._clear_volatile_dependents
+        except AttributeError:
+            pass
+        else:
+            method(attr)
 
     def get(self, attr, default=None):
         try:
@@ -194,9 +252,57 @@ class MutableAttributeMap:
 
     def clear(self):
         """Reset map to its initial state."""
-        self.__modified_attributes.clear()
+        if self.__shared:
+            self.__modified_attributes = {}
+            self.__shared = False
+        else:
+            self.__modified_attributes.clear()
         self._cap_map = None
 
+    def _drop_calculated(self, old_item_attrs=None):
+        """
+        Remove calculated values along with everything relying
+        on them. Used when holder switches to another item.
+
+        Optional arguments:
+        old_item_attrs -- base attributes of item holder used
+        before switch; if passed, only values whose base value
+        differs from base value of current item are removed,
+        else all values are removed
+        """
+        item_attrs = self.__holder.item.attributes
+        for attr in tuple(self.__modified_attributes):
+            if old_item_attrs is not None and old_item_attrs.get(attr) == item_attrs.get(attr):
+                continue
+            del self[attr]
+
+    def _share(self, other):
+        """
+        Make map use calculated values of map of other holder, until
+        either of maps changes them. Used when both holders are
+        identical and belong to fits in the same state, to avoid
+        calculating the same values again.
+
+        Required arguments:
+        other -- attribute map to share values with
+        """
+        self.__modified_attributes = other.__modified_attributes
+        self._cap_map = other._cap_map
+        self.__shared = other.__shared = True
+
+    def __unshare(self):
+        """
+        Make sure containers of map can be changed without
+        affecting maps it shares them with.
+        """
+        if not self.__shared:
+            return
+        self.__modified_attributes = dict(self.__modified_attributes)
+        cap_map = self._cap_map
+        if cap_map is not None:
+            self._cap_map = KeyedSet((k, set(v)) for k, v in cap_map.items())
+        self.__shared = False
+
     def __calculate(self, attr):
         """
         Run calculations to find the actual value of attribute.
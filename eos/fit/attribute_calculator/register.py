@@ -23,6 +23,7 @@ from logging import getLogger
 
 from eos.const.eos import Domain, FilterType
 from eos.util.keyed_set import KeyedSet
+from .affector import Affector
 from .exception import DirectDomainError, FilteredDomainError, FilteredSelfReferenceError, FilterTypeError
 
 
@@ -233,6 +234,40 @@ class LinkRegister:
             affectors.update(self.__affector_domain_skill.get((domain, skill)) or set())
         return affectors
 
+    def _copy(self, fit, holder_map):
+        """
+        Make register for other fit, which has copies of holders
+        of this fit, with the same links between them.
+
+        Required arguments:
+        fit -- fit to bind new register to
+        holder_map -- dictionary in {holder: holder copy} format
+
+        Return value:
+        New register
+        """
+        def translate(obj):
+            if isinstance(obj, Affector):
+                return Affector(holder_map[obj.source_holder], obj.modifier)
+            # Keys are either holders, or domains and their
+            # combinations with groups or skills
+            return holder_map.get(obj, obj)
+
+        register = LinkRegister(fit)
+        for keyed_set, keyed_set_copy in (
+            (self.__affectee_domain, register.__affectee_domain),
+            (self.__affectee_domain_group, register.__affectee_domain_group),
+            (self.__affectee_domain_skill, register.__affectee_domain_skill),
+            (self.__affector_domain, register.__affector_domain),
+            (self.__affector_domain_group, register.__affector_domain_group),
+            (self.__affector_domain_skill, register.__affector_domain_skill),
+            (self.__active_direct_affectors, register.__active_direct_affectors),
+            (self.__disabled_direct_affectors, register.__disabled_direct_affectors)
+        ):
+            for key, data_set in keyed_set.items():
+                keyed_set_copy[translate(key)] = set(translate(data) for data in data_set)
+        return register
+
     # General-purpose auxiliary methods
     def __get_affectee_maps(self, target_holder):
         """
@@ -551,3 +586,47 @@ class LinkRegister:
             return holder.container
         else:
             return None
+
+
+class LinkRegisterView:
+    """
+    Read-only view over link register of other fit, which presents
+    its data in terms of holder copies. Fit copies use it until
+    links of either fit change, after that they make their own
+    register out of view.
+
+    Required arguments:
+    tracker -- link tracker which owns register
+    holder_map -- dictionary in {holder: holder copy} format
+    """
+
+    def __init__(self, tracker, holder_map):
+        self.tracker = tracker
+        self.holder_map = holder_map
+        # Format: {holder copy: holder}
+        self.__reverse_map = {c: h for h, c in holder_map.items()}
+
+    def get_affectees(self, affector):
+        source_holder, modifier = affector
+        holder_map = self.holder_map
+        affector = Affector(self.__reverse_map[source_holder], modifier)
+        return set(holder_map[h] for h in self.tracker._register.get_affectees(affector))
+
+    def get_affectors(self, target_holder):
+        holder_map = self.holder_map
+        return set(
+            Affector(holder_map[a.source_holder], a.modifier)
+            for a in self.tracker._register.get_affectors(self.__reverse_map[target_holder])
+        )
+
+    def fork(self, fit):
+        """
+        Make regular register with data of view.
+
+        Required arguments:
+        fit -- fit to bind register to
+
+        Return value:
+        New register
+        """
+        return self.tracker._register._copy(fit, self.holder_map)
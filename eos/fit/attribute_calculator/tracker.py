@@ -19,9 +19,11 @@
 # ===============================================================================
 
 
-from eos.const.eos import Scope
+from weakref import WeakSet
+
+from eos.const.eos import FilterType, Scope
 from .affector import Affector
-from .register import LinkRegister
+from .register import LinkRegister, LinkRegisterView
 
 
 class LinkTracker:
@@ -38,7 +40,43 @@ class LinkTracker:
 
     def __init__(self, fit):
         self._fit = fit
+        # Either register or view over register of other tracker
         self._register = LinkRegister(fit)
+        # Trackers which use view over register of this tracker
+        # Format: {trackers}
+        self.__sharers = WeakSet()
+
+    def _share(self, tracker, holder_map):
+        """
+        Make tracker use links registered by tracker of other fit,
+        until links of either fit change.
+
+        Required arguments:
+        tracker -- tracker of fit, which has the same links between
+        its holders as fit of this tracker
+        holder_map -- dictionary which maps holders of other fit to
+        holders of this fit, in {holder: holder copy} format
+        """
+        view = tracker._register
+        # Views are always made over actual register
+        if isinstance(view, LinkRegisterView):
+            tracker = view.tracker
+            holder_map = {h: holder_map[c] for h, c in view.holder_map.items()}
+        self._register = LinkRegisterView(tracker, holder_map)
+        tracker.__sharers.add(self)
+
+    def __unshare(self):
+        """
+        Make sure links can be changed without affecting other fits:
+        tracker makes its own register if it uses view, and trackers
+        which use view over its register make their own registers.
+        """
+        register = self._register
+        if isinstance(register, LinkRegisterView):
+            register.tracker.__sharers.discard(self)
+            self._register = register.fork(self._fit)
+        for tracker in tuple(self.__sharers):
+            tracker.__unshare()
 
     def get_affectors(self, holder, attr=None):
         """
@@ -85,6 +123,7 @@ class LinkTracker:
         Required arguments:
         holder -- holder which is added to tracker
         """
+        self.__unshare()
         self._register.register_affectee(holder)
 
     def remove_holder(self, holder):
@@ -95,6 +134,7 @@ class LinkTracker:
         Required arguments:
         holder -- holder which is removed from tracker
         """
+        self.__unshare()
         self._register.unregister_affectee(holder)
 
     def enable_states(self, holder, states):
@@ -106,6 +146,7 @@ class LinkTracker:
         states -- iterable with states, which are passed
         during state switch, except for initial state
         """
+        self.__unshare()
         processed_scopes = (Scope.local,)
         enabled_affectors = self.__generate_affectors(
             holder, state_filter=states, scope_filter=processed_scopes)
@@ -123,6 +164,7 @@ class LinkTracker:
         states -- iterable with states, which are passed
         during state switch, except for final state
         """
+        self.__unshare()
         processed_scopes = (Scope.local,)
         disabled_affectors = self.__generate_affectors(
             holder, state_filter=states, scope_filter=processed_scopes)
@@ -132,6 +174,93 @@ class LinkTracker:
         for affector in disabled_affectors:
             self._register.unregister_affector(affector)
 
+    def switch_states(self, switches):
+        """
+        Handle state switch of multiple holders at once. Unlike
+        series of enable_states/disable_states calls, each
+        dependent attribute is cleared just once for the whole
+        set of changes.
+
+        Required arguments:
+        switches -- iterable with (holder, enabled states,
+        disabled states) tuples; states are defined the same
+        way as for enable_states and disable_states
+        """
+        self.__unshare()
+        processed_scopes = (Scope.local,)
+        enabled_affectors = set()
+        disabled_affectors = set()
+        for holder, enabled_states, disabled_states in switches:
+            if enabled_states:
+                enabled_affectors.update(self.__generate_affectors(
+                    holder, state_filter=enabled_states, scope_filter=processed_scopes))
+            if disabled_states:
+                disabled_affectors.update(self.__generate_affectors(
+                    holder, state_filter=disabled_states, scope_filter=processed_scopes))
+        # Affectees of disabled affectors have to be collected
+        # before unregistering, and affectees of enabled ones -
+        # after registration
+        # Format: {(target holder, target attribute ID)}
+        dependents = self.__get_affectors_dependents(disabled_affectors)
+        for affector in disabled_affectors:
+            self._register.unregister_affector(affector)
+        for affector in enabled_affectors:
+            self._register.register_affector(affector)
+        dependents.update(self.__get_affectors_dependents(enabled_affectors))
+        for target_holder, attr in dependents:
+            del target_holder.attributes[attr]
+
+    def switch_item(self, holder, item, states):
+        """
+        Replace item of tracked holder. Links which are the same
+        for both items are kept, and only calculated attributes
+        which rely on modifiers of old or new item, or on base
+        values which differ between items, are cleared.
+
+        Required arguments:
+        holder -- holder, for which item is replaced
+        item -- new item
+        states -- iterable with states enabled for holder
+        """
+        self.__unshare()
+        processed_scopes = (Scope.local,)
+        old_item = holder.item
+        old_affectors = self.__generate_affectors(
+            holder, state_filter=states, scope_filter=processed_scopes)
+        # Holders with the same group and skill requirements are
+        # targeted by the same affectors of other holders
+        affectee_changed = (
+            old_item.group != item.group or
+            set(old_item.required_skills) != set(item.required_skills)
+        )
+        new_affectors = self.__generate_affectors(
+            holder, state_filter=states, scope_filter=processed_scopes, item=item)
+        # Affectors which filter targets using item of source
+        # holder are different even when modifier is the same
+        kept_affectors = set(
+            a for a in old_affectors.intersection(new_affectors)
+            if a.modifier.filter_type != FilterType.skill_self
+        )
+        removed_affectors = old_affectors.difference(kept_affectors)
+        added_affectors = new_affectors.difference(kept_affectors)
+        # Registers rely on old item data when unregistering
+        self.__clear_affectors_dependents(removed_affectors)
+        for affector in removed_affectors:
+            self._register.unregister_affector(affector)
+        if affectee_changed:
+            self._register.unregister_affectee(holder)
+        holder.item = item
+        if affectee_changed:
+            self._register.register_affectee(holder)
+            holder.attributes._drop_calculated()
+        else:
+            # Kept affectors rely on attributes of holder, thus
+            # their targets are cleared when source values change
+            holder.attributes._drop_calculated(old_item_attrs=old_item.attributes)
+        for affector in added_affectors:
+            self._register.register_affector(affector)
+        self.__clear_affectors_dependents(added_affectors)
+
     def clear_holder_attribute_dependents(self, holder, attr):
         """
         Clear calculated attributes relying on passed attribute.
@@ -169,7 +298,24 @@ class LinkTracker:
                 # And remove target attribute
                 del target_holder.attributes[affector.modifier.tgt_attr]
 
-    def __generate_affectors(self, holder, state_filter=None, scope_filter=None):
+    def __get_affectors_dependents(self, affectors):
+        """
+        Get calculated attributes relying on affectors.
+
+        Required arguments:
+        affectors -- iterable with affectors in question
+
+        Return value:
+        Set with (holder, attribute ID) tuples
+        """
+        dependents = set()
+        for affector in affectors:
+            tgt_attr = affector.modifier.tgt_attr
+            for target_holder in self.get_affectees(affector):
+                dependents.add((target_holder, tgt_attr))
+        return dependents
+
+    def __generate_affectors(self, holder, state_filter=None, scope_filter=None, item=None):
         """
         Get all affectors spawned by holder.
 
@@ -183,12 +329,16 @@ class LinkTracker:
         scope_filter -- filter results by affector's required state,
         which should be in this iterable; if None, no filtering
         occurs (default None)
+        item -- item, whose modifiers are used; if None, item
+        of holder is used (default None)
 
         Return value:
         Set with Affector objects, satisfying passed filters
         """
+        if item is None:
+            item = holder.item
         affectors = set()
-        for modifier in holder.item.modifiers:
+        for modifier in item.modifiers:
             if state_filter is not None and modifier.state not in state_filter:
                 continue
             if scope_filter is not None and modifier.scope not in scope_filter:
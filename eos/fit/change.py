@@ -0,0 +1,115 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from abc import ABCMeta, abstractmethod
+
+from .holder.container import HolderList
+
+
+class FitChange(metaclass=ABCMeta):
+    """
+    Base class for changes which can be previewed on fit.
+    Change knows how to apply itself, and how to undo it
+    afterwards.
+    """
+
+    @abstractmethod
+    def _apply(self, fit):
+        ...
+
+    @abstractmethod
+    def _revert(self, fit):
+        ...
+
+
+class EquipChange(FitChange):
+    """
+    Add holder to container of fit; holder is put into
+    first free slot of ordered containers.
+
+    Required arguments:
+    container -- fit container, e.g. fit.modules.high or fit.drones
+    holder -- holder to add, which is not assigned to any fit
+    """
+
+    def __init__(self, container, holder):
+        self.container = container
+        self.holder = holder
+
+    def _apply(self, fit):
+        if isinstance(self.container, HolderList):
+            self.container.equip(self.holder)
+        else:
+            self.container.add(self.holder)
+
+    def _revert(self, fit):
+        if isinstance(self.container, HolderList):
+            self.container.free(self.holder)
+        else:
+            self.container.remove(self.holder)
+
+
+class StateChange(FitChange):
+    """
+    Switch state of holder.
+
+    Required arguments:
+    holder -- holder assigned to fit
+    state -- state which holder should take
+    """
+
+    def __init__(self, holder, state):
+        self.holder = holder
+        self.state = state
+        self.__old_state = None
+
+    def _apply(self, fit):
+        self.__old_state = self.holder.state
+        self.holder.state = self.state
+
+    def _revert(self, fit):
+        self.holder.state = self.__old_state
+
+
+class ChargeChange(FitChange):
+    """
+    Load charge of another type into holder. Currently
+    loaded charge holder is kept, only its item is replaced.
+
+    Required arguments:
+    holder -- holder assigned to fit, which can have charge
+    type_id -- type ID of charge to load
+    """
+
+    def __init__(self, holder, type_id):
+        self.holder = holder
+        self.type_id = type_id
+        self.__old_type_id = None
+
+    def _apply(self, fit):
+        charge = self.holder.charge
+        self.__old_type_id = None if charge is None else charge._type_id
+        self.holder.swap_charge(self.type_id)
+
+    def _revert(self, fit):
+        if self.__old_type_id is None:
+            self.holder.charge = None
+        else:
+            self.holder.swap_charge(self.__old_type_id)
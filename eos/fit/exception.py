@@ -38,6 +38,14 @@ class HolderAlreadyAssignedError(HolderAddError):
     pass
 
 
+class FitFrozenError(EosError):
+    """
+    Raised on attempt to change fit which does not
+    allow changes.
+    """
+    pass
+
+
 class HolderRemoveError(EosError):
     """
     Base class for exceptions which occur during
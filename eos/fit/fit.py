@@ -20,17 +20,69 @@
 
 
 from eos.const.eos import State
-from eos.const.eve import Type
+from eos.const.eve import Attribute, Type
 from eos.data.source import SourceManager, Source
+from eos.util.override import copy_overrides
 from eos.util.repr import make_repr_str
+from eos.util.volatile_cache import copy_volatile_attrs
 from .attribute_calculator import LinkTracker
 from .exception import HolderAlreadyAssignedError, HolderFitMismatchError
 from .holder.container import HolderDescriptorOnFit, HolderList, HolderRestrictedSet, HolderSet, ModuleRacks
+from .holder.mixin.state import MutableStateMixin
+from .overlay import CalcOverlay
 from .restriction_tracker import RestrictionTracker
+from .restriction_tracker.register.ship_type_group import GROUP_RESTRICTION_ATTRS, TYPE_RESTRICTION_ATTRS
 from .stat_tracker import StatTracker
+from .tuples import StatDelta
 from .holder.item import *
 
 
+# Sets of states which are enabled for holder in given state;
+# None stands for holder which is not registered in services
+# Format: {state: states}
+_STATES_UP_TO = {state: frozenset(s for s in State if s <= state) for state in State}
+_STATES_UP_TO[None] = frozenset()
+
+
+# Sets of states which are passed during state switch
+# Format: {(old state, new state): (enabled states, disabled states)}
+_STATE_TRANSITIONS = {
+    (old_state, new_state): (
+        _STATES_UP_TO[new_state] - _STATES_UP_TO[old_state],
+        _STATES_UP_TO[old_state] - _STATES_UP_TO[new_state]
+    )
+    for old_state in _STATES_UP_TO for new_state in _STATES_UP_TO
+}
+
+
+# Attributes whose values, not just presence, are used
+# by registers when holder is registered
+_REGISTRATION_VALUE_ATTRS = (
+    Attribute.subsystem_slot,
+    Attribute.implantness,
+    Attribute.boosterness,
+    *TYPE_RESTRICTION_ATTRS,
+    *GROUP_RESTRICTION_ATTRS
+)
+
+
+def _get_registration_data(item):
+    """
+    Get item data which restriction and stat registers rely on
+    when registering holder. When it's the same for two items,
+    holder can switch between them without re-registration.
+    """
+    item_attrs = item.attributes
+    return (
+        item.group,
+        item.category,
+        frozenset(item.required_skills),
+        frozenset(item.slots),
+        frozenset(item_attrs),
+        tuple(item_attrs.get(attr) for attr in _REGISTRATION_VALUE_ATTRS)
+    )
+
+
 class Fit:
     """
     Fit holds all fit items and facilities to calculate their attributes.
@@ -57,9 +109,15 @@ class Fit:
         # Service containers
         self._holders = set()
         self._volatile_holders = set()
+        # Amount of volatile values which survived cleanups
+        self._volatile_recomputations_avoided = 0
+        # Overlay over calculation state, which is open
+        # while fit is changed temporarily
+        self._calc_overlay = None
         # Initialize services
         self._link_tracker = LinkTracker(self)  # Tracks links between holders assigned to fit
-        self._restriction_tracker = RestrictionTracker(self)  # Tracks various restrictions related to given fitting
+        # Tracks various restrictions related to given fitting
+        self._restriction_tracker = self._make_restriction_tracker()
         self.stats = StatTracker(self)  # Access point for all the fitting stats
         # Use default source, unless specified otherwise
         if source is None:
@@ -69,6 +127,9 @@ class Fit:
         # cases, initialize it here
         self.character = Character(Type.character_static)
 
+    def _make_restriction_tracker(self):
+        return RestrictionTracker(self)
+
     ship = HolderDescriptorOnFit('_ship', Ship)
     stance = HolderDescriptorOnFit('_stance', Stance)
     character = HolderDescriptorOnFit('_character', Character)
@@ -86,11 +147,245 @@ class Fit:
         """
         self._restriction_tracker.validate(skip_checks)
 
+    def reset(self, source=None):
+        """
+        Return fit to the state of newly created fit, reusing
+        its containers and services instead of making new ones.
+
+        Optional arguments:
+        source -- source to use for this fit
+        """
+        # Without source, holders are removed without involving
+        # any services, which are cleared during source switch
+        self.source = None
+        self.ship = None
+        self.stance = None
+        self.effect_beacon = None
+        for container in (
+            self.skills,
+            self.implants,
+            self.boosters,
+            self.subsystems,
+            self.modules.high,
+            self.modules.med,
+            self.modules.low,
+            self.rigs,
+            self.drones
+        ):
+            container.clear()
+        self._request_volatile_cleanup(source_check=False)
+        self._volatile_recomputations_avoided = 0
+        if source is None:
+            source = SourceManager.default
+        self.source = source
+        self.character = Character(Type.character_static)
+
+    def set_states(self, states):
+        """
+        Switch states of multiple holders at once. Unlike setting
+        states one by one, fit volatile data and attributes
+        relying on switched holders are cleared just once.
+
+        Required arguments:
+        states -- map in {holder: state} format
+
+        Possible exceptions:
+        ValueError -- raised when some holder doesn't belong
+        to this fit
+        TypeError -- raised when some holder cannot change state
+        """
+        switches = {}
+        for holder, new_state in states.items():
+            if holder._fit is not self:
+                raise ValueError(holder)
+            if not isinstance(holder, MutableStateMixin):
+                raise TypeError(holder)
+            if holder.state != new_state:
+                switches[holder] = new_state
+        if len(switches) == 0:
+            return
+        self._holders_state_switch(switches)
+        for holder, new_state in switches.items():
+            holder._apply_state(new_state)
+
+    def set_rack_state(self, rack, state, holder_filter=None):
+        """
+        Switch states of all holders within rack at once.
+
+        Required arguments:
+        rack -- iterable with holders, e.g. fit.modules.high,
+        fit.drones or fit.modules.holders(); empty slots are
+        skipped
+        state -- state, which holders should take
+
+        Optional arguments:
+        holder_filter -- callable which takes holder and returns
+        True if its state should be switched; if None, all
+        holders are switched (default None)
+
+        Possible exceptions:
+        TypeError -- raised when some holder cannot change state
+        """
+        states = {}
+        for holder in rack:
+            if holder is None:
+                continue
+            if holder_filter is not None and not holder_filter(holder):
+                continue
+            states[holder] = state
+        self.set_states(states)
+
+    def clone(self):
+        """
+        Make clone of fit. Clone has the same source and copies of
+        all holders, with their states, charges, skill levels and
+        overrides. Clone is independent from this fit, but it doesn't
+        register links between holders and doesn't calculate values
+        again: it uses links and calculated values of this fit, and
+        makes its own copy of them only when they are about to change
+        on either fit.
+
+        Return value:
+        New fit
+        """
+        fit_clone = Fit(source=None)
+        fit_clone.source = None
+        # Format: {holder: holder copy}
+        holder_map = {}
+        for attr_name in ('ship', 'stance', 'character', 'effect_beacon'):
+            holder = getattr(self, attr_name)
+            setattr(fit_clone, attr_name, None if holder is None else self.__copy_holder(holder, holder_map))
+        for container_name in ('skills', 'implants', 'boosters', 'subsystems', 'drones'):
+            container_clone = getattr(fit_clone, container_name)
+            for holder in getattr(self, container_name):
+                container_clone.add(self.__copy_holder(holder, holder_map))
+        for container, container_clone in (
+            (self.modules.high, fit_clone.modules.high),
+            (self.modules.med, fit_clone.modules.med),
+            (self.modules.low, fit_clone.modules.low),
+            (self.rigs, fit_clone.rigs)
+        ):
+            for index, holder in enumerate(container):
+                if holder is not None:
+                    container_clone.place(index, self.__copy_holder(holder, holder_map))
+        if self.source is None:
+            return fit_clone
+        # Holders were added to clone without source, now assign
+        # it; links are shared with this fit, other services get
+        # holders as usual
+        fit_clone.__source = self.source
+        fit_clone._link_tracker._share(self._link_tracker, holder_map)
+        for holder, holder_copy in holder_map.items():
+            holder_copy._refresh_source()
+            enabled_states, _ = _STATE_TRANSITIONS[(None, holder_copy.state)]
+            if len(enabled_states) > 0:
+                fit_clone._restriction_tracker.enable_states(holder_copy, enabled_states)
+                fit_clone.stats._enable_states(holder_copy, enabled_states)
+            holder_copy.attributes._share(holder.attributes)
+            if holder in self._volatile_holders:
+                copy_volatile_attrs(holder, holder_copy)
+        self.stats._copy_caches_to(fit_clone.stats)
+        return fit_clone
+
+    def preview(self, change, stats):
+        """
+        Calculate how stats would change if some change was made to
+        the fit. Change is applied to the fit itself on top of overlay
+        over its calculation state: calculated values which change
+        are recorded, and afterwards change is undone without
+        clearing anything and recorded values are put back. Thus
+        only data affected by change is calculated, and fit ends up
+        in exactly the same state, including calculated data.
+
+        Required arguments:
+        change -- change to preview, e.g. EquipChange(fit.modules.high,
+        Module(type_id)), StateChange(holder, State.active) or
+        ChargeChange(holder, charge_type_id)
+        stats -- iterable with stats to calculate; each stat can be
+        specified either as name of fit.stats attribute, dot-separated
+        for nested attributes (e.g. 'cpu.used'), or as callable which
+        takes fit and returns stat value
+
+        Return value:
+        Dictionary in {stat: StatDelta} format, where StatDelta
+        contains stat values before and after change, and their
+        difference if both values are numbers, else None
+        """
+        stats = tuple(stats)
+        before = [self.__get_stat(stat) for stat in stats]
+        overlay = self._open_overlay()
+        try:
+            change._apply(self)
+        except Exception:
+            overlay.discard()
+            raise
+        try:
+            after = [self.__get_stat(stat) for stat in stats]
+        finally:
+            overlay.discard(lambda: change._revert(self))
+        deltas = {}
+        for stat, stat_before, stat_after in zip(stats, before, after):
+            try:
+                delta = stat_after - stat_before
+            except TypeError:
+                delta = None
+            deltas[stat] = StatDelta(stat_before, stat_after, delta)
+        return deltas
+
+    def __get_stat(self, stat):
+        """Get value of stat specified in preview format."""
+        if callable(stat):
+            return stat(self)
+        value = self.stats
+        for attr_name in stat.split('.'):
+            value = getattr(value, attr_name)
+        return value
+
+    @classmethod
+    def __copy_holder(cls, holder, holder_map):
+        """
+        Make copy of holder, which is not assigned to any fit.
+
+        Required arguments:
+        holder -- holder to copy
+        holder_map -- dictionary in {holder: holder copy} format,
+        copies of holder and its charge are written to it
+        """
+        kwargs = {}
+        if isinstance(holder, MutableStateMixin):
+            kwargs['state'] = holder.state
+        if isinstance(holder, Skill):
+            kwargs['level'] = holder.level
+        holder_copy = type(holder)(holder._type_id, **kwargs)
+        # Overrides are stored on holders and their helper objects
+        copy_overrides(holder, holder_copy)
+        hp = getattr(holder, 'hp', None)
+        if hp is not None:
+            copy_overrides(hp, holder_copy.hp)
+        charge = getattr(holder, 'charge', None)
+        if charge is not None:
+            holder_copy.charge = cls.__copy_holder(charge, holder_map)
+        holder_map[holder] = holder_copy
+        return holder_copy
+
+    def _open_overlay(self):
+        """
+        Open overlay over calculation state of fit.
+
+        Return value:
+        Overlay, which should be discarded once
+        temporary changes are done
+        """
+        return CalcOverlay(self)
+
     def _request_volatile_cleanup(self, source_check=True):
         """
         Clear all the 'cached', but volatile stats, which should
         be no longer actual on any fit/holder changes. Called
-        automatically be eos components when needed.
+        automatically be eos components when needed. Holder
+        values with declared dependencies are kept, as they are
+        removed by holders themselves when something they rely
+        on changes.
 
         Optional arguments:
         source_check -- check if fit has source assigned, do not
@@ -98,6 +393,10 @@ class Fit:
         """
         if source_check is True and self.source is None:
             return
+        # Overlay puts back everything on its own
+        overlay = self._calc_overlay
+        if overlay is not None and overlay.reverting:
+            return
         self.stats._clear_volatile_attrs()
         for holder in self._volatile_holders:
             holder._clear_volatile_attrs()
@@ -143,7 +442,7 @@ class Fit:
         """
         self._link_tracker.add_holder(holder)
         # Switch states upwards up to holder's state
-        enabled_states = set(filter(lambda s: s <= holder.state, State))
+        enabled_states, _ = _STATE_TRANSITIONS[(None, holder.state)]
         if len(enabled_states) > 0:
             self._link_tracker.enable_states(holder, enabled_states)
             self._restriction_tracker.enable_states(holder, enabled_states)
@@ -152,7 +451,7 @@ class Fit:
     def _disable_services(self, holder):
         """Remove holder from all source-relying services."""
         # Switch states downwards from current holder's state
-        disabled_states = set(filter(lambda s: s <= holder.state, State))
+        _, disabled_states = _STATE_TRANSITIONS[(holder.state, None)]
         if len(disabled_states) > 0:
             self.stats._disable_states(holder, disabled_states)
             self._restriction_tracker.disable_states(holder, disabled_states)
@@ -175,8 +474,7 @@ class Fit:
         self._request_volatile_cleanup()
         # Get states which are passed during enabling/disabling
         # into single set (other should stay empty)
-        enabled_states = set(filter(lambda s: holder.state < s <= new_state, State))
-        disabled_states = set(filter(lambda s: new_state < s <= holder.state, State))
+        enabled_states, disabled_states = _STATE_TRANSITIONS[(holder.state, new_state)]
         # Ask trackers to perform corresponding actions
         if len(enabled_states) > 0:
             self._link_tracker.enable_states(holder, enabled_states)
@@ -187,6 +485,77 @@ class Fit:
             self._restriction_tracker.disable_states(holder, disabled_states)
             self.stats._disable_states(holder, disabled_states)
 
+    def _holder_type_switch(self, holder, type_id):
+        """
+        Replace item holder is based on, keeping holder itself
+        on fit. Only data which relies on the item is updated:
+        links and attributes are handled by link tracker, and
+        holder is re-registered in restriction and stat registers
+        only when they would see the change.
+
+        Required arguments:
+        holder -- holder, for which item should be replaced
+        type_id -- type ID of new item
+
+        Possible exceptions:
+        TypeFetchError -- raised when source has no item with
+        passed type ID; holder is not changed in this case
+        """
+        if self.source is None:
+            holder._type_id = type_id
+            return
+        old_item = holder.item
+        new_item = self.source.cache_handler.get_type(type_id)
+        states, _ = _STATE_TRANSITIONS[(None, holder.state)]
+        reregister = _get_registration_data(old_item) != _get_registration_data(new_item)
+        if reregister:
+            self.stats._disable_states(holder, states)
+            self._restriction_tracker.disable_states(holder, states)
+        holder._type_id = type_id
+        self._link_tracker.switch_item(holder, new_item, states)
+        if reregister:
+            self._restriction_tracker.enable_states(holder, states)
+            self.stats._enable_states(holder, states)
+        holder._reset_volatile_attrs()
+        container = getattr(holder, 'container', None)
+        if container is not None:
+            container._clear_volatile_charge_dependents()
+        self.stats._clear_volatile_attrs()
+
+    def _holders_state_switch(self, states):
+        """
+        Handle fit-specific part of state switch for multiple
+        holders at once.
+
+        Required arguments:
+        states -- map in {holder: new state} format
+        """
+        if self.source is None:
+            return
+        self._request_volatile_cleanup()
+        # Format: [(holder, enabled states, disabled states)]
+        switches = []
+        for holder, new_state in states.items():
+            enabled_states, disabled_states = _STATE_TRANSITIONS[(holder.state, new_state)]
+            switches.append((holder, enabled_states, disabled_states))
+        self._link_tracker.switch_states(switches)
+        for holder, enabled_states, disabled_states in switches:
+            if len(enabled_states) > 0:
+                self._restriction_tracker.enable_states(holder, enabled_states)
+                self.stats._enable_states(holder, enabled_states)
+            elif len(disabled_states) > 0:
+                self._restriction_tracker.disable_states(holder, disabled_states)
+                self.stats._disable_states(holder, disabled_states)
+
+    @property
+    def volatile_recomputations_avoided(self):
+        """
+        Amount of holder volatile values which were kept during
+        volatile data cleanups, as none of attributes they rely
+        on changed.
+        """
+        return self._volatile_recomputations_avoided
+
     @property
     def source(self):
         return self.__source
@@ -201,20 +570,54 @@ class Fit:
         # Do not update anything if sources are the same
         if new_source is old_source:
             return
+        # Holders whose types are the same in both sources keep
+        # their data and registrations in services; holders which
+        # rely on changed ones are updated by services when changed
+        # holders are re-registered
+        changed_holders = self._holders.difference(self.__get_unchanged_holders(old_source, new_source))
         # Disable everything dependent on old source prior to switch
         if old_source is not None:
-            for holder in self._holders:
+            for holder in changed_holders:
                 self._disable_services(holder)
-        # Assign new source and feed new data to all holders
+        # Assign new source and feed new data to holders
         self.__source = new_source
         self._request_volatile_cleanup(source_check=False)
-        for holder in self._holders:
+        for holder in changed_holders:
             holder._refresh_source()
+            # Container of charge may keep values which rely
+            # on charge, as they survive regular cleanups
+            container = getattr(holder, 'container', None)
+            if container is not None:
+                container._clear_volatile_charge_dependents()
         # Enable source-dependent services
         if new_source is not None:
-            for holder in self._holders:
+            for holder in changed_holders:
                 self._enable_services(holder)
 
+    def __get_unchanged_holders(self, old_source, new_source):
+        """
+        Find holders whose data does not change when fit
+        switches from old source to new source.
+
+        Return value:
+        Set with holders
+        """
+        if old_source is None or new_source is None:
+            return set()
+        old_handler = old_source.cache_handler
+        new_handler = new_source.cache_handler
+        # Attribute metadata is used in calculation of all
+        # attributes, when it changes everything has to be updated
+        attributes_hash = old_handler.get_attributes_hash()
+        if attributes_hash is None or attributes_hash != new_handler.get_attributes_hash():
+            return set()
+        unchanged_holders = set()
+        for holder in self._holders:
+            type_hash = old_handler.get_type_hash(holder._type_id)
+            if type_hash is not None and type_hash == new_handler.get_type_hash(holder._type_id):
+                unchanged_holders.add(holder)
+        return unchanged_holders
+
     def __repr__(self):
         spec = [
             'source', 'ship', 'stance', 'subsystems', 'modules', 'rigs', 'drones',
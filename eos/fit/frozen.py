@@ -0,0 +1,153 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from .exception import FitFrozenError
+from .fit import Fit, _STATE_TRANSITIONS
+
+
+class FrozenFit(Fit):
+    """
+    Fit which is built once and cannot be changed afterwards.
+    As it never changes, it doesn't track fitting restrictions
+    and doesn't need to clear calculated data; attributes and
+    stats are still calculated on demand. Any attempt to change
+    the fit raises FitFrozenError.
+
+    Should be created using from_spec().
+    """
+
+    def __init__(self, source=None):
+        self.__frozen = False
+        super().__init__(source=source)
+
+    def _make_restriction_tracker(self):
+        # Restrictions are never tracked
+        return None
+
+    @classmethod
+    def from_spec(cls, spec, source=None):
+        """
+        Build frozen fit.
+
+        Required arguments:
+        spec -- dictionary with holders to put on fit, which are not
+        assigned to any fit. Keys 'ship', 'stance' and 'effect_beacon'
+        may contain single holder; 'skills', 'implants', 'boosters',
+        'subsystems' and 'drones' - iterables with holders; 'high',
+        'med', 'low' and 'rigs' - iterables with holders or Nones for
+        empty slots. All keys are optional.
+
+        Optional arguments:
+        source -- source to use for the fit
+
+        Return value:
+        New frozen fit
+        """
+        fit = cls(source=source)
+        source = fit.source
+        # Fill fit while it has no source, this way holders
+        # are just stored on fit, and then enable services for
+        # all of them at once during source assignment
+        fit.source = None
+        for attr_name in ('ship', 'stance', 'effect_beacon'):
+            holder = spec.get(attr_name)
+            if holder is not None:
+                setattr(fit, attr_name, holder)
+        for container_name in ('skills', 'implants', 'boosters', 'subsystems', 'drones'):
+            container = getattr(fit, container_name)
+            for holder in spec.get(container_name, ()):
+                container.add(holder)
+        for container_name, container in (
+            ('high', fit.modules.high),
+            ('med', fit.modules.med),
+            ('low', fit.modules.low),
+            ('rigs', fit.rigs)
+        ):
+            for index, holder in enumerate(spec.get(container_name, ())):
+                if holder is not None:
+                    container.place(index, holder)
+        fit.source = source
+        fit.__freeze()
+        return fit
+
+    def __freeze(self):
+        """Forbid any further changes to fit."""
+        self.__frozen = True
+        # Calculated data is never cleared, thus there's
+        # no need to keep track of holders with volatile data
+        self._volatile_holders.clear()
+
+    def __check_mutable(self):
+        if self.__frozen:
+            raise FitFrozenError('frozen fit cannot be changed')
+
+    def validate(self, skip_checks=()):
+        """
+        Frozen fits do not track restrictions, thus
+        cannot be validated.
+
+        Possible exceptions:
+        FitFrozenError -- always raised
+        """
+        raise FitFrozenError('frozen fit cannot be validated')
+
+    def _request_volatile_cleanup(self, source_check=True):
+        self.__check_mutable()
+        super()._request_volatile_cleanup(source_check=source_check)
+
+    def _add_holder(self, holder):
+        self.__check_mutable()
+        super()._add_holder(holder)
+
+    def _remove_holder(self, holder):
+        self.__check_mutable()
+        super()._remove_holder(holder)
+
+    def _holder_state_switch(self, holder, new_state):
+        self.__check_mutable()
+        super()._holder_state_switch(holder, new_state)
+
+    def _holder_type_switch(self, holder, type_id):
+        self.__check_mutable()
+        super()._holder_type_switch(holder, type_id)
+
+    def _holders_state_switch(self, states):
+        self.__check_mutable()
+        super()._holders_state_switch(states)
+
+    def _enable_services(self, holder):
+        # Same as in regular fit, but without restriction tracker
+        self._link_tracker.add_holder(holder)
+        enabled_states, _ = _STATE_TRANSITIONS[(None, holder.state)]
+        if len(enabled_states) > 0:
+            self._link_tracker.enable_states(holder, enabled_states)
+            self.stats._enable_states(holder, enabled_states)
+
+    def _disable_services(self, holder):
+        _, disabled_states = _STATE_TRANSITIONS[(holder.state, None)]
+        if len(disabled_states) > 0:
+            self.stats._disable_states(holder, disabled_states)
+            self._link_tracker.disable_states(holder, disabled_states)
+        self._link_tracker.remove_holder(holder)
+
+    @Fit.source.setter
+    def source(self, new_source):
+        self.__check_mutable()
+        Fit.source.fset(self, new_source)
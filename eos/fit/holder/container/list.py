@@ -19,7 +19,7 @@
 # ===============================================================================
 
 
-from eos.fit.exception import HolderAlreadyAssignedError
+from eos.fit.exception import FitFrozenError, HolderAlreadyAssignedError
 from .base import HolderContainerBase
 from .exception import SlotTakenError
 
@@ -66,6 +66,10 @@ class HolderList(HolderContainerBase):
                 del self.__list[index]
                 self._cleanup()
                 raise ValueError(*e.args) from e
+            except FitFrozenError:
+                del self.__list[index]
+                self._cleanup()
+                raise
         self.__fit._request_volatile_cleanup()
 
     def append(self, holder):
@@ -85,6 +89,9 @@ class HolderList(HolderContainerBase):
         except HolderAlreadyAssignedError as e:
             del self.__list[-1]
             raise ValueError(*e.args) from e
+        except FitFrozenError:
+            del self.__list[-1]
+            raise
         self.__fit._request_volatile_cleanup()
 
     def place(self, index, holder):
@@ -116,6 +123,10 @@ class HolderList(HolderContainerBase):
             self.__list[index] = None
             self._cleanup()
             raise ValueError(*e.args) from e
+        except FitFrozenError:
+            self.__list[index] = None
+            self._cleanup()
+            raise
         self.__fit._request_volatile_cleanup()
 
     def equip(self, holder):
@@ -144,6 +155,10 @@ class HolderList(HolderContainerBase):
             self.__list[index] = None
             self._cleanup()
             raise ValueError(*e.args) from e
+        except FitFrozenError:
+            self.__list[index] = None
+            self._cleanup()
+            raise
         self.__fit._request_volatile_cleanup()
 
     def remove(self, value):
@@ -19,7 +19,7 @@
 # ===============================================================================
 
 
-from eos.fit.exception import HolderAlreadyAssignedError
+from eos.fit.exception import FitFrozenError, HolderAlreadyAssignedError
 from .base import HolderContainerBase
 
 
@@ -55,6 +55,9 @@ class HolderSet(HolderContainerBase):
         except HolderAlreadyAssignedError as e:
             self.__set.remove(holder)
             raise ValueError(*e.args) from e
+        except FitFrozenError:
+            self.__set.remove(holder)
+            raise
         self.__fit._request_volatile_cleanup()
 
     def remove(self, holder):
@@ -19,7 +19,7 @@
 # ===============================================================================
 
 
-from eos.fit.exception import HolderAlreadyAssignedError
+from eos.fit.exception import FitFrozenError, HolderAlreadyAssignedError
 from .base import HolderContainerBase
 
 
@@ -60,4 +60,7 @@ class HolderDescriptorOnFit(HolderContainerBase):
                 if old_holder is not None:
                     instance._add_holder(old_holder)
                 raise ValueError(*e.args) from e
+            except FitFrozenError:
+                setattr(instance, attr_name, old_holder)
+                raise
             instance._request_volatile_cleanup()
@@ -19,6 +19,7 @@
 # ===============================================================================
 
 
+from eos.fit.exception import FitFrozenError
 from .base import HolderContainerBase
 
 
@@ -71,5 +72,16 @@ class HolderDescriptorOnHolder(HolderContainerBase):
             if reverse_attr_name is not None:
                 setattr(new_holder, reverse_attr_name, instance)
             if fit is not None:
-                fit._add_holder(new_holder)
+                try:
+                    fit._add_holder(new_holder)
+                except FitFrozenError:
+                    # Fit rejects changes before anything is removed,
+                    # thus there was no old holder to restore
+                    setattr(instance, direct_attr_name, None)
+                    if reverse_attr_name is not None:
+                        setattr(new_holder, reverse_attr_name, None)
+                    raise
                 fit._request_volatile_cleanup()
+        # Data cached on container may rely on its
+        # contents, regardless of fit presence
+        instance._reset_volatile_attrs()
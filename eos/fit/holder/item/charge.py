@@ -45,6 +45,21 @@ class Charge(ImmutableStateMixin):
     def _domain(self):
         return Domain.space
 
+    def _clear_volatile_dependents(self, attr):
+        """
+        Charge doesn't cache anything itself, but its
+        container may rely on charge attributes.
+
+        Required arguments:
+        attr -- ID of changed attribute
+        """
+        try:
+            method = self.container._clear_volatile_dependents
+        except AttributeError:
+            pass
+        else:
+            method(attr, on_charge=True)
+
     def __repr__(self):
         spec = [['type_id', '_type_id']]
         return make_repr_str(self, spec)
@@ -60,12 +60,13 @@ class Skill(ImmutableStateMixin):
         # changed
         if self.__level == value:
             return
-        self.__level = value
         # Clear everything relying on skill level,
         # if skill is assigned to fit
         fit = self._fit
         if fit is not None:
             fit._request_volatile_cleanup()
+        self.__level = value
+        if fit is not None:
             fit._link_tracker.clear_holder_attribute_dependents(self, Attribute.skill_level)
 
     def __repr__(self):
@@ -19,7 +19,9 @@
 # ===============================================================================
 
 
-from eos.const.eve import Attribute, Effect
+from eos.const.eve import Attribute, Category, Effect
+from eos.data.cache_handler.exception import TypeFetchError
+from eos.data.charge_compatibility import is_charge_compatible
 from eos.fit.holder.container import HolderDescriptorOnHolder
 from eos.fit.holder.item import Charge
 from eos.util.override import OverrideDescriptor
@@ -35,6 +37,29 @@ def _float_to_int(value):
     return int(round(value, 9))
 
 
+def _get_holder_stat(holder, stat):
+    """
+    Get value of stat specified in charge matrix format.
+    """
+    if callable(stat):
+        return stat(holder)
+    value = holder
+    for attr_name in stat.split('.'):
+        value = getattr(value, attr_name)
+    return value
+
+
+# Attributes used to calculate amount of charges and cycles
+CYCLES_ATTRS = (Attribute.capacity, Attribute.charge_rate)
+CYCLES_CHARGE_ATTRS = (
+    Attribute.volume,
+    Attribute.crystals_get_damaged,
+    Attribute.hp,
+    Attribute.crystal_volatility_chance,
+    Attribute.crystal_volatility_damage
+)
+
+
 class ChargeableMixin(CooperativeVolatileMixin):
     """
     Mixin intended to use with holders which can have charge loaded
@@ -53,7 +78,104 @@ class ChargeableMixin(CooperativeVolatileMixin):
 
     charge = HolderDescriptorOnHolder('_charge', 'container', Charge)
 
-    @VolatileProperty
+    def swap_charge(self, type_id):
+        """
+        Load charge of another type. Unlike assigning new charge,
+        currently loaded charge holder is kept and only its item
+        is replaced, thus only data which relies on charge is
+        recalculated. If there's no charge loaded, new charge
+        holder is created.
+
+        Required arguments:
+        type_id -- type ID of charge to load
+
+        Return value:
+        Loaded charge holder
+
+        Possible exceptions:
+        TypeFetchError -- raised when fit source has no item
+        with passed type ID; loaded charge is kept in this case
+        """
+        charge = self.charge
+        if charge is None:
+            charge = self.charge = Charge(type_id)
+            return charge
+        if charge._type_id == type_id:
+            return charge
+        fit = self._fit
+        if fit is None:
+            charge._type_id = type_id
+            charge._refresh_source()
+        else:
+            fit._holder_type_switch(charge, type_id)
+        return charge
+
+    def charge_matrix(self, charge_type_ids, stats):
+        """
+        Calculate stats of holder for each of passed charges, against
+        current state of its fit. Charges are swapped one by one on
+        top of overlay over fit calculation state, thus only data
+        which relies on charge is calculated for each candidate, while
+        data which relies on holder and the rest of fit is reused.
+        Afterwards, previously loaded charge is put back and fit
+        returns to its original state, including calculated data.
+
+        Required arguments:
+        charge_type_ids -- iterable with type IDs of charges to evaluate
+        stats -- iterable with stats to calculate; each stat can be
+        specified either as name of holder attribute, dot-separated
+        for nested attributes (e.g. 'reload_time'), or as callable
+        which takes holder and returns stat value
+
+        Return value:
+        Dictionary in {charge type ID: (stat values)} format, with
+        values in the same order as stats. Charges which cannot be
+        loaded into holder due to their group, size or volume, types
+        which are not charges, and types which are not available in
+        fit source, are not included
+
+        Possible exceptions:
+        ValueError -- raised when holder is not assigned to fit
+        with source
+        """
+        fit = self._fit
+        if fit is None or fit.source is None:
+            raise ValueError('holder must be assigned to fit with source')
+        stats = tuple(stats)
+        type_getter = fit.source.cache_handler.get_type
+        container_attrs = self.item.attributes
+        candidates = []
+        for type_id in charge_type_ids:
+            try:
+                charge_item = type_getter(type_id)
+            except TypeFetchError:
+                continue
+            if charge_item.category != Category.charge:
+                continue
+            if is_charge_compatible(container_attrs, charge_item.group, charge_item.attributes):
+                candidates.append(type_id)
+        if len(candidates) == 0:
+            return {}
+        charge = self.charge
+        old_type_id = None if charge is None else charge._type_id
+        matrix = {}
+        overlay = fit._open_overlay()
+        try:
+            for type_id in candidates:
+                self.swap_charge(type_id)
+                matrix[type_id] = tuple(_get_holder_stat(self, stat) for stat in stats)
+        finally:
+            overlay.discard(lambda: self.__load_charge(old_type_id))
+        return matrix
+
+    def __load_charge(self, type_id):
+        """Load charge of passed type, or unload charge if type ID is None."""
+        if type_id is None:
+            self.charge = None
+        else:
+            self.swap_charge(type_id)
+
+    @VolatileProperty.depends(attrs=(Attribute.capacity,), charge_attrs=(Attribute.volume,))
     def charge_quantity_max(self):
         """
         Return max quantity of loadable charges as integer, based
@@ -71,11 +193,11 @@ class ChargeableMixin(CooperativeVolatileMixin):
 
     charge_quantity = OverrideDescriptor('charge_quantity_max', class_check=int)
 
-    @VolatileProperty
+    @VolatileProperty.depends(attrs=CYCLES_ATTRS, charge_attrs=CYCLES_CHARGE_ATTRS)
     def fully_charged_cycles_max(self):
         return self.__get_fully_charged_cycles(self.charge_quantity_max)
 
-    @VolatileProperty
+    @VolatileProperty.depends(attrs=CYCLES_ATTRS, charge_attrs=CYCLES_CHARGE_ATTRS)
     def fully_charged_cycles(self):
         return self.__get_fully_charged_cycles(self.charge_quantity)
 
@@ -136,7 +258,7 @@ class ChargeableMixin(CooperativeVolatileMixin):
         cycles = _float_to_int(hp / damage / chance) * charge_quantity
         return cycles
 
-    @VolatileProperty
+    @VolatileProperty.depends(attrs=(Attribute.reload_time,))
     def reload_time(self):
         """
         Return holder reload time in seconds.
@@ -23,6 +23,7 @@ from enum import IntEnum, unique
 
 from eos.const.eve import Attribute, Effect
 from eos.fit.tuples import DamageTypesTotal
+from eos.fit.holder.mixin.chargeable import CYCLES_ATTRS, CYCLES_CHARGE_ATTRS
 from eos.util.volatile_cache import CooperativeVolatileMixin, VolatileProperty
 
 
@@ -59,13 +60,49 @@ MISSILE_EFFECT_WEAPON_MAP = {
     Effect.bomb_launching: WeaponType.bomb
 }
 
+DAMAGE_ATTRS = (
+    Attribute.em_damage,
+    Attribute.thermal_damage,
+    Attribute.kinetic_damage,
+    Attribute.explosive_damage
+)
+
 
 class DamageDealerMixin(CooperativeVolatileMixin):
     """
     Mixin intended to use with all entities which are able
     to deal damage (modules, drones).
+
+    Cooperative methods:
+    _clear_volatile_dependents
+    _clear_volatile_charge_dependents
+    _reset_volatile_attrs
     """
 
+    def _clear_volatile_dependents(self, attr, on_charge=False):
+        super()._clear_volatile_dependents(attr, on_charge=on_charge)
+        self.__report_damage_change()
+
+    def _clear_volatile_charge_dependents(self):
+        super()._clear_volatile_charge_dependents()
+        self.__report_damage_change()
+
+    def _reset_volatile_attrs(self):
+        super()._reset_volatile_attrs()
+        self.__report_damage_change()
+
+    def __report_damage_change(self):
+        """
+        Notify fit stats that data used for damage calculation
+        might have changed, so that cached stats of holder are
+        dropped.
+        """
+        try:
+            method = self._fit.stats._damage_dealer_changed
+        except AttributeError:
+            return
+        method(self)
+
     def __get_base_dmg_holder(self):
         """
         Return holder damage attribs as 4-tuple.
@@ -102,7 +139,10 @@ class DamageDealerMixin(CooperativeVolatileMixin):
         expl = holder.attributes.get(Attribute.explosive_damage)
         return em, therm, kin, expl
 
-    @VolatileProperty
+    @VolatileProperty.depends(
+        attrs=DAMAGE_ATTRS + (Attribute.damage_multiplier,) + CYCLES_ATTRS,
+        charge_attrs=DAMAGE_ATTRS + CYCLES_CHARGE_ATTRS
+    )
     def _base_volley(self):
         """
         Return base volley for current holder - nominal volley, not modified by
@@ -242,7 +282,7 @@ class DamageDealerMixin(CooperativeVolatileMixin):
             total = None
         return DamageTypesTotal(em=em, thermal=therm, kinetic=kin, explosive=expl, total=total)
 
-    @VolatileProperty
+    @VolatileProperty.depends(attrs=CYCLES_ATTRS, charge_attrs=CYCLES_CHARGE_ATTRS)
     def _weapon_type(self):
         """
         Get weapon type of holder. Weapon type defines mechanics used to
@@ -34,6 +34,7 @@ class HolderBase:
 
     Cooperative methods:
     __init__
+    _reset_volatile_attrs
     """
 
     def __init__(self, type_id, **kwargs):
@@ -66,6 +67,7 @@ class HolderBase:
         which is source-dependent.
         """
         self.attributes.clear()
+        self._reset_volatile_attrs()
         try:
             type_getter = self._fit.source.cache_handler.get_type
         # When we're asked to refresh source, but we have no fit or
@@ -79,8 +81,38 @@ class HolderBase:
 
     def _request_volatile_cleanup(self):
         """
-        Request fit to clear all fit volatile data.
+        Request fit to clear all fit volatile data. Data
+        cached on holder itself is removed in full.
         """
+        self._reset_volatile_attrs()
         fit = self._fit
         if fit is not None:
             fit._request_volatile_cleanup()
+
+    def _reset_volatile_attrs(self):
+        """
+        Remove all volatile data cached on holder. Holders
+        without volatile properties have nothing to remove.
+
+        Attempt to call next method in MRO, do nothing
+        on failure to find it.
+        """
+        next_in_mro = super()
+        try:
+            method = next_in_mro._reset_volatile_attrs
+        except AttributeError:
+            pass
+        else:
+            method()
+
+    def _volatile_attrs_kept(self, amount):
+        """
+        Report cached values which survived volatile
+        data cleanup to fit.
+
+        Required arguments:
+        amount -- amount of values which were kept
+        """
+        fit = self._fit
+        if fit is not None:
+            fit._volatile_recomputations_avoided += amount
@@ -72,4 +72,15 @@ class MutableStateMixin(HolderBase):
         fit = self._fit
         if fit is not None:
             fit._holder_state_switch(self, new_state)
+        self._apply_state(new_state)
+
+    def _apply_state(self, new_state):
+        """
+        Store new state without notifying fit. Used when
+        fit-specific part of state switch is already done.
+
+        Required arguments:
+        new_state -- state, which holder should take
+        """
         self.__state = new_state
+        self._reset_volatile_attrs()
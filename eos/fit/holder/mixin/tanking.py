@@ -24,6 +24,22 @@ from eos.fit.tuples import TankingLayers, TankingLayersTotal, DamageTypes
 from eos.util.override import OverrideDescriptor
 from eos.util.volatile_cache import CooperativeVolatileMixin, VolatileProperty
 
+RESONANCE_ATTRS = (
+    Attribute.em_damage_resonance,
+    Attribute.thermal_damage_resonance,
+    Attribute.kinetic_damage_resonance,
+    Attribute.explosive_damage_resonance,
+    Attribute.armor_em_damage_resonance,
+    Attribute.armor_thermal_damage_resonance,
+    Attribute.armor_kinetic_damage_resonance,
+    Attribute.armor_explosive_damage_resonance,
+    Attribute.shield_em_damage_resonance,
+    Attribute.shield_thermal_damage_resonance,
+    Attribute.shield_kinetic_damage_resonance,
+    Attribute.shield_explosive_damage_resonance
+)
+HP_ATTRS = (Attribute.hp, Attribute.armor_hp, Attribute.shield_capacity)
+
 
 class BufferTankingMixin(CooperativeVolatileMixin):
     """
@@ -38,7 +54,7 @@ class BufferTankingMixin(CooperativeVolatileMixin):
         self.hp = OverridableHp(self)
         super().__init__(**kwargs)
 
-    @VolatileProperty
+    @VolatileProperty.depends(attrs=RESONANCE_ATTRS)
     def resistances(self):
         """
         Access point to fetch resistances of item. Provides following data:
@@ -137,7 +153,7 @@ class BufferTankingMixin(CooperativeVolatileMixin):
         received = dealt - absorbed
         return dealt / received
 
-    @VolatileProperty
+    @VolatileProperty.depends(attrs=RESONANCE_ATTRS + HP_ATTRS)
     def worst_case_ehp(self):
         """
         Get EVE-style effective HP for item.
@@ -0,0 +1,92 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.util.volatile_cache import get_volatile_attrs, set_volatile_attrs
+
+
+class CalcOverlay:
+    """
+    Overlay over calculation state of fit. While overlay is open,
+    fit is changed as usual, and attribute maps report values
+    they are about to lose or get; when overlay is discarded,
+    changes are undone without clearing anything, and reported
+    values are put back. Cached stats are copied when overlay is
+    opened and put back when it's discarded, thus fit ends up
+    exactly in the same state it was in before overlay was opened.
+
+    Required arguments:
+    fit -- fit to open overlay on
+    """
+
+    def __init__(self, fit):
+        if fit._calc_overlay is not None:
+            raise ValueError('fit already has open overlay')
+        self.__fit = fit
+        # When set, attribute maps do not clear or
+        # report anything
+        self.reverting = False
+        # Values which attributes had before overlay
+        # was opened
+        # Format: {attribute map: {attribute ID: value}}
+        self.__attrs = {}
+        # Format: {holder: {attribute name: value}}
+        self.__volatile = {}
+        for holder in fit._volatile_holders:
+            self.__volatile[holder] = get_volatile_attrs(holder)
+        self.__stats = fit.stats._get_caches()
+        self.__recomputations_avoided = fit._volatile_recomputations_avoided
+        fit._calc_overlay = self
+
+    def record_attr(self, attr_map, attr, value):
+        """
+        Remember value attribute had before it changes for
+        the first time since overlay was opened.
+
+        Required arguments:
+        attr_map -- attribute map which contains attribute
+        attr -- ID of attribute
+        value -- value as it's stored on the map
+        """
+        self.__attrs.setdefault(attr_map, {}).setdefault(attr, value)
+
+    def discard(self, undo=None):
+        """
+        Close overlay, returning fit to its original state.
+
+        Optional arguments:
+        undo -- callable which undoes changes made to fit
+        while overlay was open; it's called while nothing
+        is cleared or reported, thus it should only revert
+        changes made to fit structure
+        """
+        fit = self.__fit
+        self.reverting = True
+        try:
+            if undo is not None:
+                undo()
+        finally:
+            self.reverting = False
+            fit._calc_overlay = None
+            for attr_map, values in self.__attrs.items():
+                attr_map._restore(values)
+            for holder, values in self.__volatile.items():
+                set_volatile_attrs(holder, values)
+            fit.stats._set_caches(self.__stats)
+            fit._volatile_recomputations_avoided = self.__recomputations_avoided
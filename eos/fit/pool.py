@@ -0,0 +1,86 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from collections import deque
+
+from eos.data.source import SourceManager
+from eos.util.repr import make_repr_str
+from .fit import Fit
+
+
+class FitPool:
+    """
+    Keeps fits which are no longer needed, and gives them away
+    instead of making new ones, as fit initialization is relatively
+    expensive.
+
+    Optional arguments:
+    max_size -- max amount of fits kept in pool, when not
+    specified, all released fits are kept
+    """
+
+    def __init__(self, max_size=None):
+        self._max_size = max_size
+        # Appends and pops are atomic, thus pool can be
+        # shared between threads
+        self._fits = deque()
+
+    def acquire(self, source=None):
+        """
+        Get empty fit.
+
+        Optional arguments:
+        source -- source to use for the fit
+
+        Return value:
+        Fit from pool, or new fit if pool is empty
+        """
+        try:
+            fit = self._fits.pop()
+        except IndexError:
+            return Fit(source=source)
+        # Fits are reset when released, only source
+        # may need to be changed
+        if source is None:
+            source = SourceManager.default
+        fit.source = source
+        return fit
+
+    def release(self, fit):
+        """
+        Return fit to pool. Fit should not be used
+        after it has been released.
+
+        Required arguments:
+        fit -- fit to return
+        """
+        if self._max_size is not None and len(self._fits) >= self._max_size:
+            return
+        # Get rid of holders right away, so that they can be
+        # collected while fit sits in pool
+        fit.reset()
+        self._fits.append(fit)
+
+    def __len__(self):
+        return len(self._fits)
+
+    def __repr__(self):
+        spec = [['max_size', '_max_size']]
+        return make_repr_str(self, spec)
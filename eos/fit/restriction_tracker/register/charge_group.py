@@ -22,20 +22,11 @@
 from collections import namedtuple
 
 from eos.const.eos import Restriction
-from eos.const.eve import Attribute
+from eos.data.charge_compatibility import get_allowed_charge_groups
 from eos.fit.restriction_tracker.exception import RegisterValidationError
 from .abc import RestrictionRegister
 
 
-RESTRICTION_ATTRS = (
-    Attribute.charge_group_1,
-    Attribute.charge_group_2,
-    Attribute.charge_group_3,
-    Attribute.charge_group_4,
-    Attribute.charge_group_5
-)
-
-
 ChargeGroupErrorData = namedtuple('ChargeGroupErrorData', ('holder_group', 'allowed_groups'))
 
 
@@ -61,14 +52,11 @@ class ChargeGroupRegister(RestrictionRegister):
             return
         # Compose set of charge groups this container
         # is able to fit
-        allowed_groups = set()
-        for restriction_attr in RESTRICTION_ATTRS:
-            allowed_groups.add(holder.item.attributes.get(restriction_attr))
-        allowed_groups.discard(None)
+        allowed_groups = get_allowed_charge_groups(holder.item.attributes)
         # Only if groups were specified, consider
         # restriction enabled
         if allowed_groups:
-            self.__restricted_containers[holder] = tuple(allowed_groups)
+            self.__restricted_containers[holder] = allowed_groups
 
     def unregister_holder(self, holder):
         if holder in self.__restricted_containers:
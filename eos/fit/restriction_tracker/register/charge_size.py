@@ -23,6 +23,7 @@ from collections import namedtuple
 
 from eos.const.eos import Restriction
 from eos.const.eve import Attribute
+from eos.data.charge_compatibility import charge_size_fits
 from eos.fit.restriction_tracker.exception import RegisterValidationError
 from .abc import RestrictionRegister
 
@@ -68,9 +69,9 @@ class ChargeSizeRegister(RestrictionRegister):
             charge = container.charge
             if charge is None:
                 continue
-            container_size = container.item.attributes[Attribute.charge_size]
-            charge_size = charge.item.attributes.get(Attribute.charge_size)
-            if container_size != charge_size:
+            if not charge_size_fits(container.item.attributes, charge.item.attributes):
+                container_size = container.item.attributes[Attribute.charge_size]
+                charge_size = charge.item.attributes.get(Attribute.charge_size)
                 tainted_holders[charge] = ChargeSizeErrorData(
                     holder_size=charge_size,
                     allowed_size=container_size
@@ -23,6 +23,7 @@ from collections import namedtuple
 
 from eos.const.eos import Restriction
 from eos.const.eve import Attribute
+from eos.data.charge_compatibility import charge_volume_fits
 from eos.fit.restriction_tracker.exception import RegisterValidationError
 from .abc import RestrictionRegister
 
@@ -63,9 +64,9 @@ class ChargeVolumeRegister(RestrictionRegister):
                 continue
             # Get volume and capacity with 0 as fallback, and
             # compare them, raising error when charge can't fit
-            charge_volume = charge.item.attributes.get(Attribute.volume, 0)
-            container_capacity = container.item.attributes.get(Attribute.capacity, 0)
-            if charge_volume > container_capacity:
+            if not charge_volume_fits(container.item.attributes, charge.item.attributes):
+                charge_volume = charge.item.attributes.get(Attribute.volume, 0)
+                container_capacity = container.item.attributes.get(Attribute.capacity, 0)
                 tainted_holders[charge] = ChargeVolumeErrorData(
                     holder_volume=charge_volume,
                     max_allowed_volume=container_capacity
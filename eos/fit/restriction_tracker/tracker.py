@@ -39,12 +39,34 @@ class RestrictionTracker:
         # Fit reference, to which this restriction tracker
         # is attached
         self._fit = fit
-        # Dictionary which keeps all restriction registers
-        # used by tracker. When some holder passes state stored
-        # as key, it's registered/unregistered in registers
-        # stored as value.
-        # Format: {triggering state: {registers}}
-        self.__registers = {
+        # Registers are needed only for validation, thus until
+        # it is requested, only states of holders are tracked;
+        # registers are filled using this data when they are built
+        # Format: {holder: {states}}
+        self.__holder_states = {}
+        self.__built_registers = None
+
+    @property
+    def __registers(self):
+        """
+        Dictionary which keeps all restriction registers
+        used by tracker. When some holder passes state stored
+        as key, it's registered/unregistered in registers
+        stored as value.
+        Format: {triggering state: (registers)}
+        """
+        registers = self.__built_registers
+        if registers is None:
+            registers = self.__built_registers = self.__build_registers()
+        return registers
+
+    def __build_registers(self):
+        """
+        Create all restriction registers and fill them with
+        holders which are already on fit.
+        """
+        fit = self._fit
+        registers = {
             State.offline: (
                 CalibrationRegister(fit),
                 DroneBayVolumeRegister(fit),
@@ -83,6 +105,15 @@ class RestrictionTracker:
                 MaxGroupActiveRegister(),
             )
         }
+        for holder, holder_states in self.__holder_states.items():
+            for state in sorted(holder_states):
+                try:
+                    state_registers = registers[state]
+                except KeyError:
+                    continue
+                for register in state_registers:
+                    register.register_holder(holder)
+        return registers
 
     def enable_states(self, holder, states):
         """
@@ -93,11 +124,15 @@ class RestrictionTracker:
         states -- iterable with states, which are passed
         during state switch, except for initial state
         """
+        states = set(states)
+        self.__holder_states.setdefault(holder, set()).update(states)
+        if self.__built_registers is None:
+            return
         for state in states:
             # Not all states have corresponding registers,
             # just skip those which don't
             try:
-                registers = self.__registers[state]
+                registers = self.__built_registers[state]
             except KeyError:
                 continue
             for register in registers:
@@ -112,9 +147,20 @@ class RestrictionTracker:
         states -- iterable with states, which are passed
         during state switch, except for final state
         """
+        states = set(states)
+        try:
+            holder_states = self.__holder_states[holder]
+        except KeyError:
+            pass
+        else:
+            holder_states.difference_update(states)
+            if not holder_states:
+                del self.__holder_states[holder]
+        if self.__built_registers is None:
+            return
         for state in states:
             try:
-                registers = self.__registers[state]
+                registers = self.__built_registers[state]
             except KeyError:
                 continue
             for register in registers:
@@ -137,8 +183,9 @@ class RestrictionTracker:
         # Format: {holder: {error type: error data}}
         invalid_holders = {}
         # Go through all known registers
-        for state in self.__registers:
-            for register in self.__registers[state]:
+        registers = self.__registers
+        for state in registers:
+            for register in registers[state]:
                 # Skip check if we're told to do so, based
                 # on exception class assigned to register
                 restriction_type = register.restriction_type
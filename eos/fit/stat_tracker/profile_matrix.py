@@ -0,0 +1,112 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+"""
+Helpers which evaluate stats against many damage or resistance
+profiles at once. When NumPy is available, all profiles are
+processed in one vectorized pass, else pure Python is used.
+"""
+
+
+import math
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _profile_rows(profiles):
+    """Convert profiles into rows of 4 numbers."""
+    return [(p.em, p.thermal, p.kinetic, p.explosive) for p in profiles]
+
+
+def get_layer_ehp_matrix(layer_hps, layer_resistances, damage_profiles):
+    """
+    Calculate effective HP of tanking layers against multiple
+    damage profiles.
+
+    Required arguments:
+    layer_hps -- iterable with raw HP of layers; None is allowed
+    layer_resistances -- iterable with resistances of layers, each
+    of them should have em, thermal, kinetic and explosive attributes;
+    None values are considered as 0
+    damage_profiles -- sequence with damage profiles, each of them
+    should have em, thermal, kinetic and explosive attributes
+
+    Return value:
+    List with rows of layer effective HPs, one row per damage profile.
+    If layer raw HP is None or 0, it's used as effective HP. If layer
+    receives no damage of profile, its effective HP is infinite.
+    """
+    dmg_rows = _profile_rows(damage_profiles)
+    if numpy is not None:
+        dmg = numpy.array(dmg_rows, dtype=float).reshape(len(dmg_rows), 4)
+        dealt = dmg.sum(axis=1)
+    columns = []
+    for layer_hp, res in zip(layer_hps, layer_resistances):
+        if not layer_hp:
+            columns.append([layer_hp] * len(dmg_rows))
+            continue
+        res_row = (res.em or 0, res.thermal or 0, res.kinetic or 0, res.explosive or 0)
+        if numpy is not None:
+            received = dealt - dmg.dot(numpy.array(res_row, dtype=float))
+            column = numpy.full(len(dmg_rows), math.inf)
+            numpy.divide(layer_hp * dealt, received, out=column, where=received != 0)
+            columns.append(column.tolist())
+        else:
+            column = []
+            for dmg_row in dmg_rows:
+                dealt_row = sum(dmg_row)
+                received = dealt_row - sum(d * r for d, r in zip(dmg_row, res_row))
+                column.append(layer_hp * dealt_row / received if received != 0 else math.inf)
+            columns.append(column)
+    return [list(row) for row in zip(*columns)]
+
+
+def get_resisted_damage_matrix(damage, resistance_profiles):
+    """
+    Apply multiple resistance profiles to damage.
+
+    Required arguments:
+    damage -- 4 damage numbers (em, thermal, kinetic, explosive);
+    None is allowed
+    resistance_profiles -- sequence with resistance profiles, each
+    of them should have em, thermal, kinetic and explosive attributes
+    as numbers in range [0..1]
+
+    Return value:
+    List with rows of 4 damage numbers, one row per resistance
+    profile. Damage types which are None in passed damage are None
+    in all rows.
+    """
+    res_rows = _profile_rows(resistance_profiles)
+    if numpy is not None:
+        dmg = numpy.array([d or 0 for d in damage], dtype=float)
+        res = numpy.array(res_rows, dtype=float).reshape(len(res_rows), 4)
+        rows = ((1 - res) * dmg).tolist()
+    else:
+        rows = [[(1 - r) * (d or 0) for d, r in zip(damage, res_row)] for res_row in res_rows]
+    # Restore None-values for damage types which had no data
+    for row in rows:
+        for i, dmg_value in enumerate(damage):
+            if dmg_value is None:
+                row[i] = None
+    return rows
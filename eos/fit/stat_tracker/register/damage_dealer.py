@@ -21,6 +21,7 @@
 
 from eos.fit.holder.mixin.damage_dealer import DamageDealerMixin
 from eos.fit.tuples import DamageTypesTotal
+from eos.holder_filter import INDEX_GETTERS
 from .abc import StatRegister
 
 
@@ -29,27 +30,163 @@ class DamageDealerRegister(StatRegister):
     Class which tracks all holders which can potentially
     deal damage, and provides functionality to fetch some
     useful data.
+
+    Damage stats of each holder are cached until holder
+    reports that something they rely on has changed, and
+    are summed up per weapon type; thus repeated requests
+    on unchanged fit do not touch holders at all. Holders
+    are indexed by group, category and weapon type, which
+    allows declarative filters to pick matching holders
+    without checking each of them.
     """
 
     def __init__(self):
         self.__dealers = set()
+        # Holders which haven't been indexed yet
+        # Format: {holders}
+        self.__unclassified = set()
+        # Format: {holder: {index name: value}}
+        self.__holder_index_values = {}
+        # Format: {index name: {value: {holders}}}
+        self.__index = {}
+        # Damage stats of separate holders
+        # Format: {holder: {stat key: stats}}
+        self.__contributions = {}
+        # Damage stats summed over holders of each weapon type
+        # Format: {stat key: {weapon type: stats}}
+        self.__aggregates = {}
 
     def register_holder(self, holder):
         if isinstance(holder, DamageDealerMixin):
             self.__dealers.add(holder)
+            self.__unclassified.add(holder)
 
     def unregister_holder(self, holder):
+        self.__forget_holder(holder)
         self.__dealers.discard(holder)
+        self.__unclassified.discard(holder)
+
+    def invalidate_holder(self, holder):
+        """
+        Remove cached damage stats of holder and all sums
+        it has been part of.
+
+        Required arguments:
+        holder -- holder whose damage stats may have changed
+        """
+        if holder not in self.__dealers:
+            return
+        self.__forget_holder(holder)
+        self.__unclassified.add(holder)
+
+    def _get_caches(self):
+        """
+        Get copy of data cached by register, which can be
+        put back later using _set_caches().
+        """
+        return (
+            set(self.__unclassified),
+            dict(self.__holder_index_values),
+            {n: {v: set(h) for v, h in i.items()} for n, i in self.__index.items()},
+            {h: dict(s) for h, s in self.__contributions.items()},
+            {k: dict(a) for k, a in self.__aggregates.items()}
+        )
 
-    def _collect_damage_stats(self, holder_filter, method_name, *args, **kwargs):
+    def _set_caches(self, caches):
+        """
+        Replace data cached by register with passed copy.
+
+        Required arguments:
+        caches -- data returned by _get_caches(), or None
+        to drop all cached data
+        """
+        if caches is None:
+            self.__unclassified = set(self.__dealers)
+            self.__holder_index_values = {}
+            self.__index = {}
+            self.__contributions = {}
+            self.__aggregates = {}
+            return
+        (
+            self.__unclassified,
+            self.__holder_index_values,
+            self.__index,
+            self.__contributions,
+            self.__aggregates
+        ) = caches
+
+    def __forget_holder(self, holder):
+        self.__contributions.pop(holder, None)
+        try:
+            index_values = self.__holder_index_values.pop(holder)
+        except KeyError:
+            return
+        for index_name, value in index_values.items():
+            name_index = self.__index[index_name]
+            holders = name_index[value]
+            holders.discard(holder)
+            if not holders:
+                del name_index[value]
+            if not name_index:
+                del self.__index[index_name]
+        self.__drop_aggregates(index_values['weapon_type'])
+
+    def __drop_aggregates(self, weapon_type):
+        for stat_key in tuple(self.__aggregates):
+            aggregates = self.__aggregates[stat_key]
+            aggregates.pop(weapon_type, None)
+            if not aggregates:
+                del self.__aggregates[stat_key]
+
+    def __classify_holders(self):
+        """Add all unclassified holders to index."""
+        for holder in self.__unclassified:
+            index_values = {}
+            for index_name, getter in INDEX_GETTERS.items():
+                try:
+                    index_values[index_name] = getter(holder)
+                except AttributeError:
+                    continue
+            # Every holder should be part of some weapon group,
+            # as totals are calculated using them
+            index_values.setdefault('weapon_type', None)
+            for index_name, value in index_values.items():
+                self.__index.setdefault(index_name, {}).setdefault(value, set()).add(holder)
+            self.__holder_index_values[holder] = index_values
+            self.__drop_aggregates(index_values['weapon_type'])
+        self.__unclassified.clear()
+
+    def __lookup(self, index_name, value):
+        """Get holders which have passed value of indexed property."""
+        try:
+            return self.__index[index_name][value]
+        except KeyError:
+            return ()
+
+    def __get_holder_stats(self, holder, stat_key, method_name, kwargs):
+        """
+        Get damage stats of holder, using cached value when
+        possible. If stat key is None, stats are not cached.
+        """
+        if stat_key is None:
+            return getattr(holder, method_name)(**kwargs)
+        holder_stats = self.__contributions.setdefault(holder, {})
+        try:
+            return holder_stats[stat_key]
+        except KeyError:
+            stats = getattr(holder, method_name)(**kwargs)
+            holder_stats[stat_key] = stats
+            return stats
+
+    def _collect_damage_stats(self, holder_filter, method_name, **kwargs):
         """
         Fetch stats from all registered holders.
 
         Required arguments:
         holder_filter -- function which is evaluated for each holder;
         if true, holder's stats are taken into consideration. Can be None.
-        method_name, *args, **kwargs -- method name, which will be called
-        for each holder to request its damage stats. Args and kwargs are
+        method_name, **kwargs -- method name, which will be called
+        for each holder to request its damage stats. Kwargs are
         arguments which are passed to this method.
 
         Return value:
@@ -57,36 +194,83 @@ class DamageDealerRegister(StatRegister):
         which contain total stats for all holders which satisfy passed
         conditions.
         """
-        em, therm, kin, expl = None, None, None, None
-        for holder in self.__dealers:
-            stat = getattr(holder, method_name)(*args, **kwargs)
-            if holder_filter is not None and not holder_filter(holder):
+        stat_key = (method_name, tuple(sorted(kwargs.items())))
+        try:
+            hash(stat_key)
+        # Arguments which cannot be used as dictionary key
+        # disable caching for this request
+        except TypeError:
+            stat_key = None
+        self.__classify_holders()
+        if holder_filter is not None:
+            # Declarative filters are resolved via index, others are
+            # checked for each holder before anything else is done
+            select = getattr(holder_filter, '_select', None)
+            holders = None if select is None else select(self.__lookup)
+            if holders is None:
+                holders = (h for h in self.__dealers if holder_filter(h))
+            return _sum_damage_stats(
+                self.__get_holder_stats(holder, stat_key, method_name, kwargs)
+                for holder in holders
+            )
+        if stat_key is None:
+            return _sum_damage_stats(
+                self.__get_holder_stats(holder, stat_key, method_name, kwargs)
+                for holder in self.__dealers
+            )
+        aggregates = self.__aggregates.get(stat_key, {})
+        for weapon_type, holders in self.__index.get('weapon_type', {}).items():
+            if weapon_type in aggregates:
                 continue
-            # Guards against both aggregated values equal to None and
-            # holder values equal to None. If original value is equal to
-            # None, assigns to variable value from holder stats. If holder
-            # stat is None, just ignores it.
-            try:
-                em += stat.em
-            except TypeError:
-                if em is None:
-                    em = stat.em
-            try:
-                therm += stat.thermal
-            except TypeError:
-                if therm is None:
-                    therm = stat.thermal
-            try:
-                kin += stat.kinetic
-            except TypeError:
-                if kin is None:
-                    kin = stat.kinetic
-            try:
-                expl += stat.explosive
-            except TypeError:
-                if expl is None:
-                    expl = stat.explosive
-        total = (em or 0) + (therm or 0) + (kin or 0) + (expl or 0)
-        if total == 0 and em is None and therm is None and kin is None and expl is None:
-            total = None
-        return DamageTypesTotal(em=em, thermal=therm, kinetic=kin, explosive=expl, total=total)
+            aggregates[weapon_type] = _sum_damage_stats(
+                self.__get_holder_stats(holder, stat_key, method_name, kwargs)
+                for holder in holders
+            )
+        if aggregates:
+            self.__aggregates[stat_key] = aggregates
+        return _sum_damage_stats(aggregates.values())
+
+
+def _sum_damage_stats(stats_iterable):
+    """
+    Sum up damage stats, ignoring None values.
+
+    Required arguments:
+    stats_iterable -- iterable with objects which have em,
+    thermal, kinetic and explosive attributes
+
+    Return value:
+    Object with em, thermal, kinetic, explosive and total
+    attributes; damage types for which no numbers were
+    found are None.
+    """
+    em, therm, kin, expl = None, None, None, None
+    for stat in stats_iterable:
+        # Guards against both aggregated values equal to None and
+        # holder values equal to None. If original value is equal to
+        # None, assigns to variable value from holder stats. If holder
+        # stat is None, just ignores it.
+        try:
+            em += stat.em
+        except TypeError:
+            if em is None:
+                em = stat.em
+        try:
+            therm += stat.thermal
+        except TypeError:
+            if therm is None:
+                therm = stat.thermal
+        try:
+            kin += stat.kinetic
+        except TypeError:
+            if kin is None:
+                kin = stat.kinetic
+        try:
+            expl += stat.explosive
+        except TypeError:
+            if expl is None:
+                expl = stat.explosive
+    total = (em or 0) + (therm or 0) + (kin or 0) + (expl or 0)
+    if total == 0 and em is None and therm is None and kin is None and expl is None:
+        total = None
+    return DamageTypesTotal(em=em, thermal=therm, kinetic=kin, explosive=expl, total=total)
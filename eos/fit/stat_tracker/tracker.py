@@ -23,12 +23,22 @@ import math
 
 from eos.const.eos import State
 from eos.const.eve import Attribute
-from eos.fit.tuples import DamageTypes, TankingLayers, TankingLayersTotal
-from eos.util.volatile_cache import InheritableVolatileMixin, VolatileProperty
+from eos.fit.tuples import DamageTypes, DamageTypesTotal, TankingLayers, TankingLayersTotal
+from eos.util.volatile_cache import (InheritableVolatileMixin, VolatileProperty, copy_volatile_attrs,
+                                     get_volatile_attrs, set_volatile_attrs)
 from .container import *
+from .profile_matrix import get_layer_ehp_matrix, get_resisted_damage_matrix
 from .register import *
 
 
+def _lazy_container(name):
+    """
+    Make property which exposes stat container, building
+    it and its register on first access.
+    """
+    return property(lambda self: self._get_container(name))
+
+
 class StatTracker(InheritableVolatileMixin):
     """
     Object which is used as access points for all
@@ -38,66 +48,114 @@ class StatTracker(InheritableVolatileMixin):
     fit -- Fit object to which tracker is assigned
     """
 
+    # Registers are built when stats which need them are
+    # requested for the first time
+    # Format: {register name: (triggering state, register factory)}
+    _register_spec = {
+        'cpu': (State.online, CpuUseRegister),
+        'powergrid': (State.online, PowerGridUseRegister),
+        'calibration': (State.offline, CalibrationUseRegister),
+        'dronebay': (State.offline, DroneBayVolumeUseRegister),
+        'drone_bandwidth': (State.online, DroneBandwidthUseRegister),
+        'turret': (State.offline, TurretUseRegister),
+        'launcher': (State.offline, LauncherUseRegister),
+        'launched_drone': (State.online, LaunchedDroneRegister),
+        'damage_dealer': (State.offline, lambda fit: DamageDealerRegister())
+    }
+    # Format: {container name: (container class, register name, stat attribute)}
+    _container_spec = {
+        'cpu': (ShipResource, 'cpu', Attribute.cpu_output),
+        'powergrid': (ShipResource, 'powergrid', Attribute.power_output),
+        'calibration': (ShipResource, 'calibration', Attribute.upgrade_capacity),
+        'dronebay': (ShipResource, 'dronebay', Attribute.drone_capacity),
+        'drone_bandwidth': (ShipResource, 'drone_bandwidth', Attribute.drone_bandwidth),
+        'turret_slots': (ShipSlots, 'turret', Attribute.turret_slots_left),
+        'launcher_slots': (ShipSlots, 'launcher', Attribute.launcher_slots_left),
+        'launched_drones': (CharSlots, 'launched_drone', Attribute.max_active_drones)
+    }
+
     def __init__(self, fit):
         self._fit = fit
-        # Initialize registers
-        cpu_reg = CpuUseRegister(fit)
-        powergrid_reg = PowerGridUseRegister(fit)
-        calibration_reg = CalibrationUseRegister(fit)
-        dronebay_reg = DroneBayVolumeUseRegister(fit)
-        drone_bandwidth_reg = DroneBandwidthUseRegister(fit)
-        turret_reg = TurretUseRegister(fit)
-        launcher_reg = LauncherUseRegister(fit)
-        launched_drone_reg = LaunchedDroneRegister(fit)
-        self._dd_reg = DamageDealerRegister()
-        # Dictionary which keeps all stats registers
-        # Format: {triggering state: {registers}}
-        self.__registers = {
-            State.offline: (
-                calibration_reg,
-                dronebay_reg,
-                turret_reg,
-                launcher_reg,
-                self._dd_reg
-            ),
-            State.online: (
-                cpu_reg,
-                powergrid_reg,
-                drone_bandwidth_reg,
-                launched_drone_reg
-            )
-        }
-        # Initialize sub-containers
-        self.cpu = ShipResource(fit, cpu_reg, Attribute.cpu_output)
-        self.powergrid = ShipResource(fit, powergrid_reg, Attribute.power_output)
-        self.calibration = ShipResource(fit, calibration_reg, Attribute.upgrade_capacity)
-        self.dronebay = ShipResource(fit, dronebay_reg, Attribute.drone_capacity)
-        self.drone_bandwidth = ShipResource(fit, drone_bandwidth_reg, Attribute.drone_bandwidth)
+        # Until some register is built, only states of holders
+        # are tracked; register is filled using this data
+        # when it's built
+        # Format: {holder: {states}}
+        self.__holder_states = {}
+        # Format: {register name: register}
+        self.__built_registers = {}
+        # Format: {container name: container}
+        self.__built_containers = {}
+        # Initialize sub-containers which do not rely on registers
         self.high_slots = ShipSlots(fit, fit.modules.high, Attribute.hi_slots)
         self.med_slots = ShipSlots(fit, fit.modules.med, Attribute.med_slots)
         self.low_slots = ShipSlots(fit, fit.modules.low, Attribute.low_slots)
         self.rig_slots = ShipSlots(fit, fit.rigs, Attribute.rig_slots)
         self.subsystem_slots = ShipSlots(fit, fit.subsystems, Attribute.subsystem_slot)
-        self.turret_slots = ShipSlots(fit, turret_reg, Attribute.turret_slots_left)
-        self.launcher_slots = ShipSlots(fit, launcher_reg, Attribute.launcher_slots_left)
-        self.launched_drones = CharSlots(fit, launched_drone_reg, Attribute.max_active_drones)
-        self._volatile_containers = (
-            self.cpu,
-            self.powergrid,
-            self.calibration,
-            self.dronebay,
-            self.drone_bandwidth,
+        self._volatile_containers = [
             self.high_slots,
             self.med_slots,
             self.low_slots,
             self.rig_slots,
-            self.subsystem_slots,
-            self.turret_slots,
-            self.launcher_slots,
-            self.launched_drones
-        )
+            self.subsystem_slots
+        ]
         super().__init__()
 
+    cpu = _lazy_container('cpu')
+    powergrid = _lazy_container('powergrid')
+    calibration = _lazy_container('calibration')
+    dronebay = _lazy_container('dronebay')
+    drone_bandwidth = _lazy_container('drone_bandwidth')
+    turret_slots = _lazy_container('turret_slots')
+    launcher_slots = _lazy_container('launcher_slots')
+    launched_drones = _lazy_container('launched_drones')
+
+    @property
+    def _dd_reg(self):
+        return self._get_register('damage_dealer')
+
+    def _get_register(self, name):
+        """
+        Get stat register, building it and filling it with
+        holders which are already on fit if necessary.
+
+        Required arguments:
+        name -- name of register
+
+        Return value:
+        Register object
+        """
+        try:
+            return self.__built_registers[name]
+        except KeyError:
+            pass
+        state, register_factory = self._register_spec[name]
+        register = register_factory(self._fit)
+        for holder, holder_states in self.__holder_states.items():
+            if state in holder_states:
+                register.register_holder(holder)
+        self.__built_registers[name] = register
+        return register
+
+    def _get_container(self, name):
+        """
+        Get stat container, building it if necessary.
+
+        Required arguments:
+        name -- name of container
+
+        Return value:
+        Container object
+        """
+        try:
+            return self.__built_containers[name]
+        except KeyError:
+            pass
+        container_class, register_name, stat_attr = self._container_spec[name]
+        container = container_class(self._fit, self._get_register(register_name), stat_attr)
+        self.__built_containers[name] = container
+        self._volatile_containers.append(container)
+        return container
+
     def _enable_states(self, holder, states):
         """
         Handle state switch upwards.
@@ -107,14 +165,10 @@ class StatTracker(InheritableVolatileMixin):
         states -- iterable with states, which are passed
         during state switch, except for initial state
         """
-        for state in states:
-            # Not all states have corresponding registers,
-            # just skip those which don't
-            try:
-                registers = self.__registers[state]
-            except KeyError:
-                continue
-            for register in registers:
+        states = set(states)
+        self.__holder_states.setdefault(holder, set()).update(states)
+        for name, register in self.__built_registers.items():
+            if self._register_spec[name][0] in states:
                 register.register_holder(holder)
 
     def _disable_states(self, holder, states):
@@ -126,13 +180,90 @@ class StatTracker(InheritableVolatileMixin):
         states -- iterable with states, which are passed
         during state switch, except for final state
         """
-        for state in states:
+        states = set(states)
+        try:
+            holder_states = self.__holder_states[holder]
+        except KeyError:
+            pass
+        else:
+            holder_states.difference_update(states)
+            if not holder_states:
+                del self.__holder_states[holder]
+        for name, register in self.__built_registers.items():
+            if self._register_spec[name][0] in states:
+                register.unregister_holder(holder)
+
+    def _damage_dealer_changed(self, holder):
+        """
+        Handle change of data which damage stats of holder
+        rely on.
+
+        Required arguments:
+        holder -- holder which has changed
+        """
+        try:
+            register = self.__built_registers['damage_dealer']
+        except KeyError:
+            return
+        register.invalidate_holder(holder)
+
+    def _copy_caches_to(self, other):
+        """
+        Copy values cached by tracker and its containers to
+        tracker of other fit, which is in the same state.
+        Containers are matched by name; lazy containers built
+        on this tracker are built on other tracker too.
+
+        Required arguments:
+        other -- tracker to copy values to
+        """
+        copy_volatile_attrs(self, other)
+        for name in ('high_slots', 'med_slots', 'low_slots', 'rig_slots', 'subsystem_slots'):
+            copy_volatile_attrs(getattr(self, name), getattr(other, name))
+        for name, container in self.__built_containers.items():
+            copy_volatile_attrs(container, other._get_container(name))
+
+    def _get_caches(self):
+        """
+        Get copy of data cached by tracker, its containers and
+        registers, which can be put back later using _set_caches().
+        """
+        # Format: {object: {attribute name: value}}
+        volatile = {}
+        for obj in (self, *self._volatile_containers):
+            volatile[obj] = get_volatile_attrs(obj)
+        try:
+            register = self.__built_registers['damage_dealer']
+        except KeyError:
+            damage = None
+        else:
+            damage = register._get_caches()
+        return volatile, damage
+
+    def _set_caches(self, caches):
+        """
+        Replace data cached by tracker, its containers and
+        registers with passed copy. Containers and registers
+        which were built after copy had been taken lose all
+        their cached data.
+
+        Required arguments:
+        caches -- data returned by _get_caches()
+        """
+        volatile, damage = caches
+        for obj in (self, *self._volatile_containers):
             try:
-                registers = self.__registers[state]
+                values = volatile[obj]
             except KeyError:
-                continue
-            for register in registers:
-                register.unregister_holder(holder)
+                obj._reset_volatile_attrs()
+            else:
+                set_volatile_attrs(obj, values)
+        try:
+            register = self.__built_registers['damage_dealer']
+        except KeyError:
+            pass
+        else:
+            register._set_caches(damage)
 
     def _clear_volatile_attrs(self):
         """
@@ -196,6 +327,54 @@ class StatTracker(InheritableVolatileMixin):
         except AttributeError:
             return TankingLayersTotal(hull=None, armor=None, shield=None, total=None)
 
+    def get_ehp_matrix(self, damage_profiles):
+        """
+        Same as get_ehp, but evaluates ship against multiple damage
+        profiles at once. Ship HP and resistances are fetched only once.
+
+        Required arguments:
+        damage_profiles -- iterable with damage profiles, each should have
+        em, thermal, kinetic and explosive attributes defined as numbers
+
+        Return value:
+        Tuple with objects with hull, armor, shield and total attributes,
+        one per passed damage profile in the same order. If fit has no ship
+        or some data cannot be fetched, corresponding attribs will be set
+        to None.
+
+        Possible exceptions:
+        ValueError -- raised when some of damage profiles has all damage
+        components as 0
+        """
+        damage_profiles = tuple(damage_profiles)
+        ship_holder = self._fit.ship
+        try:
+            hp_data = ship_holder.hp
+            resistances = ship_holder.resistances
+        except AttributeError:
+            empty = TankingLayersTotal(hull=None, armor=None, shield=None, total=None)
+            return tuple(empty for _ in damage_profiles)
+        for damage_profile in damage_profiles:
+            if (
+                damage_profile.em == 0 and
+                damage_profile.thermal == 0 and
+                damage_profile.kinetic == 0 and
+                damage_profile.explosive == 0
+            ):
+                raise ValueError('damage profile cannot have all damage components as 0')
+        rows = get_layer_ehp_matrix(
+            (hp_data.hull, hp_data.armor, hp_data.shield),
+            (resistances.hull, resistances.armor, resistances.shield),
+            damage_profiles
+        )
+        ehp_matrix = []
+        for hull_ehp, armor_ehp, shield_ehp in rows:
+            total_ehp = (hull_ehp or 0) + (armor_ehp or 0) + (shield_ehp or 0)
+            if total_ehp == 0 and hull_ehp is None and armor_ehp is None and shield_ehp is None:
+                total_ehp = None
+            ehp_matrix.append(TankingLayersTotal(hull=hull_ehp, armor=armor_ehp, shield=shield_ehp, total=total_ehp))
+        return tuple(ehp_matrix)
+
     @VolatileProperty
     def worst_case_ehp(self):
         """
@@ -256,6 +435,52 @@ class StatTracker(InheritableVolatileMixin):
         )
         return dps
 
+    def get_volley_matrix(self, resistance_profiles, holder_filter=None):
+        """
+        Same as get_nominal_volley, but calculates effective volley against
+        multiple resistance profiles at once. Raw volley is fetched only once.
+
+        Required arguments:
+        resistance_profiles -- iterable with resistance profiles, each should
+        have em, thermal, kinetic and explosive attributes as numbers in
+        range [0..1]
+
+        Optional arguments:
+        holder_filter -- when iterating over fit holder, this function is called.
+        If evaluated as True, this holder is taken into consideration, else not.
+        If argument is None, all holders 'pass filter'. By default None.
+
+        Return value:
+        Tuple with objects with em, thermal, kinetic, explosive and total
+        attributes, one per passed resistance profile in the same order.
+        """
+        volley = self.get_nominal_volley(holder_filter=holder_filter)
+        return _apply_resistance_profiles(volley, resistance_profiles)
+
+    def get_dps_matrix(self, resistance_profiles, holder_filter=None, reload=False):
+        """
+        Same as get_nominal_dps, but calculates effective dps against
+        multiple resistance profiles at once. Raw dps is fetched only once.
+
+        Required arguments:
+        resistance_profiles -- iterable with resistance profiles, each should
+        have em, thermal, kinetic and explosive attributes as numbers in
+        range [0..1]
+
+        Optional arguments:
+        holder_filter -- when iterating over fit holder, this function is called.
+        If evaluated as True, this holder is taken into consideration, else not.
+        If argument is None, all holders 'pass filter'. By default None.
+        reload -- boolean flag, should reload be taken into consideration or not.
+        By default False.
+
+        Return value:
+        Tuple with objects with em, thermal, kinetic, explosive and total
+        attributes, one per passed resistance profile in the same order.
+        """
+        dps = self.get_nominal_dps(holder_filter=holder_filter, reload=reload)
+        return _apply_resistance_profiles(dps, resistance_profiles)
+
     @VolatileProperty
     def agility_factor(self):
         ship_holder = self._fit.ship
@@ -277,3 +502,21 @@ class StatTracker(InheritableVolatileMixin):
             return math.ceil(self.agility_factor)
         except TypeError:
             return None
+
+
+def _apply_resistance_profiles(damage, resistance_profiles):
+    """
+    Calculate effective damage against each of passed
+    resistance profiles and return tuple with results.
+    """
+    rows = get_resisted_damage_matrix(
+        (damage.em, damage.thermal, damage.kinetic, damage.explosive),
+        tuple(resistance_profiles)
+    )
+    damage_matrix = []
+    for em, therm, kin, expl in rows:
+        total = (em or 0) + (therm or 0) + (kin or 0) + (expl or 0)
+        if total == 0 and em is None and therm is None and kin is None and expl is None:
+            total = None
+        damage_matrix.append(DamageTypesTotal(em=em, thermal=therm, kinetic=kin, explosive=expl, total=total))
+    return tuple(damage_matrix)
@@ -26,3 +26,4 @@ TankingLayers = namedtuple('TankingLayers', ('hull', 'armor', 'shield'))
 TankingLayersTotal = namedtuple('TankingLayersTotal', ('hull', 'armor', 'shield', 'total'))
 DamageTypes = namedtuple('DamageTypes', ('em', 'thermal', 'kinetic', 'explosive'))
 DamageTypesTotal = namedtuple('DamageTypesTotal', ('em', 'thermal', 'kinetic', 'explosive', 'total'))
+StatDelta = namedtuple('StatDelta', ('before', 'after', 'delta'))
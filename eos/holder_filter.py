@@ -23,10 +23,17 @@ __all__ = [
     'turret_filter',
     'missile_filter',
     'drone_filter',
-    'sentry_drone_filter'
+    'sentry_drone_filter',
+    'HolderFilter',
+    'GroupFilter',
+    'CategoryFilter',
+    'WeaponTypeFilter',
+    'RequiredSkillFilter'
 ]
 
 
+from abc import ABCMeta, abstractmethod
+
 from eos.const.eve import Type, Group, Category
 
 
@@ -44,61 +51,197 @@ MISSILE_LAUNCHER_GROUPS = (
 )
 
 
-def turret_filter(holder):
-    """
-    True for all items belonging to projectile,
-    hybrid and energy weapon groups.
-    """
-    try:
-        group = holder.item.group
-    except AttributeError:
-        return False
-    if group in TURRET_GROUPS:
-        return True
-    else:
-        return False
+def _get_group(holder):
+    return holder.item.group
 
 
-def missile_filter(holder):
-    """
-    True for all items which belong to various missile
-    launcher groups.
-    """
-    try:
-        group = holder.item.group
-    except AttributeError:
-        return False
-    if group in MISSILE_LAUNCHER_GROUPS:
-        return True
-    else:
-        return False
+def _get_category(holder):
+    return holder.item.category
+
+
+def _get_weapon_type(holder):
+    return holder._weapon_type
 
 
-def drone_filter(holder):
+# Holder properties which can be indexed by stat registers,
+# and functions to fetch them; functions raise AttributeError
+# when holder has no such property
+# Format: {index name: getter}
+INDEX_GETTERS = {
+    'group': _get_group,
+    'category': _get_category,
+    'weapon_type': _get_weapon_type
+}
+
+
+class HolderFilter(metaclass=ABCMeta):
     """
-    True for all items belonging to drone category.
+    Base class for declarative holder filters. Filter can be
+    called with holder as regular predicate, or resolved via
+    index by stat register; filters can be combined using
+    & (all should pass) and | (any should pass) operators.
+    Plain functions are accepted as operands too.
     """
-    try:
-        category = holder.item.category
-    except AttributeError:
-        return False
-    if category == Category.drone:
-        return True
-    else:
-        return False
 
+    @abstractmethod
+    def __call__(self, holder):
+        ...
+
+    def _select(self, lookup):
+        """
+        Get holders which pass filter using index.
+
+        Required arguments:
+        lookup -- function which takes index name and value
+        and returns iterable with holders which have such value
+
+        Return value:
+        Set with holders, or None if filter can't be resolved
+        via index
+        """
+        return None
+
+    def __and__(self, other):
+        return _AllFilter(self, _make_filter(other))
 
-def sentry_drone_filter(holder):
+    def __rand__(self, other):
+        return _AllFilter(_make_filter(other), self)
+
+    def __or__(self, other):
+        return _AnyFilter(self, _make_filter(other))
+
+    def __ror__(self, other):
+        return _AnyFilter(_make_filter(other), self)
+
+
+class _IndexedFilter(HolderFilter):
     """
-    True for all drones which require sentry interfacing skill.
+    Filter which passes holders whose indexed property
+    takes one of passed values.
     """
-    if not drone_filter(holder):
-        return False
-    try:
-        skillrqs = holder.item.required_skills
-    except AttributeError:
-        return False
-    if Type.sentry_drone_interfacing in skillrqs:
-        return True
-    else:
-        return False
+
+    index_name = None
+
+    def __init__(self, *values):
+        self.values = frozenset(values)
+
+    def __call__(self, holder):
+        try:
+            value = INDEX_GETTERS[self.index_name](holder)
+        except AttributeError:
+            return False
+        return value in self.values
+
+    def _select(self, lookup):
+        selected = set()
+        for value in self.values:
+            selected.update(lookup(self.index_name, value))
+        return selected
+
+
+class GroupFilter(_IndexedFilter):
+    """Pass holders whose items belong to any of passed groups."""
+
+    index_name = 'group'
+
+
+class CategoryFilter(_IndexedFilter):
+    """Pass holders whose items belong to any of passed categories."""
+
+    index_name = 'category'
+
+
+class WeaponTypeFilter(_IndexedFilter):
+    """Pass holders which are weapons of any of passed weapon types."""
+
+    index_name = 'weapon_type'
+
+
+class RequiredSkillFilter(HolderFilter):
+    """Pass holders whose items require passed skill."""
+
+    def __init__(self, skill_id):
+        self.skill_id = skill_id
+
+    def __call__(self, holder):
+        try:
+            skillrqs = holder.item.required_skills
+        except AttributeError:
+            return False
+        return self.skill_id in skillrqs
+
+
+class _PredicateFilter(HolderFilter):
+    """Wrapper around plain function."""
+
+    def __init__(self, predicate):
+        self.predicate = predicate
+
+    def __call__(self, holder):
+        return bool(self.predicate(holder))
+
+
+class _AllFilter(HolderFilter):
+    """Pass holders which pass all child filters."""
+
+    def __init__(self, *filters):
+        self.filters = filters
+
+    def __call__(self, holder):
+        return all(filter_(holder) for filter_ in self.filters)
+
+    def _select(self, lookup):
+        # Narrow down holders using filters which can be
+        # resolved via index, and check the rest only for
+        # holders which are left
+        selected = None
+        unresolved = []
+        for filter_ in self.filters:
+            filter_selected = filter_._select(lookup)
+            if filter_selected is None:
+                unresolved.append(filter_)
+            elif selected is None:
+                selected = set(filter_selected)
+            else:
+                selected &= filter_selected
+        if selected is None:
+            return None
+        return set(h for h in selected if all(filter_(h) for filter_ in unresolved))
+
+
+class _AnyFilter(HolderFilter):
+    """Pass holders which pass any of child filters."""
+
+    def __init__(self, *filters):
+        self.filters = filters
+
+    def __call__(self, holder):
+        return any(filter_(holder) for filter_ in self.filters)
+
+    def _select(self, lookup):
+        selected = set()
+        for filter_ in self.filters:
+            filter_selected = filter_._select(lookup)
+            if filter_selected is None:
+                return None
+            selected.update(filter_selected)
+        return selected
+
+
+def _make_filter(obj):
+    """Make holder filter out of passed filter or function."""
+    if isinstance(obj, HolderFilter):
+        return obj
+    return _PredicateFilter(obj)
+
+
+# True for all items belonging to projectile, hybrid
+# and energy weapon groups
+turret_filter = GroupFilter(*TURRET_GROUPS)
+# True for all items which belong to various missile
+# launcher groups
+missile_filter = GroupFilter(*MISSILE_LAUNCHER_GROUPS)
+# True for all items belonging to drone category
+drone_filter = CategoryFilter(Category.drone)
+# True for all drones which require sentry interfacing skill
+sentry_drone_filter = drone_filter & RequiredSkillFilter(Type.sentry_drone_interfacing)
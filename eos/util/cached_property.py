@@ -47,3 +47,37 @@ class CachedProperty:
         value = self.__method(instance)
         setattr(instance, self.__method.__name__, value)
         return value
+
+
+class SlotCachedProperty:
+    """
+    Same as CachedProperty, but for classes which define __slots__
+    and thus have no instance dictionary. Such classes should define
+    slot named _cached_<method name>, result is stored there. Value
+    can be overridden by assigning it, and cache can be cleared by
+    deleting attribute.
+    """
+
+    def __init__(self, method):
+        self.__method = method
+        self.__slot = None
+
+    def __set_name__(self, owner, name):
+        self.__slot = owner.__dict__['_cached_{}'.format(name)]
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        slot = self.__slot
+        try:
+            return slot.__get__(instance, owner)
+        except AttributeError:
+            value = self.__method(instance)
+            slot.__set__(instance, value)
+            return value
+
+    def __set__(self, instance, value):
+        self.__slot.__set__(instance, value)
+
+    def __delete__(self, instance):
+        self.__slot.__delete__(instance)
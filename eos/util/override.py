@@ -54,14 +54,43 @@ class OverrideDescriptor:
                 msg = 'only {} is accepted, not {}'.format(
                     self.__class_check, type(value))
                 raise TypeError(msg)
-        setattr(instance, self.__store_name, value)
         instance._request_volatile_cleanup()
+        setattr(instance, self.__store_name, value)
 
     def __delete__(self, instance):
-        try:
-            delattr(instance, self.__store_name)
-        except AttributeError as e:
+        if not hasattr(instance, self.__store_name):
             msg = 'override for {} is not set'.format(self.__default_name)
-            raise AttributeError(msg) from e
-        else:
-            instance._request_volatile_cleanup()
+            raise AttributeError(msg)
+        instance._request_volatile_cleanup()
+        delattr(instance, self.__store_name)
+
+    def copy(self, source, target):
+        """
+        Copy override from one object to another, without
+        requesting volatile data cleanup on target. If source
+        has no override set, nothing is done.
+
+        Required arguments:
+        source -- object to copy override from
+        target -- object to copy override to
+        """
+        try:
+            value = getattr(source, self.__store_name)
+        except AttributeError:
+            return
+        setattr(target, self.__store_name, value)
+
+
+def copy_overrides(source, target):
+    """
+    Copy all overrides set on object to another object
+    of the same class.
+
+    Required arguments:
+    source -- object to copy overrides from
+    target -- object to copy overrides to
+    """
+    for cls in type(source).__mro__:
+        for descriptor in vars(cls).values():
+            if isinstance(descriptor, OverrideDescriptor):
+                descriptor.copy(source, target)
@@ -24,10 +24,46 @@ class VolatileProperty:
     Caches attribute on instance and adds note
     about it to special set, which should be added
     by VolatileMixin.
+
+    By default cached value is considered to depend on
+    everything, and is removed on each volatile data
+    cleanup. Properties which know what they rely on should
+    be declared via VolatileProperty.depends() - their
+    values survive regular cleanups and are removed only
+    when one of declared attributes changes, or when object
+    requests full reset of its volatile data.
     """
 
-    def __init__(self, method):
+    def __init__(self, method, attrs=None, charge_attrs=None):
         self.__method = method
+        # Format: frozenset(attribute IDs), or None when
+        # dependencies are not declared
+        self.attrs = None if attrs is None else frozenset(attrs)
+        self.charge_attrs = None if attrs is None else frozenset(charge_attrs or ())
+
+    @classmethod
+    def depends(cls, attrs=(), charge_attrs=()):
+        """
+        Make decorator which creates volatile property with
+        declared dependencies.
+
+        Optional arguments:
+        attrs -- iterable with IDs of attributes of object
+        itself, which are used to calculate value
+        charge_attrs -- iterable with IDs of attributes of
+        charge loaded into object, which are used to calculate
+        value
+
+        Return value:
+        Decorator for property getter
+        """
+        def decorator(method):
+            return cls(method, attrs=attrs, charge_attrs=charge_attrs)
+        return decorator
+
+    @property
+    def declared(self):
+        return self.attrs is not None
 
     def __get__(self, instance, owner):
         if instance is None:
@@ -39,6 +75,75 @@ class VolatileProperty:
         return value
 
 
+def _clear_undeclared(instance):
+    """
+    Remove cached values of properties which did not declare
+    their dependencies, and return amount of values left.
+    """
+    cls = type(instance)
+    volatile_attrs = instance._volatile_attrs
+    for attr_name in tuple(volatile_attrs):
+        prop = getattr(cls, attr_name, None)
+        if getattr(prop, 'declared', False):
+            continue
+        try:
+            delattr(instance, attr_name)
+        except AttributeError:
+            pass
+        volatile_attrs.discard(attr_name)
+    return len(volatile_attrs)
+
+
+def _clear_dependents(instance, attr, on_charge):
+    """
+    Remove cached values which rely on passed attribute.
+    Values of properties without declared dependencies
+    are removed too.
+    """
+    cls = type(instance)
+    volatile_attrs = instance._volatile_attrs
+    for attr_name in tuple(volatile_attrs):
+        prop = getattr(cls, attr_name, None)
+        if getattr(prop, 'declared', False):
+            deps = prop.charge_attrs if on_charge else prop.attrs
+            if attr not in deps:
+                continue
+        try:
+            delattr(instance, attr_name)
+        except AttributeError:
+            pass
+        volatile_attrs.discard(attr_name)
+
+
+def _clear_charge_dependents(instance):
+    """
+    Remove cached values which rely on loaded charge in any
+    way. Values of properties without declared dependencies
+    are removed too.
+    """
+    cls = type(instance)
+    volatile_attrs = instance._volatile_attrs
+    for attr_name in tuple(volatile_attrs):
+        prop = getattr(cls, attr_name, None)
+        if getattr(prop, 'declared', False) and not prop.charge_attrs:
+            continue
+        try:
+            delattr(instance, attr_name)
+        except AttributeError:
+            pass
+        volatile_attrs.discard(attr_name)
+
+
+def _clear_all(instance):
+    """Remove all cached values."""
+    for attr_name in instance._volatile_attrs:
+        try:
+            delattr(instance, attr_name)
+        except AttributeError:
+            pass
+    instance._volatile_attrs.clear()
+
+
 class InheritableVolatileMixin:
     """
     Should be added as base class for all
@@ -53,14 +158,27 @@ class InheritableVolatileMixin:
     def _clear_volatile_attrs(self):
         """
         Remove all the caches values which were
-        stored since the last cleanup.
+        stored since the last cleanup, except for
+        values with declared dependencies.
+        """
+        _clear_undeclared(self)
+
+    def _clear_volatile_dependents(self, attr, on_charge=False):
+        """
+        Remove cached values which rely on passed attribute.
+
+        Required arguments:
+        attr -- ID of changed attribute
+
+        Optional arguments:
+        on_charge -- if True, attribute belongs to loaded
+        charge rather than to object itself
         """
-        for attr_name in self._volatile_attrs:
-            try:
-                delattr(self, attr_name)
-            except AttributeError:
-                pass
-        self._volatile_attrs.clear()
+        _clear_dependents(self, attr, on_charge)
+
+    def _reset_volatile_attrs(self):
+        """Remove all the cached values."""
+        _clear_all(self)
 
 
 class CooperativeVolatileMixin:
@@ -73,6 +191,9 @@ class CooperativeVolatileMixin:
     Cooperative methods:
     __init__
     _clear_volatile_attrs
+    _clear_volatile_dependents
+    _clear_volatile_charge_dependents
+    _reset_volatile_attrs
     """
 
     def __init__(self, **kwargs):
@@ -82,17 +203,16 @@ class CooperativeVolatileMixin:
     def _clear_volatile_attrs(self):
         """
         Remove all the caches values which were
-        stored since the last cleanup.
+        stored since the last cleanup, except for
+        values with declared dependencies. Amount of
+        values kept is reported via _volatile_attrs_kept.
 
         Attempt to call next method in MRO, do nothing
         on failure to find it.
         """
-        for attr_name in self._volatile_attrs:
-            try:
-                delattr(self, attr_name)
-            except AttributeError:
-                pass
-        self._volatile_attrs.clear()
+        kept = _clear_undeclared(self)
+        if kept > 0:
+            self._volatile_attrs_kept(kept)
         next_in_mro = super()
         try:
             method = next_in_mro._clear_volatile_attrs
@@ -100,3 +220,124 @@ class CooperativeVolatileMixin:
             pass
         else:
             method()
+
+    def _clear_volatile_dependents(self, attr, on_charge=False):
+        """
+        Remove cached values which rely on passed attribute.
+
+        Required arguments:
+        attr -- ID of changed attribute
+
+        Optional arguments:
+        on_charge -- if True, attribute belongs to loaded
+        charge rather than to object itself
+
+        Attempt to call next method in MRO, do nothing
+        on failure to find it.
+        """
+        _clear_dependents(self, attr, on_charge)
+        next_in_mro = super()
+        try:
+            method = next_in_mro._clear_volatile_dependents
+        except AttributeError:
+            pass
+        else:
+            method(attr, on_charge=on_charge)
+
+    def _clear_volatile_charge_dependents(self):
+        """
+        Remove cached values which rely on loaded charge,
+        used when item of charge is replaced.
+
+        Attempt to call next method in MRO, do nothing
+        on failure to find it.
+        """
+        _clear_charge_dependents(self)
+        next_in_mro = super()
+        try:
+            method = next_in_mro._clear_volatile_charge_dependents
+        except AttributeError:
+            pass
+        else:
+            method()
+
+    def _reset_volatile_attrs(self):
+        """
+        Remove all the cached values.
+
+        Attempt to call next method in MRO, do nothing
+        on failure to find it.
+        """
+        _clear_all(self)
+        next_in_mro = super()
+        try:
+            method = next_in_mro._reset_volatile_attrs
+        except AttributeError:
+            pass
+        else:
+            method()
+
+    def _volatile_attrs_kept(self, amount):
+        """
+        Called when regular cleanup leaves some cached
+        values in place. Does nothing by default.
+
+        Required arguments:
+        amount -- amount of values which were kept
+        """
+        pass
+
+
+def copy_volatile_attrs(source, target):
+    """
+    Copy values cached by volatile properties from one
+    object to another, so that target does not need to
+    calculate them again. Objects should be of the same
+    class and describe the same state.
+
+    Required arguments:
+    source -- object to copy values from
+    target -- object to copy values to
+    """
+    for attr_name in source._volatile_attrs:
+        try:
+            value = source.__dict__[attr_name]
+        except KeyError:
+            continue
+        setattr(target, attr_name, value)
+        target._volatile_attrs.add(attr_name)
+
+
+def get_volatile_attrs(instance):
+    """
+    Get values cached by volatile properties of object.
+
+    Required arguments:
+    instance -- object to get values of
+
+    Return value:
+    Dictionary in {attribute name: value} format
+    """
+    values = {}
+    for attr_name in instance._volatile_attrs:
+        try:
+            values[attr_name] = instance.__dict__[attr_name]
+        except KeyError:
+            continue
+    return values
+
+
+def set_volatile_attrs(instance, values):
+    """
+    Replace values cached by volatile properties of object
+    with passed ones. Nothing relying on these values is
+    cleared.
+
+    Required arguments:
+    instance -- object to set values on
+    values -- dictionary in {attribute name: value} format
+    """
+    _clear_all(instance)
+    for attr_name, value in values.items():
+        setattr(instance, attr_name, value)
+        instance._volatile_attrs.add(attr_name)
@@ -0,0 +1,57 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from unittest.mock import patch
+
+from eos.const.eve import Category
+from eos.data.cache_generator import CacheGenerator
+from tests.cache_generator.generator_testcase import GeneratorTestCase
+
+
+@patch('eos.data.cache_generator.converter.ModifierBuilder')
+class TestCleanupReport(GeneratorTestCase):
+    """Check stats of cleanup stages."""
+
+    def test_report(self, mod_builder):
+        mod_builder.return_value.build.return_value = ([], 0)
+        self.dh.data['evegroups'].append({'groupID': 1, 'categoryID': Category.ship})
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 1})
+        self.dh.data['evetypes'].append({'typeID': 2, 'groupID': 2})
+        self.dh.data['dgmtypeattribs'].append({'typeID': 1, 'attributeID': 5, 'value': 10.0})
+        # Chain of references, which should be restored
+        # during single pass over worklist
+        self.dh.data['dgmattribs'].append({'attributeID': 5, 'maxAttributeID': 6})
+        self.dh.data['dgmattribs'].append({'attributeID': 6, 'maxAttributeID': 7})
+        self.dh.data['dgmattribs'].append({'attributeID': 7})
+        self.dh.data['dgmattribs'].append({'attributeID': 8})
+        generator = CacheGenerator()
+        data = generator.run(self.dh)
+        self.assertEqual(len(data['types']), 1)
+        self.assertEqual(len(data['attributes']), 3)
+        report = generator._cleaner.report
+        self.assertEqual([stage.name for stage in report], ['pump', 'kill weak', 'index', 'restore'])
+        pump, kill, index, restore = report
+        self.assertEqual(pump.rows, 1)
+        # All rows but pumped type
+        self.assertEqual(kill.rows, 7)
+        self.assertEqual(restore.rows, 5)
+        for stage in report:
+            self.assertGreaterEqual(stage.time, 0)
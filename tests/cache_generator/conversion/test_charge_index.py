@@ -0,0 +1,69 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eve import Attribute
+from tests.cache_generator.generator_testcase import GeneratorTestCase
+
+
+class TestConversionChargeIndex(GeneratorTestCase):
+    """
+    Charges which can be loaded into container should
+    be indexed against it.
+    """
+
+    def add_type(self, type_id, group_id, attributes):
+        self.dh.data['evetypes'].append({'typeID': type_id, 'groupID': group_id, 'typeName_en-us': ''})
+        for attr_id, value in attributes.items():
+            self.dh.data['dgmtypeattribs'].append({'typeID': type_id, 'attributeID': attr_id, 'value': value})
+
+    def setUp(self):
+        super().setUp()
+        self.dh.data['evegroups'].append({'categoryID': 7, 'groupID': 10, 'groupName_en-us': ''})
+        self.dh.data['evegroups'].append({'categoryID': 8, 'groupID': 20, 'groupName_en-us': ''})
+        self.dh.data['evegroups'].append({'categoryID': 8, 'groupID': 21, 'groupName_en-us': ''})
+
+    def test_index(self):
+        self.add_type(1, 10, {
+            Attribute.charge_group_1: 20, Attribute.charge_size: 1, Attribute.capacity: 10.0})
+        self.add_type(2, 20, {Attribute.charge_size: 1, Attribute.volume: 1.0})
+        self.add_type(3, 20, {Attribute.charge_size: 1, Attribute.volume: 2.0})
+        # Wrong size
+        self.add_type(4, 20, {Attribute.charge_size: 2, Attribute.volume: 1.0})
+        # Too big
+        self.add_type(5, 20, {Attribute.charge_size: 1, Attribute.volume: 100.0})
+        # Wrong group
+        self.add_type(6, 21, {Attribute.charge_size: 1, Attribute.volume: 1.0})
+        data = self.run_generator()
+        self.assertEqual(len(data['compatible_charges']), 1)
+        self.assertEqual(data['compatible_charges'][1]['charges'], [2, 3])
+
+    def test_no_restriction(self):
+        self.add_type(1, 10, {Attribute.capacity: 10.0})
+        self.add_type(2, 20, {Attribute.volume: 1.0})
+        data = self.run_generator()
+        self.assertEqual(len(data['compatible_charges']), 0)
+
+    def test_multiple_groups(self):
+        self.add_type(1, 10, {
+            Attribute.charge_group_1: 20, Attribute.charge_group_2: 21, Attribute.capacity: 10.0})
+        self.add_type(2, 20, {Attribute.volume: 1.0})
+        self.add_type(3, 21, {Attribute.volume: 1.0})
+        data = self.run_generator()
+        self.assertEqual(data['compatible_charges'][1]['charges'], [2, 3])
@@ -63,13 +63,11 @@ class TestConversionExpression(GeneratorTestCase):
         # because they will be replaced by modifiers anyway
         expected = {
             'expressionID': 41, 'operandID': 6, 'arg1': 1009, 'arg2': 15, 'expressionValue': None,
-            'expressionTypeID': 502, 'expressionGroupID': 451, 'expressionAttributeID': 90,
-            'table_pos': 0, 'randomField': 'vals'
+            'expressionTypeID': 502, 'expressionGroupID': 451, 'expressionAttributeID': 90, 'randomField': 'vals'
         }
         self.assertIn(expected, expressions)
         expected = {
             'expressionID': 57, 'operandID': 33, 'arg1': 5007, 'arg2': 66, 'expressionValue': 'Kurr',
-            'expressionTypeID': 551, 'expressionGroupID': 567, 'expressionAttributeID': 102,
-            'table_pos': 1, 'randoom': True
+            'expressionTypeID': 551, 'expressionGroupID': 567, 'expressionAttributeID': 102, 'randoom': True
         }
         self.assertIn(expected, expressions)
@@ -0,0 +1,92 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import json
+import os.path
+from tempfile import TemporaryDirectory
+
+from eos.const.eos import EffectBuildStatus
+from eos.const.eve import EffectCategory
+from eos.data.cache_generator import CacheGenerator
+from tests.cache_generator.generator_testcase import GeneratorTestCase
+
+
+class TestGeneratorReport(GeneratorTestCase):
+    """Check report about generator run."""
+
+    def setUp(self):
+        super().setUp()
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 1, 'typeName_en-us': ''})
+        self.dh.data['dgmattribs'].append({'attributeID': 50})
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 100})
+        self.dh.data['dgmeffects'].append({
+            'effectID': 100, 'effectCategory': EffectCategory.passive,
+            'modifierInfo': (
+                '- domain: shipID\n  func: ItemModifier\n  modifiedAttributeID: 22\n'
+                '  modifyingAttributeID: 11\n  operator: 6\n'
+            )
+        })
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 101})
+        self.dh.data['dgmeffects'].append({
+            'effectID': 101, 'effectCategory': EffectCategory.passive,
+            'modifierInfo': 'yap((EWH\x02'
+        })
+
+    def test_report(self):
+        generator = CacheGenerator()
+        generator.run(self.dh)
+        report = generator.report
+        stage_names = [stage.name for stage in report.stages]
+        self.assertEqual(stage_names, [
+            'fetch evetypes', 'fetch evegroups', 'fetch dgmattribs', 'fetch dgmtypeattribs',
+            'fetch dgmeffects', 'fetch dgmtypeeffects', 'fetch dgmexpressions',
+            'pre-cleanup check', 'normalization', 'cleanup', 'pre-conversion check', 'conversion'
+        ])
+        stages = dict((stage.name, stage) for stage in report.stages)
+        self.assertEqual(stages['fetch evetypes'].rows_in, {})
+        self.assertEqual(stages['fetch evetypes'].rows_out, {'evetypes': 1})
+        # Unreferenced attribute is removed during cleanup
+        self.assertEqual(stages['cleanup'].rows_in['dgmattribs'], 1)
+        self.assertEqual(stages['cleanup'].rows_out['dgmattribs'], 0)
+        self.assertEqual(stages['conversion'].rows_out['effects'], 2)
+        for stage in report.stages:
+            self.assertGreaterEqual(stage.time, 0)
+        self.assertEqual(report.build_statuses, {
+            EffectBuildStatus.not_built: 0,
+            EffectBuildStatus.error: 1,
+            EffectBuildStatus.ok_partial: 0,
+            EffectBuildStatus.ok_full: 1
+        })
+        self.assertEqual(len(report.cleanup_stages), 4)
+        # No new log entries besides the standard ones
+        self.assertEqual(len([r for r in self.log if not r.name.endswith('info2modifiers')]), 2)
+
+    def test_dump(self):
+        with TemporaryDirectory() as tmp_dir:
+            report_path = os.path.join(tmp_dir, 'report.json')
+            generator = CacheGenerator(report_path=report_path)
+            generator.run(self.dh)
+            with open(report_path) as file:
+                report = json.load(file)
+        self.assertEqual(len(report['stages']), 12)
+        self.assertEqual(report['build_statuses'], {'not_built': 0, 'error': 1, 'ok_partial': 0, 'ok_full': 1})
+        self.assertEqual(report['stages'][-1]['name'], 'conversion')
+        self.assertIn('rss_delta', report['stages'][-1])
+        self.assertEqual(report['etree_memo']['hits'], 0)
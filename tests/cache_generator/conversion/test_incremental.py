@@ -0,0 +1,265 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import logging
+import os.path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from eos.const.eve import Attribute, EffectCategory
+from eos.data.cache_generator import CacheGenerator
+from eos.data.cache_generator.modifier_builder import ModifierBuilder
+from tests.cache_generator.environment import DataHandler
+from tests.cache_generator.generator_testcase import GeneratorTestCase
+
+
+class TestConversionIncremental(GeneratorTestCase):
+    """
+    When snapshot of previous run is available, generator
+    should build only modifiers of effects touched by data
+    changes, producing the same data as full run.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.tmp_dir.name, 'snapshot.json.bz2')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    def _make_yaml(self, src_attr, tgt_attr):
+        yaml = ('- domain: shipID\n  func: ItemModifier\n  modifiedAttributeID: {}\n'
+                '  modifyingAttributeID: {}\n  operator: 6\n')
+        return yaml.format(tgt_attr, src_attr)
+
+    def _fill_data(self, changed_yaml=False):
+        self.dh = DataHandler()
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 1, 'typeName_en-us': ''})
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 100})
+        self.dh.data['dgmeffects'].append({
+            'effectID': 100, 'effectCategory': EffectCategory.passive,
+            'modifierInfo': self._make_yaml(11, 33 if changed_yaml else 22)
+        })
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 101})
+        self.dh.data['dgmeffects'].append({
+            'effectID': 101, 'effectCategory': EffectCategory.passive,
+            'modifierInfo': self._make_yaml(44, 55)
+        })
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 94})
+        self.dh.data['dgmeffects'].append({
+            'effectID': 94, 'effectCategory': EffectCategory.passive,
+            'modifierInfo': 'yap((EWH\x02'
+        })
+
+    def _get_log_entries(self):
+        return [(r.name, r.levelno, r.getMessage()) for r in self.log if r.name.endswith('info2modifiers')]
+
+    def test_unchanged(self):
+        self._fill_data()
+        full_data = self.run_generator(snapshot_path=self.snapshot_path)
+        full_log = self._get_log_entries()
+        self.log.clear()
+        self._fill_data()
+        with patch.object(ModifierBuilder, 'build', autospec=True, side_effect=ModifierBuilder.build) as build:
+            data = self.run_generator(snapshot_path=self.snapshot_path)
+        self.assertEqual(build.call_count, 0)
+        self.assertEqual(data, full_data)
+        # Log output of modifier building is replayed
+        self.assertEqual(self._get_log_entries(), full_log)
+        self.assertEqual(len(full_log), 1)
+        diff_stats = self.log[-2]
+        self.assertEqual(diff_stats.name, 'eos.data.cache_generator.generator')
+        self.assertEqual(diff_stats.levelno, logging.INFO)
+        expected = (
+            'diff against previous run: 0 types out of 1 changed; '
+            'reusing modifiers of 3 effects out of 3'
+        )
+        self.assertEqual(diff_stats.msg, expected)
+
+    def test_changed(self):
+        self._fill_data()
+        self.run_generator(snapshot_path=self.snapshot_path)
+        self._fill_data(changed_yaml=True)
+        full_data = self.run_generator()
+        self.log.clear()
+        self._fill_data(changed_yaml=True)
+        with patch.object(ModifierBuilder, 'build', autospec=True, side_effect=ModifierBuilder.build) as build:
+            data = self.run_generator(snapshot_path=self.snapshot_path)
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(build.call_args[0][1]['effect_id'], 100)
+        self.assertEqual(data, full_data)
+        self.assertEqual(data['modifiers'][1]['tgt_attr'], 33)
+
+    def test_changed_expression(self):
+        def fill_data(operand_id):
+            self.dh = DataHandler()
+            self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 1, 'typeName_en-us': ''})
+            for effect_id, expression_id in ((100, 1000), (101, 1001)):
+                self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': effect_id})
+                self.dh.data['dgmeffects'].append({
+                    'effectID': effect_id, 'effectCategory': EffectCategory.passive,
+                    'preExpression': expression_id, 'postExpression': expression_id
+                })
+            self.dh.data['dgmexpressions'].append({'expressionID': 1000, 'operandID': 23, 'arg1': 2000})
+            self.dh.data['dgmexpressions'].append({'expressionID': 1001, 'operandID': 23, 'arg1': 2001})
+            self.dh.data['dgmexpressions'].append({'expressionID': 2000, 'operandID': 23})
+            self.dh.data['dgmexpressions'].append({'expressionID': 2001, 'operandID': operand_id})
+
+        fill_data(23)
+        self.run_generator(snapshot_path=self.snapshot_path)
+        fill_data(24)
+        with patch.object(ModifierBuilder, 'build', autospec=True, side_effect=ModifierBuilder.build) as build:
+            self.run_generator(snapshot_path=self.snapshot_path)
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(build.call_args[0][1]['effect_id'], 101)
+
+
+class TestConversionIncrementalTypes(GeneratorTestCase):
+    """
+    When snapshot of previous run is available, generator
+    should process only rows of types touched by data changes,
+    producing the same data as full run.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.tmp_dir.name, 'snapshot.json.bz2')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    def _fill_data(self, charge_volume=2.0, charge_category=8, charge_removed=False, referenced_type=None):
+        self.dh = DataHandler()
+        self.dh.data['evegroups'].append({'categoryID': 7, 'groupID': 10, 'groupName_en-us': ''})
+        self.dh.data['evegroups'].append({'categoryID': charge_category, 'groupID': 20, 'groupName_en-us': ''})
+        self.dh.data['evegroups'].append({'categoryID': 99, 'groupID': 30, 'groupName_en-us': ''})
+        for attr_id in (Attribute.charge_group_1, Attribute.charge_size, Attribute.volume, 50, 60):
+            self.dh.data['dgmattribs'].append({'attributeID': attr_id})
+        self._add_type(1, 10, {Attribute.charge_group_1: 20, Attribute.charge_size: 1, 50: 5})
+        self._add_type(2, 20, {Attribute.charge_size: 1, Attribute.volume: 1.0})
+        if not charge_removed:
+            self._add_type(3, 20, {Attribute.charge_size: 1, Attribute.volume: charge_volume})
+        # Type of weak group, kept only when it is referenced
+        self._add_type(4, 30, {60: 5})
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 100})
+        self.dh.data['dgmeffects'].append({
+            'effectID': 100, 'effectCategory': EffectCategory.passive,
+            'preExpression': 1000, 'postExpression': 1000
+        })
+        self.dh.data['dgmexpressions'].append({
+            'expressionID': 1000, 'operandID': 23, 'expressionTypeID': referenced_type})
+
+    def _add_type(self, type_id, group_id, attributes):
+        self.dh.data['evetypes'].append({
+            'typeID': type_id, 'groupID': group_id, 'typeName_en-us': '', 'capacity': 10.0})
+        for attr_id, value in attributes.items():
+            self.dh.data['dgmtypeattribs'].append({'typeID': type_id, 'attributeID': attr_id, 'value': value})
+
+    def _check(self, old_kwargs, new_kwargs):
+        """
+        Run generator on old and new data, and check that incremental
+        run on new data produces the same data as full run.
+
+        Return value:
+        Amounts of rows normalized by incremental run, list with
+        {table name: rows} dictionary per normalization
+        """
+        self._fill_data(**old_kwargs)
+        self.run_generator(snapshot_path=self.snapshot_path)
+        self._fill_data(**new_kwargs)
+        full_data = self.run_generator()
+        self._fill_data(**new_kwargs)
+        generator = CacheGenerator(snapshot_path=self.snapshot_path)
+        data = generator.run(self.dh)
+        self.assertEqual(self._key_data(data), full_data)
+        return [s.rows_in for s in generator.report.stages if s.name == 'normalization']
+
+    def _key_data(self, data):
+        keys = {
+            'types': 'type_id',
+            'attributes': 'attribute_id',
+            'effects': 'effect_id',
+            'modifiers': 'modifier_id',
+            'compatible_charges': 'type_id'
+        }
+        return dict(
+            (table_name, dict((row[keys[table_name]], row) for row in rows))
+            for table_name, rows in data.items()
+        )
+
+    def test_unchanged(self):
+        rows = self._check({}, {})
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['evetypes'], 0)
+        self.assertEqual(rows[0]['dgmtypeattribs'], 0)
+
+    def test_type_changed(self):
+        rows = self._check({}, {'charge_volume': 100.0})
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['evetypes'], 1)
+        self.assertEqual(rows[0]['dgmtypeattribs'], 2)
+        data = self.run_generator()
+        # Index of unchanged container is updated too
+        self.assertEqual(data['compatible_charges'][1]['charges'], [2])
+        # Attribute used only by unchanged type is kept
+        self.assertIn(50, data['attributes'])
+
+    def test_type_removed(self):
+        rows = self._check({}, {'charge_removed': True})
+        self.assertEqual(rows[0]['evetypes'], 0)
+        data = self.run_generator()
+        self.assertNotIn(3, data['types'])
+        self.assertEqual(data['compatible_charges'][1]['charges'], [2])
+
+    def test_group_category_changed(self):
+        rows = self._check({}, {'charge_category': 7})
+        self.assertEqual(rows[0]['evetypes'], 2)
+        data = self.run_generator()
+        self.assertEqual(data['types'][2]['category'], 7)
+        self.assertEqual(data['types'][3]['category'], 7)
+
+    def test_unchanged_type_kept(self):
+        rows = self._check({}, {'referenced_type': 4})
+        # Type was never converted, thus data is processed
+        # again along with it
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1]['evetypes'], 1)
+        data = self.run_generator()
+        self.assertIn(4, data['types'])
+        self.assertIn(60, data['attributes'])
+
+    def test_unchanged_type_removed(self):
+        self._check({'referenced_type': 4}, {})
+        data = self.run_generator()
+        self.assertNotIn(4, data['types'])
+        self.assertNotIn(60, data['attributes'])
+
+    def test_unchanged_type_kept_again(self):
+        self._fill_data(referenced_type=4)
+        self.run_generator(snapshot_path=self.snapshot_path)
+        rows = self._check({}, {'referenced_type': 4})
+        # Type converted by earlier run is taken from snapshot
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['evetypes'], 0)
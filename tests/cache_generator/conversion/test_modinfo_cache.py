@@ -0,0 +1,92 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import os.path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from eos.const.eve import EffectCategory
+from eos.data.cache_generator.modifier_builder.modifier_info import cache
+from tests.cache_generator.environment import DataHandler
+from tests.cache_generator.generator_testcase import GeneratorTestCase
+
+
+class TestConversionModinfoCache(GeneratorTestCase):
+    """
+    Modifier info YAML of each effect should be parsed once
+    per run, and not parsed at all when parsed form has been
+    persisted by previous run.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp_dir.name, 'modinfo.json.bz2')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    def _fill_data(self, tgt_attr=22):
+        self.dh = DataHandler()
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 1, 'typeName_en-us': ''})
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 100})
+        self.dh.data['dgmeffects'].append({
+            'effectID': 100, 'effectCategory': EffectCategory.passive,
+            'modifierInfo': (
+                '- domain: shipID\n  func: ItemModifier\n  modifiedAttributeID: {}\n'
+                '  modifyingAttributeID: 11\n  operator: 6\n'
+            ).format(tgt_attr)
+        })
+        self.dh.data['dgmattribs'].append({'attributeID': 11})
+        self.dh.data['dgmattribs'].append({'attributeID': 22})
+        self.dh.data['dgmattribs'].append({'attributeID': 33})
+
+    def _run_counting(self, **kwargs):
+        with patch.object(cache, 'parse_modifier_info', side_effect=cache.parse_modifier_info) as parse:
+            data = self.run_generator(**kwargs)
+        return data, parse.call_count
+
+    def test_single_parse(self):
+        self._fill_data()
+        data, parse_count = self._run_counting()
+        self.assertEqual(parse_count, 1)
+        self.assertEqual(len(data['modifiers']), 1)
+        self.assertEqual(data['modifiers'][1]['tgt_attr'], 22)
+        # Attributes referenced by modifier info are kept by cleaner
+        self.assertEqual(set(data['attributes']), {11, 22})
+        self.assertEqual(len(self.log), 2)
+
+    def test_persisted(self):
+        self._fill_data()
+        full_data, parse_count = self._run_counting(modinfo_cache_path=self.cache_path)
+        self.assertEqual(parse_count, 1)
+        self._fill_data()
+        data, parse_count = self._run_counting(modinfo_cache_path=self.cache_path)
+        self.assertEqual(parse_count, 0)
+        self.assertEqual(data, full_data)
+
+    def test_persisted_changed(self):
+        self._fill_data()
+        self._run_counting(modinfo_cache_path=self.cache_path)
+        self._fill_data(tgt_attr=33)
+        data, parse_count = self._run_counting(modinfo_cache_path=self.cache_path)
+        self.assertEqual(parse_count, 1)
+        self.assertEqual(data['modifiers'][1]['tgt_attr'], 33)
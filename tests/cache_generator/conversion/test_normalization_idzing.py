@@ -57,7 +57,7 @@ class TestNormalizationIdzing(GeneratorTestCase):
         expected = {
             'expressionID': 57, 'operandID': Operand.def_type, 'arg1': 5007, 'arg2': 66,
             'expressionValue': None, 'expressionTypeID': 556, 'expressionGroupID': 567,
-            'expressionAttributeID': 102, 'table_pos': 0
+            'expressionAttributeID': 102
         }
         self.assertIn(expected, expressions)
 
@@ -87,7 +87,7 @@ class TestNormalizationIdzing(GeneratorTestCase):
         expected = {
             'expressionID': 57, 'operandID': Operand.def_grp, 'arg1': 5007, 'arg2': 66,
             'expressionValue': None, 'expressionTypeID': 567, 'expressionGroupID': 668,
-            'expressionAttributeID': 102, 'table_pos': 0
+            'expressionAttributeID': 102
         }
         self.assertIn(expected, expressions)
 
@@ -119,7 +119,7 @@ class TestNormalizationIdzing(GeneratorTestCase):
         expected = {
             'expressionID': 34, 'operandID': Operand.def_attr, 'arg1': 2357, 'arg2': 66,
             'expressionValue': None, 'expressionTypeID': 567, 'expressionGroupID': 322,
-            'expressionAttributeID': 334, 'table_pos': 0
+            'expressionAttributeID': 334
         }
         self.assertIn(expected, expressions)
 
@@ -148,7 +148,7 @@ class TestNormalizationIdzing(GeneratorTestCase):
         expected = {
             'expressionID': 57, 'operandID': Operand.def_type, 'arg1': 5007, 'arg2': 66,
             'expressionValue': None, 'expressionTypeID': 556, 'expressionGroupID': 567,
-            'expressionAttributeID': 102, 'table_pos': 0
+            'expressionAttributeID': 102
         }
         self.assertIn(expected, expressions)
 
@@ -195,13 +195,13 @@ class TestNormalizationIdzing(GeneratorTestCase):
         expected = {
             'expressionID': 57, 'operandID': Operand.def_type, 'arg1': 5007, 'arg2': 66,
             'expressionValue': None, 'expressionTypeID': 556, 'expressionGroupID': 567,
-            'expressionAttributeID': 102, 'table_pos': 0
+            'expressionAttributeID': 102
         }
         self.assertIn(expected, expressions)
         expected = {
             'expressionID': 589, 'operandID': Operand.def_type, 'arg1': 507, 'arg2': 6,
             'expressionValue': None, 'expressionTypeID': 556, 'expressionGroupID': 57,
-            'expressionAttributeID': 12, 'table_pos': 1
+            'expressionAttributeID': 12
         }
         self.assertIn(expected, expressions)
 
@@ -232,6 +232,6 @@ class TestNormalizationIdzing(GeneratorTestCase):
         expected = {
             'expressionID': 57, 'operandID': Operand.def_type, 'arg1': 5007, 'arg2': 66,
             'expressionValue': 'BigGun3', 'expressionTypeID': None, 'expressionGroupID': 567,
-            'expressionAttributeID': 102, 'table_pos': 0
+            'expressionAttributeID': 102
         }
         self.assertIn(expected, expressions)
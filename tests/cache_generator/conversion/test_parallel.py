@@ -0,0 +1,95 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import logging
+import sys
+
+from eos.const.eos import EffectBuildStatus
+from eos.const.eve import EffectCategory
+from eos.data.cache_generator.converter import _RecordBuffer
+from tests.cache_generator.environment import DataHandler
+from tests.cache_generator.generator_testcase import GeneratorTestCase
+
+
+class TestConversionParallel(GeneratorTestCase):
+    """
+    Parallel mode of generator should produce the same
+    data and the same log output as serial mode.
+    """
+
+    def _make_yaml(self, src_attr, tgt_attr):
+        yaml = ('- domain: shipID\n  func: ItemModifier\n  modifiedAttributeID: {}\n'
+                '  modifyingAttributeID: {}\n  operator: 6\n')
+        return yaml.format(tgt_attr, src_attr)
+
+    def _fill_data(self):
+        self.dh.data['evetypes'].append({'typeID': 1, 'groupID': 1, 'typeName_en-us': ''})
+        for effect_id in range(100, 120):
+            self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': effect_id})
+            # Make some effects to share modifiers
+            self.dh.data['dgmeffects'].append({
+                'effectID': effect_id, 'effectCategory': EffectCategory.passive,
+                'modifierInfo': self._make_yaml(effect_id % 3, effect_id % 5)
+            })
+        self.dh.data['dgmtypeeffects'].append({'typeID': 1, 'effectID': 94})
+        self.dh.data['dgmeffects'].append({
+            'effectID': 94, 'effectCategory': EffectCategory.passive,
+            'modifierInfo': 'yap((EWH\x02'
+        })
+
+    def test_same_as_serial(self):
+        self._fill_data()
+        serial_data = self.run_generator()
+        serial_log = [(r.name, r.levelno, r.getMessage()) for r in self.log]
+        self.log.clear()
+        self.dh = DataHandler()
+        self._fill_data()
+        parallel_data = self.run_generator(workers=3)
+        parallel_log = [(r.name, r.levelno, r.getMessage()) for r in self.log]
+        self.assertEqual(parallel_data, serial_data)
+        self.assertEqual(parallel_log, serial_log)
+        self.assertEqual(len(parallel_data['modifiers']), 15)
+        self.assertEqual(parallel_data['effects'][94]['build_status'], EffectBuildStatus.error)
+        self.assertEqual(len(parallel_log), 3)
+        log_record = parallel_log[2]
+        self.assertEqual(log_record[0], 'eos.data.cache_generator.modifier_builder.modifier_info.info2modifiers')
+        self.assertEqual(log_record[1], logging.ERROR)
+        self.assertEqual(log_record[2], 'failed to parse modifier info YAML for effect 94')
+
+    def test_record_buffer_keeps_original(self):
+        buffer = _RecordBuffer()
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            exc_info = sys.exc_info()
+        record = logging.LogRecord('eos.test', logging.ERROR, __file__, 1, 'value %s', (5,), exc_info)
+        buffer.handle(record)
+        # Handlers which run after buffer should receive
+        # record as it was emitted
+        self.assertEqual(record.msg, 'value %s')
+        self.assertEqual(record.args, (5,))
+        self.assertIs(record.exc_info, exc_info)
+        self.assertEqual(len(buffer.records), 1)
+        buffered = buffer.records[0]
+        self.assertIsNot(buffered, record)
+        self.assertEqual(buffered.getMessage(), 'value 5')
+        self.assertIsNone(buffered.exc_info)
+        self.assertIn('boom', buffered.exc_text)
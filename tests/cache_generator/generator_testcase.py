@@ -36,18 +36,20 @@ class GeneratorTestCase(EosTestCase):
         super().setUp()
         self.dh = DataHandler()
 
-    def run_generator(self):
+    def run_generator(self, **kwargs):
         """
         Run generator and rework data structure into
-        keyed tables so it's easier to check.
+        keyed tables so it's easier to check. Keyword
+        arguments are passed to generator constructor.
         """
-        generator = CacheGenerator()
+        generator = CacheGenerator(**kwargs)
         data = generator.run(self.dh)
         keys = {
             'types': 'type_id',
             'attributes': 'attribute_id',
             'effects': 'effect_id',
-            'modifiers': 'modifier_id'
+            'modifiers': 'modifier_id',
+            'compatible_charges': 'type_id'
         }
         keyed_data = {}
         for table_name in data:
@@ -0,0 +1,56 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import weakref
+
+from eos.const.eos import Slot, State
+from eos.const.eve import Effect as EffectId, EffectCategory
+from eos.data.cache_object import Attribute, Effect, Modifier, Type
+from eos.fit.attribute_calculator.affector import Affector
+from tests.eos_testcase import EosTestCase
+
+
+class TestCacheObject(EosTestCase):
+    """Check that cache objects are compact and keep their behavior."""
+
+    def test_no_instance_dict(self):
+        for obj in (Type(type_id=1), Effect(effect_id=1), Modifier(), Attribute(attribute_id=1)):
+            self.assertFalse(hasattr(obj, '__dict__'))
+            # Cache handlers keep weak references to objects
+            self.assertIs(weakref.ref(obj)(), obj)
+
+    def test_affector_no_instance_dict(self):
+        self.assertFalse(hasattr(Affector(None, None), '__dict__'))
+
+    def test_cached_property(self):
+        effect = Effect(effect_id=EffectId.hi_power, category=EffectCategory.online)
+        type_ = Type(type_id=1, effects=(effect,))
+        self.assertEqual(type_.slots, {Slot.module_high})
+        self.assertEqual(type_.max_state, State.online)
+        # Value is calculated only once
+        type_.effects = ()
+        self.assertEqual(type_.slots, {Slot.module_high})
+        del type_.slots
+        self.assertEqual(type_.slots, set())
+
+    def test_cached_property_override(self):
+        type_ = Type(type_id=1)
+        type_.slots = {Slot.rig}
+        self.assertEqual(type_.slots, {Slot.rig})
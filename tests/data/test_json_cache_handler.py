@@ -0,0 +1,120 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import pytest
+
+from eos.const.eve import Attribute
+from eos.data.cache_handler import JsonCacheHandler
+
+
+@pytest.fixture
+def cache_data():
+    return {
+        'types': [{
+            'type_id': 1, 'group': 2, 'category': 3, 'effects': [10], 'default_effect': None,
+            'attributes': {
+                # Used by Eos directly, equal to default
+                Attribute.cpu: 0.0,
+                # Modified, equal to default and not
+                5000: 5.0,
+                5001: 7.0,
+                # Not referenced by anything
+                5002: 1.0,
+                # Extra attribute requested by user
+                5003: 0.0
+            }
+        }],
+        'attributes': [
+            {'attribute_id': Attribute.cpu, 'max_attribute': None, 'default_value': 0.0,
+             'high_is_good': False, 'stackable': True},
+            {'attribute_id': 5000, 'max_attribute': None, 'default_value': 5.0,
+             'high_is_good': True, 'stackable': True},
+            {'attribute_id': 5001, 'max_attribute': None, 'default_value': 5.0,
+             'high_is_good': True, 'stackable': True},
+            {'attribute_id': 5002, 'max_attribute': None, 'default_value': 0.0,
+             'high_is_good': True, 'stackable': True},
+            {'attribute_id': 5003, 'max_attribute': None, 'default_value': 0.0,
+             'high_is_good': True, 'stackable': True}
+        ],
+        'effects': [{
+            'effect_id': 10, 'effect_category': 0, 'is_offensive': False, 'is_assistance': False,
+            'duration_attribute': None, 'discharge_attribute': None, 'range_attribute': None,
+            'falloff_attribute': None, 'tracking_speed_attribute': None,
+            'fitting_usage_chance_attribute': None, 'build_status': 4, 'modifiers': [20]
+        }],
+        'modifiers': [{
+            'modifier_id': 20, 'state': 0, 'scope': 0, 'src_attr': 5000, 'operator': 0,
+            'tgt_attr': 5001, 'domain': 0, 'filter_type': None, 'filter_value': None
+        }]
+    }
+
+
+def test_full(tmpdir, cache_data):
+    handler = JsonCacheHandler(str(tmpdir.join('cache.json.bz2')))
+    handler.update_cache(cache_data, 'fp')
+    assert set(handler.get_type(1).attributes) == {Attribute.cpu, 5000, 5001, 5002, 5003}
+
+
+def test_slim(tmpdir, cache_data):
+    handler = JsonCacheHandler(str(tmpdir.join('cache.json.bz2')), slim=True, keep_attributes=(5003,))
+    handler.update_cache(cache_data, 'fp')
+    assert handler.get_type(1).attributes == {Attribute.cpu: 0.0, 5001: 7.0, 5003: 0.0}
+    assert handler.get_attribute(5000).default_value == 5.0
+    assert handler.get_fingerprint() == 'fp'
+
+
+def test_profile_change(tmpdir, cache_data):
+    path = str(tmpdir.join('cache.json.bz2'))
+    JsonCacheHandler(path).update_cache(cache_data, 'fp')
+    assert JsonCacheHandler(path).get_fingerprint() == 'fp'
+    # Cache made with different profile should be regenerated
+    assert JsonCacheHandler(path, slim=True).get_fingerprint() is None
+    JsonCacheHandler(path, slim=True).update_cache(cache_data, 'fp')
+    assert JsonCacheHandler(path, slim=True).get_fingerprint() == 'fp'
+    assert JsonCacheHandler(path, slim=True, keep_attributes=(5002,)).get_fingerprint() is None
+
+
+def test_type_hash(tmpdir, cache_data):
+    handler1 = JsonCacheHandler(str(tmpdir.join('cache1.json.bz2')))
+    handler1.update_cache(cache_data, 'fp')
+    handler2 = JsonCacheHandler(str(tmpdir.join('cache2.json.bz2')))
+    handler2.update_cache(cache_data, 'fp')
+    assert handler1.get_type_hash(1) == handler2.get_type_hash(1)
+    assert handler1.get_attributes_hash() == handler2.get_attributes_hash()
+    assert handler1.get_type_hash(2) is None
+    # Change in modifier is reflected in hash of type which uses it
+    cache_data['modifiers'][0]['operator'] = 1
+    handler2.update_cache(cache_data, 'fp2')
+    assert handler1.get_type_hash(1) != handler2.get_type_hash(1)
+    assert handler1.get_attributes_hash() == handler2.get_attributes_hash()
+
+
+def test_compatible_charges(tmpdir, cache_data):
+    path = str(tmpdir.join('cache.json.bz2'))
+    handler = JsonCacheHandler(path)
+    handler.update_cache(cache_data, 'fp')
+    # Cache made without index doesn't provide it
+    assert handler.get_compatible_charges(1) is None
+    cache_data['compatible_charges'] = [{'type_id': 1, 'charges': [2, 3]}]
+    handler.update_cache(cache_data, 'fp2')
+    assert handler.get_compatible_charges(1) == (2, 3)
+    assert handler.get_compatible_charges(4) == ()
+    # Index is loaded from disk along with the rest of cache
+    assert JsonCacheHandler(path).get_compatible_charges(1) == (2, 3)
@@ -0,0 +1,74 @@
+# ===============================================================================
+# Copyright (C) 2011 Diego Duclos
+# Copyright (C) 2011-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import sqlite3
+
+import pytest
+
+from eos.data.data_handler import SQLiteDataHandler
+
+
+@pytest.fixture
+def dbpath(tmpdir):
+    path = str(tmpdir.join('eve.db'))
+    conn = sqlite3.connect(path)
+    conn.execute(
+        'CREATE TABLE evetypes ("typeID" INTEGER, "groupID" INTEGER, "typeName_en-us" TEXT, '
+        '"description_en-us" TEXT, "radius" REAL)'
+    )
+    conn.execute('INSERT INTO evetypes VALUES (1, 2, "Rifter", "Long text", 31.0)')
+    conn.execute('INSERT INTO evetypes VALUES (3, 4, "Tristan", "Other text", 40.0)')
+    conn.execute('CREATE TABLE dgmtypeeffects ("typeID" INTEGER, "effectID" INTEGER, "isDefault" BOOLEAN)')
+    conn.execute('INSERT INTO dgmtypeeffects VALUES (1, 11, 1)')
+    conn.execute('CREATE TABLE phbmetadata ("field_name" TEXT, "field_value" TEXT)')
+    conn.execute('INSERT INTO phbmetadata VALUES ("client_build", "1234")')
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_projection(dbpath):
+    rows = list(SQLiteDataHandler(dbpath).get_evetypes())
+    assert rows == [
+        {'typeID': 1, 'groupID': 2, 'typeName_en-us': 'Rifter', 'radius': 31.0},
+        {'typeID': 3, 'groupID': 4, 'typeName_en-us': 'Tristan', 'radius': 40.0}
+    ]
+
+
+def test_streaming(dbpath):
+    rows = SQLiteDataHandler(dbpath).get_evetypes()
+    assert not isinstance(rows, list)
+    assert next(rows)['typeID'] == 1
+
+
+def test_boolean(dbpath):
+    rows = list(SQLiteDataHandler(dbpath, mmap_size=2 ** 20).get_dgmtypeeffects())
+    assert rows == [{'typeID': 1, 'effectID': 11, 'isDefault': True}]
+
+
+def test_read_only(dbpath):
+    conn = SQLiteDataHandler(dbpath)._SQLiteDataHandler__connect()
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute('DELETE FROM evetypes')
+
+
+def test_version(dbpath):
+    assert SQLiteDataHandler(dbpath).get_version() == '1234'
@@ -29,6 +29,9 @@ class CacheHandler:
         self.__type_data = {}
         self.__attribute_data = {}
         self.__effect_data = {}
+        # Tests which need content hashes assign them directly
+        self.type_hashes = {}
+        self.attributes_hash = None
 
     def type_(self, **kwargs):
         type_ = Type(**kwargs)
@@ -68,3 +71,9 @@ class CacheHandler:
             return self.__effect_data[eff_id]
         except KeyError:
             raise EffectFetchError(eff_id)
+
+    def get_type_hash(self, type_id):
+        return self.type_hashes.get(type_id)
+
+    def get_attributes_hash(self):
+        return self.attributes_hash
@@ -0,0 +1,132 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from unittest.mock import patch
+
+from eos.const.eos import Domain, Operator, Scope, State
+from eos.const.eve import Attribute, Category, EffectCategory, Type
+from eos.data.cache_object import Modifier
+from eos.data.source import Source
+from eos.fit import Fit
+from eos.fit.attribute_calculator.map import MutableAttributeMap
+from eos.fit.holder.item import Charge, Module, Ship
+from tests.eos_testcase import EosTestCase
+
+
+class TestHolderMixinChargeMatrix(EosTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for attr_id in (
+            1, 2, Attribute.capacity, Attribute.volume,
+            Attribute.charge_size, Attribute.charge_group_1
+        ):
+            self.ch.attribute(attribute_id=attr_id)
+        modifier = Modifier(
+            state=State.offline, scope=Scope.local, src_attr=1, operator=Operator.post_mul,
+            tgt_attr=2, domain=Domain.other, filter_type=None, filter_value=None
+        )
+        self.effect = self.ch.effect(effect_id=1, category=EffectCategory.passive, modifiers=(modifier,))
+        self.ch.type_(type_id=1, attributes={})
+        self.ch.type_(type_id=2, attributes={
+            2: 10, Attribute.capacity: 20.0, Attribute.charge_size: 1, Attribute.charge_group_1: 100})
+        self.make_charge(3, 100, {1: 2})
+        self.make_charge(4, 100, {1: 3, Attribute.volume: 4.0})
+        # Wrong group
+        self.make_charge(5, 200, {1: 4})
+        # Wrong size
+        self.make_charge(6, 100, {1: 5, Attribute.charge_size: 2})
+        # Too big
+        self.make_charge(7, 100, {1: 6, Attribute.volume: 50.0})
+        # Not a charge
+        self.make_charge(8, 100, {1: 7}, category=Category.module)
+        self.ch.type_(type_id=Type.character_static, attributes={})
+        self.fit = Fit(source=Source(alias='test', cache_handler=self.ch))
+        self.fit.ship = Ship(1)
+        self.module = Module(2, state=State.active, charge=Charge(3))
+        self.fit.modules.high.append(self.module)
+
+    def make_charge(self, type_id, group, attributes, category=Category.charge):
+        charge_attrs = {Attribute.charge_size: 1, Attribute.volume: 2.0}
+        charge_attrs.update(attributes)
+        self.ch.type_(
+            type_id=type_id, group=group, category=category, effects=(self.effect,), attributes=charge_attrs)
+
+    def test_matrix(self):
+        charge = self.module.charge
+        self.assertAlmostEqual(self.module.attributes[2], 20)
+        holders = set(self.fit._holders)
+        matrix = self.module.charge_matrix(
+            (3, 4, 5, 6, 7), stats=('charge_quantity_max', lambda holder: holder.attributes[2]))
+        self.assertEqual(set(matrix), {3, 4})
+        self.assertEqual(matrix[3][0], 10)
+        self.assertAlmostEqual(matrix[3][1], 20)
+        self.assertEqual(matrix[4][0], 5)
+        self.assertAlmostEqual(matrix[4][1], 30)
+        # Fit is not changed
+        self.assertIs(self.module.charge, charge)
+        self.assertEqual(charge.item.id, 3)
+        self.assertEqual(self.fit._holders, holders)
+        self.assertAlmostEqual(self.module.attributes[2], 20)
+        self.assertEqual(len(self.log), 0)
+
+    def test_unknown_type(self):
+        matrix = self.module.charge_matrix((3, 1000, 4), stats=('charge_quantity_max',))
+        self.assertEqual(matrix, {3: (10,), 4: (5,)})
+        self.assertEqual(self.module.charge.item.id, 3)
+        self.assertEqual(len(self.log), 0)
+
+    def test_calculated_data_kept(self):
+        charge = self.module.charge
+        self.assertAlmostEqual(self.module.attributes[2], 20)
+        self.assertAlmostEqual(charge.attributes[1], 2)
+        self.assertEqual(self.module.charge_quantity_max, 10)
+        self.module.charge_matrix((3, 4), stats=('charge_quantity_max',))
+        # Values calculated before are put back, not calculated again
+        with patch.object(MutableAttributeMap, '_MutableAttributeMap__calculate') as calc:
+            self.assertAlmostEqual(self.module.attributes[2], 20)
+            self.assertAlmostEqual(charge.attributes[1], 2)
+            self.assertEqual(calc.call_count, 0)
+        self.assertIn('charge_quantity_max', self.module._volatile_attrs)
+        self.assertEqual(self.module.charge_quantity_max, 10)
+        self.assertEqual(len(self.log), 0)
+
+    def test_not_charge(self):
+        matrix = self.module.charge_matrix((3, 8), stats=('charge_quantity_max',))
+        self.assertEqual(matrix, {3: (10,)})
+        self.assertEqual(self.module.charge.item.id, 3)
+        self.assertEqual(len(self.log), 0)
+
+    def test_no_compatible(self):
+        self.assertEqual(self.module.charge_matrix((5, 6), stats=('charge_quantity_max',)), {})
+        self.assertEqual(len(self.log), 0)
+
+    def test_no_charge(self):
+        self.module.charge = None
+        matrix = self.module.charge_matrix((3,), stats=(lambda holder: holder.attributes[2],))
+        self.assertAlmostEqual(matrix[3][0], 20)
+        self.assertIsNone(self.module.charge)
+        self.assertAlmostEqual(self.module.attributes[2], 10)
+        self.assertEqual(len(self.log), 0)
+
+    def test_detached(self):
+        module = Module(2, state=State.active)
+        self.assertRaises(ValueError, module.charge_matrix, (3,), stats=('charge_quantity_max',))
+        self.assertEqual(len(self.log), 0)
@@ -187,7 +187,7 @@ class TestHolderMixinChargedCycles(FitTestCase):
         self.holder.attributes[Attribute.charge_rate] = 2.0
         self.assertEqual(self.holder.fully_charged_cycles, 25)
         self.assertEqual(self.holder.fully_charged_cycles_max, 25)
-        self.holder._clear_volatile_attrs()
+        self.holder._reset_volatile_attrs()
         del self.holder.item.attributes[Attribute.charge_rate]
         del self.holder.attributes[Attribute.charge_rate]
         self.holder.attributes[Attribute.capacity] = 4.0
@@ -93,7 +93,7 @@ class TestHolderMixinChargeQuantity(FitTestCase):
         self.charge.attributes[Attribute.volume] = 2.0
         self.assertEqual(self.holder.charge_quantity_max, 10)
         self.assertEqual(self.holder.charge_quantity, 10)
-        self.holder._clear_volatile_attrs()
+        self.holder._reset_volatile_attrs()
         self.holder.attributes[Attribute.capacity] = 200.0
         self.charge.attributes[Attribute.volume] = 1.0
         self.assertEqual(self.holder.charge_quantity_max, 200)
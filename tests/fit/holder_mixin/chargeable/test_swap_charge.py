@@ -0,0 +1,189 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from unittest.mock import patch
+
+from eos.const.eos import Domain, FilterType, Operator, Scope, State
+from eos.const.eve import Attribute, EffectCategory, Type
+from eos.data.cache_handler.exception import TypeFetchError
+from eos.data.cache_object import Modifier
+from eos.data.source import Source
+from eos.fit import Fit
+from eos.fit.holder.item import Charge, Module, Rig, Ship
+from eos.fit.restriction_tracker import RestrictionTracker
+from tests.eos_testcase import EosTestCase
+
+
+class TestHolderMixinChargeSwap(EosTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for attr_id in (1, 2, Attribute.capacity, Attribute.volume):
+            self.ch.attribute(attribute_id=attr_id)
+        modifier = Modifier(
+            state=State.offline, scope=Scope.local, src_attr=1, operator=Operator.post_mul,
+            tgt_attr=2, domain=Domain.other, filter_type=None, filter_value=None
+        )
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.passive, modifiers=(modifier,))
+        self.ch.type_(type_id=1, attributes={})
+        self.ch.type_(type_id=2, attributes={2: 10, Attribute.capacity: 20.0})
+        self.ch.type_(type_id=3, effects=(effect,), attributes={1: 2, Attribute.volume: 2.0})
+        self.ch.type_(type_id=4, effects=(effect,), attributes={1: 3, Attribute.volume: 4.0})
+        self.ch.type_(type_id=Type.character_static, attributes={})
+        self.fit = Fit(source=Source(alias='test', cache_handler=self.ch))
+        self.fit.ship = Ship(1)
+        self.module = Module(2, state=State.active, charge=Charge(3))
+        self.fit.modules.high.append(self.module)
+
+    def test_swap(self):
+        charge = self.module.charge
+        self.assertAlmostEqual(self.module.attributes[2], 20)
+        self.assertEqual(self.module.charge_quantity_max, 10)
+        self.assertIs(self.module.swap_charge(4), charge)
+        self.assertIs(self.module.charge, charge)
+        self.assertIs(charge.container, self.module)
+        self.assertIs(charge._fit, self.fit)
+        self.assertEqual(charge.item.id, 4)
+        self.assertIn(charge, self.fit._holders)
+        self.assertAlmostEqual(charge.attributes[1], 3)
+        self.assertAlmostEqual(self.module.attributes[2], 30)
+        self.assertEqual(self.module.charge_quantity_max, 5)
+        # Charge is removed properly after swap
+        self.module.charge = None
+        self.assertAlmostEqual(self.module.attributes[2], 10)
+        self.assertEqual(len(self.log), 0)
+
+    def test_swap_same(self):
+        charge = self.module.charge
+        self.assertAlmostEqual(self.module.attributes[2], 20)
+        self.assertIs(self.module.swap_charge(3), charge)
+        self.assertAlmostEqual(self.module.attributes[2], 20)
+        self.assertEqual(len(self.log), 0)
+
+    def test_swap_no_charge(self):
+        self.module.charge = None
+        charge = self.module.swap_charge(4)
+        self.assertIs(self.module.charge, charge)
+        self.assertIn(charge, self.fit._holders)
+        self.assertAlmostEqual(self.module.attributes[2], 30)
+        self.assertEqual(len(self.log), 0)
+
+    def test_swap_detached(self):
+        module = Module(2, state=State.active, charge=Charge(3))
+        charge = module.swap_charge(4)
+        self.assertIs(module.charge, charge)
+        self.fit.modules.high.append(module)
+        self.assertEqual(charge.item.id, 4)
+        self.assertAlmostEqual(module.attributes[2], 30)
+        self.assertEqual(len(self.log), 0)
+
+    def test_swap_no_source(self):
+        self.fit.source = None
+        charge = self.module.charge
+        self.module.swap_charge(4)
+        self.assertIs(self.module.charge, charge)
+        self.fit.source = Source(alias='test', cache_handler=self.ch)
+        self.assertAlmostEqual(self.module.attributes[2], 30)
+        self.assertEqual(len(self.log), 0)
+
+    def _get_calculated(self, holder):
+        return set(holder.attributes._MutableAttributeMap__modified_attributes)
+
+    def test_swap_keeps_unrelated(self):
+        charge = self.module.charge
+        self.assertAlmostEqual(self.module.attributes[2], 20)
+        self.assertEqual(self.module.charge_quantity_max, 10)
+        self.assertAlmostEqual(self.module.attributes[Attribute.capacity], 20)
+        self.assertAlmostEqual(charge.attributes[Attribute.volume], 2)
+        with patch.object(Fit, '_request_volatile_cleanup') as cleanup, \
+                patch.object(RestrictionTracker, 'disable_states') as rt_disable:
+            self.module.swap_charge(4)
+        self.assertEqual(cleanup.call_count, 0)
+        # Both charges are registered the same way
+        self.assertEqual(rt_disable.call_count, 0)
+        # Only data relying on charge is removed
+        self.assertEqual(self._get_calculated(self.module), {Attribute.capacity})
+        self.assertEqual(self._get_calculated(charge), set())
+        self.assertNotIn('charge_quantity_max', self.module._volatile_attrs)
+        self.assertAlmostEqual(self.module.attributes[2], 30)
+        self.assertEqual(self.module.charge_quantity_max, 5)
+        self.assertEqual(len(self.log), 0)
+
+    def test_swap_keeps_equal_base(self):
+        self.ch.type_(type_id=5, effects=self.ch.get_type(3).effects, attributes={1: 2, Attribute.volume: 4.0})
+        charge = self.module.charge
+        self.assertAlmostEqual(self.module.attributes[2], 20)
+        self.assertAlmostEqual(charge.attributes[1], 2)
+        self.assertAlmostEqual(charge.attributes[Attribute.volume], 2)
+        self.module.swap_charge(5)
+        # Modifier and its source value are the same for both charges
+        self.assertEqual(self._get_calculated(self.module), {2})
+        self.assertEqual(self._get_calculated(charge), {1})
+        self.assertAlmostEqual(self.module.attributes[2], 20)
+        self.assertEqual(self.module.charge_quantity_max, 5)
+        self.assertEqual(len(self.log), 0)
+
+    def test_swap_registers(self):
+        self.ch.type_(type_id=6, attributes={1: 2, Attribute.volume: 2.0, Attribute.upgrade_cost: 5})
+        self.ch.attribute(attribute_id=Attribute.upgrade_cost)
+        charge = self.module.charge
+        self.module.charge = Charge(6)
+        self.assertEqual(self.fit.stats.calibration.used, 5)
+        self.module.charge = charge
+        self.assertEqual(self.fit.stats.calibration.used, 0)
+        # Charge with different set of attributes is registered again
+        self.module.swap_charge(6)
+        self.assertEqual(self.fit.stats.calibration.used, 5)
+        self.assertAlmostEqual(self.module.attributes[2], 10)
+        self.module.swap_charge(3)
+        self.assertEqual(self.fit.stats.calibration.used, 0)
+        self.assertAlmostEqual(self.module.attributes[2], 20)
+        self.assertEqual(len(self.log), 0)
+
+    def test_swap_unknown(self):
+        charge = self.module.charge
+        self.assertAlmostEqual(self.module.attributes[2], 20)
+        with self.assertRaises(TypeFetchError):
+            self.module.swap_charge(100)
+        self.assertIs(self.module.charge, charge)
+        self.assertEqual(charge.item.id, 3)
+        self.assertAlmostEqual(self.module.attributes[2], 20)
+        self.assertEqual(len(self.log), 0)
+
+    def test_swap_group(self):
+        modifier = Modifier(
+            state=State.offline, scope=Scope.local, src_attr=1, operator=Operator.post_mul,
+            tgt_attr=1, domain=Domain.space, filter_type=FilterType.group, filter_value=50
+        )
+        effect = self.ch.effect(effect_id=2, category=EffectCategory.passive, modifiers=(modifier,))
+        self.ch.type_(type_id=7, group=50, effects=self.ch.get_type(3).effects, attributes={1: 3})
+        self.ch.type_(type_id=8, effects=(effect,), attributes={1: 2})
+        self.fit.rigs.append(Rig(8))
+        charge = self.module.charge
+        self.assertAlmostEqual(charge.attributes[1], 2)
+        self.assertAlmostEqual(self.module.attributes[2], 20)
+        # Charge which belongs to group targeted by rig
+        self.module.swap_charge(7)
+        self.assertAlmostEqual(charge.attributes[1], 6)
+        self.assertAlmostEqual(self.module.attributes[2], 60)
+        self.module.swap_charge(3)
+        self.assertAlmostEqual(charge.attributes[1], 2)
+        self.assertAlmostEqual(self.module.attributes[2], 20)
+        self.assertEqual(len(self.log), 0)
@@ -153,7 +153,7 @@ class TestHolderMixinDamageBombNominalVolley(FitTestCase):
         self.assertAlmostEqual(volley.kinetic, 1.48)
         self.assertAlmostEqual(volley.explosive, 0)
         self.assertAlmostEqual(volley.total, 10.68)
-        mixin._clear_volatile_attrs()
+        mixin._reset_volatile_attrs()
         mixin.charge.attributes[Attribute.em_damage] = 52
         mixin.charge.attributes[Attribute.thermal_damage] = 63
         mixin.charge.attributes[Attribute.kinetic_damage] = 74
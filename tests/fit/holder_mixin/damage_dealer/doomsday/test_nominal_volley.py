@@ -156,7 +156,7 @@ class TestHolderMixinDamageDoomsdayNominalVolley(FitTestCase):
         self.assertAlmostEqual(volley.kinetic, 1.48)
         self.assertAlmostEqual(volley.explosive, 0)
         self.assertAlmostEqual(volley.total, 10.68)
-        mixin._clear_volatile_attrs()
+        mixin._reset_volatile_attrs()
         mixin.attributes[Attribute.em_damage] = 52
         mixin.attributes[Attribute.thermal_damage] = 63
         mixin.attributes[Attribute.kinetic_damage] = 74
@@ -157,7 +157,7 @@ class TestHolderMixinDamageDroneNominalVolley(FitTestCase):
         self.assertAlmostEqual(volley.kinetic, 8.14)
         self.assertAlmostEqual(volley.explosive, 0)
         self.assertAlmostEqual(volley.total, 58.74)
-        mixin._clear_volatile_attrs()
+        mixin._reset_volatile_attrs()
         mixin.attributes[Attribute.em_damage] = 52
         mixin.attributes[Attribute.thermal_damage] = 63
         mixin.attributes[Attribute.kinetic_damage] = 74
@@ -146,7 +146,7 @@ class TestHolderMixinTankingResistances(FitTestCase):
         self.assertAlmostEqual(self.mixin.resistances.shield.thermal, 0.9)
         self.assertAlmostEqual(self.mixin.resistances.shield.kinetic, 0.89)
         self.assertAlmostEqual(self.mixin.resistances.shield.explosive, 0.88)
-        self.mixin._clear_volatile_attrs()
+        self.mixin._reset_volatile_attrs()
         self.mixin.attributes[Attribute.em_damage_resonance] = 0.11
         self.mixin.attributes[Attribute.thermal_damage_resonance] = 0.12
         self.mixin.attributes[Attribute.kinetic_damage_resonance] = 0.13
@@ -426,7 +426,7 @@ class TestHolderMixinTankingWorstCaseEhp(FitTestCase):
         self.assertAlmostEqual(mixin.worst_case_ehp.armor, 25)
         self.assertAlmostEqual(mixin.worst_case_ehp.shield, 500)
         self.assertAlmostEqual(mixin.worst_case_ehp.total, 526.25)
-        mixin._clear_volatile_attrs()
+        mixin._reset_volatile_attrs()
         mixin.hp.hull = 10
         mixin.hp.armor = 100
         mixin.hp.shield = 1000
@@ -0,0 +1,103 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import Domain, Operator, Scope, State
+from eos.const.eve import EffectCategory, Type
+from eos.data.cache_object import Modifier
+from eos.data.source import Source
+from eos.fit import Fit, FrozenFit
+from eos.fit.exception import FitFrozenError
+from eos.fit.holder.item import Module, Ship
+from tests.eos_testcase import EosTestCase
+
+
+class TestBulkStateSwitch(EosTestCase):
+    """Check switching states of multiple holders at once."""
+
+    def setUp(self):
+        super().setUp()
+        self.ch.attribute(attribute_id=1)
+        self.ch.attribute(attribute_id=2, stackable=True)
+        modifier = Modifier(
+            state=State.online, scope=Scope.local, src_attr=1, operator=Operator.post_percent,
+            tgt_attr=2, domain=Domain.ship, filter_type=None, filter_value=None
+        )
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.online, modifiers=(modifier,))
+        self.ch.type_(type_id=1, attributes={2: 100})
+        self.ch.type_(type_id=2, effects=(effect,), attributes={1: 20})
+        self.ch.type_(type_id=3, attributes={})
+        self.ch.type_(type_id=Type.character_static, attributes={})
+        self.source = Source(alias='test', cache_handler=self.ch)
+        self.fit = Fit(source=self.source)
+        self.fit.ship = Ship(1)
+        self.module1 = Module(2, state=State.offline)
+        self.module2 = Module(2, state=State.offline)
+        self.module3 = Module(3, state=State.offline)
+        for module in (self.module1, self.module2, self.module3):
+            self.fit.modules.low.append(module)
+
+    def test_set_states(self):
+        self.assertAlmostEqual(self.fit.ship.attributes[2], 100)
+        self.fit.set_states({self.module1: State.active, self.module2: State.online})
+        self.assertEqual(self.module1.state, State.active)
+        self.assertEqual(self.module2.state, State.online)
+        self.assertEqual(self.module3.state, State.offline)
+        self.assertAlmostEqual(self.fit.ship.attributes[2], 144)
+        self.fit.set_states({self.module1: State.offline, self.module2: State.online})
+        self.assertEqual(self.module1.state, State.offline)
+        self.assertAlmostEqual(self.fit.ship.attributes[2], 120)
+        self.assertEqual(len(self.log), 0)
+
+    def test_set_rack_state(self):
+        # Leave empty slot in rack
+        self.fit.modules.low.place(4, Module(3, state=State.offline))
+        self.assertIsNone(self.fit.modules.low[3])
+        self.fit.set_rack_state(self.fit.modules.low, State.overload)
+        for module in (self.module1, self.module2, self.module3):
+            self.assertEqual(module.state, State.overload)
+        self.assertAlmostEqual(self.fit.ship.attributes[2], 144)
+        self.fit.set_rack_state(self.fit.modules.holders(), State.offline, holder_filter=lambda h: h is self.module2)
+        self.assertEqual(self.module1.state, State.overload)
+        self.assertEqual(self.module2.state, State.offline)
+        self.assertAlmostEqual(self.fit.ship.attributes[2], 120)
+        self.assertEqual(len(self.log), 0)
+
+    def test_no_source(self):
+        self.fit.source = None
+        self.fit.set_states({self.module1: State.online})
+        self.assertEqual(self.module1.state, State.online)
+        self.fit.source = self.source
+        self.assertAlmostEqual(self.fit.ship.attributes[2], 120)
+        self.assertEqual(len(self.log), 0)
+
+    def test_failures(self):
+        self.assertRaises(ValueError, self.fit.set_states, {Module(2): State.online})
+        self.assertRaises(TypeError, self.fit.set_states, {self.fit.ship: State.online})
+        self.assertRaises(TypeError, self.fit.set_states, {self.module1: State.online, self.fit.ship: State.online})
+        self.assertEqual(self.module1.state, State.offline)
+        self.assertAlmostEqual(self.fit.ship.attributes[2], 100)
+        self.assertEqual(len(self.log), 0)
+
+    def test_frozen(self):
+        fit = FrozenFit.from_spec({'ship': Ship(1), 'low': (Module(2), Module(2))}, source=self.source)
+        module = fit.modules.low[0]
+        self.assertRaises(FitFrozenError, fit.set_states, {module: State.online})
+        self.assertEqual(module.state, State.offline)
+        self.assertEqual(len(self.log), 0)
@@ -0,0 +1,169 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import Domain, FilterType, Operator, Scope, State
+from eos.const.eve import Attribute, EffectCategory, Type
+from eos.data.cache_object import Modifier
+from eos.data.source import Source
+from eos.fit import Fit
+from eos.fit.attribute_calculator.register import LinkRegisterView
+from eos.fit.holder.item import Charge, Module, Ship, Skill
+from tests.eos_testcase import EosTestCase
+
+
+class TestFitClone(EosTestCase):
+    """Check that fit clones are independent and share calculated data with original fit."""
+
+    def setUp(self):
+        super().setUp()
+        self.ch.attribute(attribute_id=1)
+        self.ch.attribute(attribute_id=2)
+        modifier = Modifier(
+            state=State.online, scope=Scope.local, src_attr=1, operator=Operator.post_percent,
+            tgt_attr=2, domain=Domain.ship, filter_type=FilterType.all_, filter_value=None
+        )
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.online, modifiers=(modifier,))
+        self.ch.type_(type_id=1, attributes={2: 100})
+        self.ch.type_(type_id=2, effects=(effect,), attributes={1: 20})
+        self.ch.type_(type_id=3, attributes={2: 50})
+        self.ch.type_(type_id=4, attributes={})
+        self.ch.type_(type_id=Type.character_static, attributes={})
+        self.fit = Fit(source=Source(alias='test', cache_handler=self.ch))
+        self.fit.ship = Ship(1)
+        self.booster = Module(2, state=State.online)
+        self.fit.modules.high.append(self.booster)
+        self.target = Module(3, charge=Charge(4))
+        self.fit.modules.low.place(2, self.target)
+        self.fit.skills.add(Skill(4, level=3))
+        self.target.charge_quantity = 5
+
+    def test_structure(self):
+        fit_clone = self.fit.clone()
+        self.assertIs(fit_clone.source, self.fit.source)
+        self.assertEqual(fit_clone.ship._type_id, 1)
+        self.assertEqual(list(fit_clone.modules.low)[:2], [None, None])
+        target_clone = fit_clone.modules.low[2]
+        self.assertIsNot(target_clone, self.target)
+        self.assertEqual(target_clone.charge._type_id, 4)
+        self.assertIs(target_clone.charge._fit, fit_clone)
+        self.assertEqual(target_clone.charge_quantity, 5)
+        self.assertEqual(fit_clone.modules.high[0].state, State.online)
+        self.assertEqual(fit_clone.skills[4].level, 3)
+        self.assertEqual(len(self.log), 0)
+
+    def test_shared_values(self):
+        self.assertAlmostEqual(self.target.attributes[2], 60)
+        fit_clone = self.fit.clone()
+        target_clone = fit_clone.modules.low[2]
+        # Value is taken from original fit, not calculated
+        modified_attributes = target_clone.attributes._MutableAttributeMap__modified_attributes
+        self.assertIs(modified_attributes, self.target.attributes._MutableAttributeMap__modified_attributes)
+        self.assertAlmostEqual(target_clone.attributes[2], 60)
+        self.assertEqual(len(self.log), 0)
+
+    def test_values_unshared_on_write(self):
+        self.assertAlmostEqual(self.target.attributes[2], 60)
+        fit_clone = self.fit.clone()
+        target_clone = fit_clone.modules.low[2]
+        target_clone.attributes[2] = 70
+        self.assertEqual(target_clone.attributes._MutableAttributeMap__modified_attributes, {2: 70})
+        self.assertEqual(self.target.attributes._MutableAttributeMap__modified_attributes, {2: 60})
+        self.assertAlmostEqual(self.target.attributes[2], 60)
+        self.assertEqual(len(self.log), 0)
+
+    def test_shared_links(self):
+        fit_clone = self.fit.clone()
+        self.assertIsInstance(fit_clone._link_tracker._register, LinkRegisterView)
+        booster_clone = fit_clone.modules.high[0]
+        target_clone = fit_clone.modules.low[2]
+        affectors = fit_clone._link_tracker.get_affectors(target_clone)
+        self.assertEqual(len(affectors), 1)
+        affector = next(iter(affectors))
+        self.assertIs(affector.source_holder, booster_clone)
+        self.assertIn(target_clone, fit_clone._link_tracker.get_affectees(affector))
+        self.assertNotIn(self.target, fit_clone._link_tracker.get_affectees(affector))
+        self.assertEqual(len(self.log), 0)
+
+    def test_links_forked_on_original_change(self):
+        self.assertAlmostEqual(self.target.attributes[2], 60)
+        fit_clone = self.fit.clone()
+        self.fit.modules.high.remove(self.booster)
+        self.assertNotIsInstance(fit_clone._link_tracker._register, LinkRegisterView)
+        self.assertAlmostEqual(self.target.attributes[2], 50)
+        target_clone = fit_clone.modules.low[2]
+        self.assertAlmostEqual(target_clone.attributes[2], 60)
+        fit_clone.modules.high[0].state = State.offline
+        self.assertAlmostEqual(target_clone.attributes[2], 50)
+        self.assertEqual(len(self.log), 0)
+
+    def test_clone_of_clone(self):
+        self.assertAlmostEqual(self.target.attributes[2], 60)
+        fit_clone = self.fit.clone()
+        fit_clone2 = fit_clone.clone()
+        # Both clones use register of original fit
+        register_view = fit_clone2._link_tracker._register
+        self.assertIs(register_view.tracker, self.fit._link_tracker)
+        fit_clone.modules.high[0].state = State.offline
+        self.assertAlmostEqual(fit_clone.modules.low[2].attributes[2], 50)
+        self.assertAlmostEqual(fit_clone2.modules.low[2].attributes[2], 60)
+        self.assertAlmostEqual(self.target.attributes[2], 60)
+        fit_clone2.modules.high.remove(fit_clone2.modules.high[0])
+        self.assertAlmostEqual(fit_clone2.modules.low[2].attributes[2], 50)
+        self.assertAlmostEqual(self.target.attributes[2], 60)
+        self.assertEqual(len(self.log), 0)
+
+    def test_overrides(self):
+        self.fit.ship.hp.hull = 200
+        fit_clone = self.fit.clone()
+        self.assertEqual(fit_clone.ship.hp.hull, 200)
+        self.assertEqual(fit_clone.modules.low[2].charge_quantity, 5)
+        self.assertEqual(len(self.log), 0)
+
+    def test_divergence(self):
+        self.assertAlmostEqual(self.target.attributes[2], 60)
+        fit_clone = self.fit.clone()
+        fit_clone.modules.high[0].state = State.offline
+        self.assertAlmostEqual(fit_clone.modules.low[2].attributes[2], 50)
+        self.assertAlmostEqual(self.target.attributes[2], 60)
+        self.fit.modules.high.remove(self.booster)
+        self.assertAlmostEqual(self.target.attributes[2], 50)
+        fit_clone.modules.high[0].state = State.online
+        self.assertAlmostEqual(fit_clone.modules.low[2].attributes[2], 60)
+        self.assertEqual(len(self.log), 0)
+
+    def test_lazy_containers(self):
+        self.ch.attribute(attribute_id=Attribute.upgrade_cost)
+        self.ch.type_(type_id=5, attributes={Attribute.upgrade_cost: 10})
+        self.fit.modules.low.place(3, Module(5))
+        self.assertEqual(self.fit.stats.calibration.used, 10)
+        fit_clone = self.fit.clone()
+        # Lazily built container has no counterpart on new fit
+        # until copy builds it
+        calibration = fit_clone.stats.calibration
+        self.assertIn('used', calibration._volatile_attrs)
+        self.assertEqual(calibration.used, 10)
+        self.assertEqual(len(self.log), 0)
+
+    def test_no_source(self):
+        self.fit.source = None
+        fit_clone = self.fit.clone()
+        self.assertIsNone(fit_clone.source)
+        self.assertEqual(fit_clone.modules.low[2]._type_id, 3)
+        self.assertEqual(len(self.log), 0)
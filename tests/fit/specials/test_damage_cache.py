@@ -0,0 +1,128 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import Domain, FilterType, Operator, Scope, State
+from eos.const.eve import Attribute, Effect, EffectCategory, Type
+from eos.data.cache_object import Modifier
+from eos.data.source import Source
+from eos.fit import Fit
+from eos.fit.holder.item import Charge, Module, Ship
+from tests.environment import CacheHandler
+from tests.eos_testcase import EosTestCase
+
+
+class TestDamageCache(EosTestCase):
+    """Check that cached damage stats follow fit changes."""
+
+    def setUp(self):
+        super().setUp()
+        self.fill_data(self.ch, 10.0)
+        self.fit = Fit(source=Source(alias='test', cache_handler=self.ch))
+        self.fit.ship = Ship(1)
+        self.turret1 = Module(2, state=State.active, charge=Charge(3))
+        self.turret2 = Module(2, state=State.active, charge=Charge(3))
+        self.fit.modules.high.append(self.turret1)
+        self.fit.modules.high.append(self.turret2)
+        self.assertAlmostEqual(self.fit.stats.get_nominal_dps().em, 20)
+
+    def fill_data(self, ch, charge_em):
+        for attr_id in (
+            1, 2, Attribute.em_damage, Attribute.thermal_damage, Attribute.kinetic_damage,
+            Attribute.explosive_damage, Attribute.damage_multiplier, Attribute.module_reactivation_delay,
+            Attribute.capacity, Attribute.volume
+        ):
+            ch.attribute(attribute_id=attr_id)
+        modifier = Modifier(
+            state=State.online, scope=Scope.local, src_attr=1, operator=Operator.post_percent,
+            tgt_attr=Attribute.damage_multiplier, domain=Domain.ship, filter_type=FilterType.all_,
+            filter_value=None
+        )
+        boost_effect = ch.effect(effect_id=1, category=EffectCategory.online, modifiers=(modifier,))
+        turret_effect = ch.effect(
+            effect_id=Effect.projectile_fired, category=EffectCategory.active,
+            duration_attribute=2
+        )
+        ch.type_(type_id=1, attributes={})
+        ch.type_(
+            type_id=2, effects=(turret_effect,), default_effect=turret_effect,
+            attributes={
+                Attribute.em_damage: 0.0, Attribute.thermal_damage: 0.0, Attribute.kinetic_damage: 0.0,
+                Attribute.explosive_damage: 0.0, Attribute.damage_multiplier: 2.0, 2: 2000.0,
+                Attribute.module_reactivation_delay: 0.0, Attribute.capacity: 1.0
+            }
+        )
+        ch.type_(type_id=3, attributes={
+            Attribute.em_damage: charge_em, Attribute.thermal_damage: 0.0,
+            Attribute.kinetic_damage: 0.0, Attribute.explosive_damage: 0.0, Attribute.volume: 0.1
+        })
+        ch.type_(type_id=4, attributes={
+            Attribute.em_damage: 30.0, Attribute.thermal_damage: 0.0,
+            Attribute.kinetic_damage: 0.0, Attribute.explosive_damage: 0.0, Attribute.volume: 0.1
+        })
+        ch.type_(type_id=5, effects=(boost_effect,), attributes={1: 100})
+        ch.type_(type_id=Type.character_static, attributes={})
+        ch.attributes_hash = 'attrs'
+        ch.type_hashes.update({1: 'ship', 2: 'turret', 4: 'charge 30', 5: 'booster', Type.character_static: 'char'})
+        ch.type_hashes[3] = 'charge {}'.format(charge_em)
+
+    def test_attribute_change(self):
+        booster = Module(5, state=State.online)
+        self.fit.modules.low.append(booster)
+        self.assertAlmostEqual(self.fit.stats.get_nominal_dps().em, 40)
+        self.fit.modules.low.remove(booster)
+        self.assertAlmostEqual(self.fit.stats.get_nominal_dps().em, 20)
+        self.assertEqual(len(self.log), 0)
+
+    def test_state_change(self):
+        self.turret1.state = State.online
+        self.assertAlmostEqual(self.fit.stats.get_nominal_dps().em, 10)
+        self.turret1.state = State.active
+        self.assertAlmostEqual(self.fit.stats.get_nominal_dps().em, 20)
+        self.assertEqual(len(self.log), 0)
+
+    def test_charge_change(self):
+        self.turret1.charge = Charge(4)
+        self.assertAlmostEqual(self.fit.stats.get_nominal_dps().em, 40)
+        self.turret2.charge = None
+        self.assertAlmostEqual(self.fit.stats.get_nominal_dps().em, 30)
+        self.assertEqual(len(self.log), 0)
+
+    def test_holder_removal(self):
+        self.fit.modules.high.remove(self.turret1)
+        self.assertAlmostEqual(self.fit.stats.get_nominal_dps().em, 10)
+        self.assertEqual(len(self.log), 0)
+
+    def test_unrelated_change(self):
+        self.fit.modules.low.append(Module(1, state=State.online))
+        self.assertIn('_base_volley', self.turret1.__dict__)
+        self.assertAlmostEqual(self.fit.stats.get_nominal_dps().em, 20)
+        self.assertEqual(len(self.log), 0)
+
+    def test_source_switch_charge_changed(self):
+        ch2 = CacheHandler()
+        self.fill_data(ch2, 50.0)
+        self.assertAlmostEqual(self.turret1.get_nominal_volley().em, 20)
+        turret_item = self.turret1.item
+        self.fit.source = Source(alias='test2', cache_handler=ch2)
+        # Only charges have changed, turrets keep their data
+        self.assertIs(self.turret1.item, turret_item)
+        self.assertAlmostEqual(self.turret1.get_nominal_volley().em, 100)
+        self.assertAlmostEqual(self.fit.stats.get_nominal_dps().em, 100)
+        self.assertEqual(len(self.log), 0)
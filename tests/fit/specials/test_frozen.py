@@ -0,0 +1,123 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from unittest.mock import patch
+
+from eos.const.eos import Domain, FilterType, Operator, Scope, State
+from eos.const.eve import EffectCategory, Type
+from eos.data.cache_object import Modifier
+from eos.data.source import Source
+from eos.fit import Fit, FrozenFit
+from eos.fit.exception import FitFrozenError
+from eos.fit.holder.item import Charge, Implant, Module, Ship, Skill
+from tests.eos_testcase import EosTestCase
+
+
+class TestFrozenFit(EosTestCase):
+    """Check that frozen fit calculates attributes and rejects changes."""
+
+    def setUp(self):
+        super().setUp()
+        self.ch.attribute(attribute_id=1)
+        self.ch.attribute(attribute_id=2)
+        modifier = Modifier(
+            state=State.online, scope=Scope.local, src_attr=1, operator=Operator.post_percent,
+            tgt_attr=2, domain=Domain.ship, filter_type=FilterType.all_, filter_value=None
+        )
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.online, modifiers=(modifier,))
+        self.ch.type_(type_id=1, attributes={2: 100})
+        self.ch.type_(type_id=2, effects=(effect,), attributes={1: 20})
+        self.ch.type_(type_id=3, attributes={2: 50})
+        self.ch.type_(type_id=4, attributes={})
+        self.ch.type_(type_id=Type.character_static, attributes={})
+        self.source = Source(alias='test', cache_handler=self.ch)
+        self.booster = Module(2, state=State.online)
+        self.target = Module(3, charge=Charge(4))
+        self.skill = Skill(4, level=3)
+        self.fit = FrozenFit.from_spec({
+            'ship': Ship(1),
+            'high': [self.booster],
+            'low': [None, self.target],
+            'skills': [self.skill]
+        }, source=self.source)
+
+    def test_structure(self):
+        fit = self.fit
+        self.assertIs(fit.source, self.source)
+        self.assertEqual(fit.ship._type_id, 1)
+        self.assertEqual(list(fit.modules.low), [None, self.target])
+        self.assertIs(self.target.charge._fit, fit)
+        self.assertIs(fit.skills[4], self.skill)
+        self.assertIsNone(fit._restriction_tracker)
+        self.assertEqual(len(self.log), 0)
+
+    def test_no_restriction_tracker(self):
+        with patch('eos.fit.fit.RestrictionTracker') as tracker_class:
+            FrozenFit.from_spec({'ship': Ship(1)}, source=self.source)
+        self.assertEqual(tracker_class.call_count, 0)
+        self.assertEqual(len(self.log), 0)
+
+    def test_calculation(self):
+        self.assertAlmostEqual(self.target.attributes[2], 60)
+        self.assertAlmostEqual(self.fit.ship.attributes[2], 100)
+        self.assertEqual(len(self.log), 0)
+
+    def test_reject_add(self):
+        module = Module(3)
+        with self.assertRaises(FitFrozenError):
+            self.fit.modules.low.append(module)
+        with self.assertRaises(FitFrozenError):
+            self.fit.modules.high.equip(module)
+        with self.assertRaises(FitFrozenError):
+            self.fit.implants.add(Implant(4))
+        with self.assertRaises(FitFrozenError):
+            self.target.charge = None
+        self.assertEqual(list(self.fit.modules.low), [None, self.target])
+        self.assertEqual(list(self.fit.modules.high), [self.booster])
+        self.assertEqual(len(self.fit.implants), 0)
+        self.assertIsNone(module._fit)
+        self.assertIsNotNone(self.target.charge)
+        self.assertEqual(len(self.log), 0)
+
+    def test_reject_change(self):
+        with self.assertRaises(FitFrozenError):
+            self.fit.modules.high.remove(self.booster)
+        with self.assertRaises(FitFrozenError):
+            self.booster.state = State.offline
+        with self.assertRaises(FitFrozenError):
+            self.skill.level = 5
+        with self.assertRaises(FitFrozenError):
+            self.fit.ship = None
+        with self.assertRaises(FitFrozenError):
+            self.fit.source = None
+        with self.assertRaises(FitFrozenError):
+            self.fit.validate()
+        self.assertEqual(self.booster.state, State.online)
+        self.assertEqual(self.skill.level, 3)
+        self.assertAlmostEqual(self.target.attributes[2], 60)
+        self.assertEqual(len(self.log), 0)
+
+    def test_clone_is_mutable(self):
+        fit_copy = self.fit.clone()
+        self.assertIs(type(fit_copy), Fit)
+        fit_copy.modules.high[0].state = State.offline
+        self.assertAlmostEqual(fit_copy.modules.low[1].attributes[2], 50)
+        self.assertAlmostEqual(self.target.attributes[2], 60)
+        self.assertEqual(len(self.log), 0)
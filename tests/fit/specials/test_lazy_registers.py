@@ -0,0 +1,85 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import Restriction, State
+from eos.const.eve import Attribute, Type
+from eos.data.source import Source
+from eos.fit import Fit
+from eos.fit.holder.item import Module, Ship
+from eos.fit.restriction_tracker.exception import ValidationError
+from tests.eos_testcase import EosTestCase
+
+
+class TestLazyRegisters(EosTestCase):
+    """Check that registers are built only when requested."""
+
+    def setUp(self):
+        super().setUp()
+        self.ch.attribute(attribute_id=Attribute.cpu)
+        self.ch.attribute(attribute_id=Attribute.cpu_output)
+        self.ch.type_(type_id=1, attributes={Attribute.cpu_output: 40})
+        self.ch.type_(type_id=2, attributes={Attribute.cpu: 30})
+        self.ch.type_(type_id=Type.character_static, attributes={})
+        self.fit = Fit(source=Source(alias='test', cache_handler=self.ch))
+        self.fit.ship = Ship(1)
+
+    def get_cpu_error(self, holder):
+        skip_checks = set(Restriction).difference((Restriction.cpu,))
+        try:
+            self.fit.validate(skip_checks)
+        except ValidationError as e:
+            return e.args[0].get(holder, {}).get(Restriction.cpu)
+        return None
+
+    def test_not_built(self):
+        self.fit.modules.high.append(Module(2, state=State.online))
+        self.assertIsNone(self.fit._restriction_tracker._RestrictionTracker__built_registers)
+        self.assertEqual(self.fit.stats._StatTracker__built_registers, {})
+        self.assertEqual(len(self.log), 0)
+
+    def test_backfill(self):
+        module1 = Module(2, state=State.online)
+        module2 = Module(2, state=State.online)
+        module3 = Module(2, state=State.online)
+        self.fit.modules.high.append(module1)
+        self.fit.modules.high.append(module2)
+        self.fit.modules.high.append(module3)
+        module2.state = State.offline
+        self.fit.modules.high.remove(module3)
+        # Only stats register which was requested is built
+        self.assertAlmostEqual(self.fit.stats.cpu.used, 30)
+        self.assertEqual(set(self.fit.stats._StatTracker__built_registers), {'cpu'})
+        self.assertIsNone(self.get_cpu_error(module1))
+        module2.state = State.online
+        self.assertAlmostEqual(self.fit.stats.cpu.used, 60)
+        restriction_error = self.get_cpu_error(module2)
+        self.assertIsNotNone(restriction_error)
+        self.assertEqual(restriction_error.total_use, 60)
+        self.assertEqual(len(self.log), 0)
+
+    def test_updates_after_build(self):
+        self.assertEqual(self.fit.stats.cpu.used, 0)
+        self.assertIsNone(self.get_cpu_error(None))
+        module = Module(2, state=State.online)
+        self.fit.modules.high.append(module)
+        self.assertAlmostEqual(self.fit.stats.cpu.used, 30)
+        self.fit.modules.high.remove(module)
+        self.assertEqual(self.fit.stats.cpu.used, 0)
+        self.assertEqual(len(self.log), 0)
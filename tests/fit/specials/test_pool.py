@@ -0,0 +1,97 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import Domain, FilterType, Operator, Scope, State
+from eos.const.eve import EffectCategory, Type
+from eos.data.cache_object import Modifier
+from eos.data.source import Source
+from eos.fit import Fit, FitPool
+from eos.fit.holder.item import Charge, Implant, Module, Ship, Skill
+from tests.eos_testcase import EosTestCase
+
+
+class TestFitPool(EosTestCase):
+    """Check resetting and recycling of fits."""
+
+    def setUp(self):
+        super().setUp()
+        self.ch.attribute(attribute_id=1)
+        self.ch.attribute(attribute_id=2)
+        modifier = Modifier(
+            state=State.online, scope=Scope.local, src_attr=1, operator=Operator.post_percent,
+            tgt_attr=2, domain=Domain.ship, filter_type=FilterType.all_, filter_value=None
+        )
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.online, modifiers=(modifier,))
+        self.ch.type_(type_id=1, attributes={2: 100})
+        self.ch.type_(type_id=2, effects=(effect,), attributes={1: 20})
+        self.ch.type_(type_id=3, attributes={2: 50})
+        self.ch.type_(type_id=4, attributes={})
+        self.ch.type_(type_id=Type.character_static, attributes={})
+        self.source = Source(alias='test', cache_handler=self.ch)
+
+    def fill_fit(self, fit):
+        fit.ship = Ship(1)
+        fit.modules.high.append(Module(2, state=State.online, charge=Charge(4)))
+        fit.modules.low.append(Module(3))
+        fit.skills.add(Skill(4, level=5))
+        fit.implants.add(Implant(4))
+
+    def test_reset(self):
+        fit = Fit(source=self.source)
+        self.fill_fit(fit)
+        self.assertAlmostEqual(fit.modules.low[0].attributes[2], 60)
+        character = fit.character
+        fit.reset(source=self.source)
+        self.assertIs(fit.source, self.source)
+        self.assertIsNone(fit.ship)
+        self.assertEqual(len(fit.modules.high), 0)
+        self.assertEqual(len(fit.modules.low), 0)
+        self.assertEqual(len(fit.skills), 0)
+        self.assertEqual(len(fit.implants), 0)
+        self.assertEqual(fit._holders, {fit.character})
+        self.assertIsNot(fit.character, character)
+        self.assertIsNone(character._fit)
+        # Fit is usable after reset
+        self.fill_fit(fit)
+        self.assertAlmostEqual(fit.modules.low[0].attributes[2], 60)
+        self.assertEqual(len(self.log), 0)
+
+    def test_pool(self):
+        pool = FitPool()
+        fit = pool.acquire(source=self.source)
+        self.assertIs(fit.source, self.source)
+        self.fill_fit(fit)
+        pool.release(fit)
+        self.assertEqual(len(pool), 1)
+        self.assertIsNone(fit.ship)
+        recycled = pool.acquire(source=self.source)
+        self.assertIs(recycled, fit)
+        self.assertEqual(len(pool), 0)
+        self.assertIs(recycled.source, self.source)
+        self.fill_fit(recycled)
+        self.assertAlmostEqual(recycled.modules.low[0].attributes[2], 60)
+        self.assertIsNot(pool.acquire(source=self.source), fit)
+        self.assertEqual(len(self.log), 0)
+
+    def test_max_size(self):
+        pool = FitPool(max_size=1)
+        pool.release(Fit(source=self.source))
+        pool.release(Fit(source=self.source))
+        self.assertEqual(len(pool), 1)
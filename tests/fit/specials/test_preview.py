@@ -0,0 +1,136 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from unittest.mock import patch
+
+from eos.const.eos import Domain, FilterType, Operator, Scope, State
+from eos.const.eve import Attribute, EffectCategory, Type
+from eos.data.cache_object import Modifier
+from eos.data.source import Source
+from eos.data.cache_handler.exception import TypeFetchError
+from eos.fit import ChargeChange, EquipChange, Fit, StateChange
+from eos.fit.attribute_calculator.map import MutableAttributeMap
+from eos.fit.holder.item import Charge, Module, Ship
+from eos.fit.tuples import StatDelta
+from tests.eos_testcase import EosTestCase
+
+
+class TestFitPreview(EosTestCase):
+    """Check that preview reports stat changes without changing fit."""
+
+    def setUp(self):
+        super().setUp()
+        self.ch.attribute(attribute_id=1)
+        self.ch.attribute(attribute_id=2)
+        self.ch.attribute(attribute_id=Attribute.cpu)
+        self.ch.attribute(attribute_id=Attribute.volume)
+        modifier = Modifier(
+            state=State.active, scope=Scope.local, src_attr=1, operator=Operator.post_percent,
+            tgt_attr=2, domain=Domain.ship, filter_type=FilterType.all_, filter_value=None
+        )
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.active, modifiers=(modifier,))
+        self.ch.type_(type_id=1, attributes={})
+        self.ch.type_(type_id=2, effects=(effect,), attributes={1: 20, Attribute.cpu: 10})
+        self.ch.type_(type_id=3, attributes={2: 50})
+        self.ch.type_(type_id=4, attributes={Attribute.volume: 1})
+        self.ch.type_(type_id=5, attributes={Attribute.volume: 2})
+        self.ch.type_(type_id=Type.character_static, attributes={})
+        self.fit = Fit(source=Source(alias='test', cache_handler=self.ch))
+        self.fit.ship = Ship(1)
+        self.booster = Module(2, state=State.online)
+        self.fit.modules.high.append(self.booster)
+        self.target = Module(3, charge=Charge(4))
+        self.fit.modules.low.append(self.target)
+
+    def test_state_switch(self):
+        self.assertAlmostEqual(self.target.attributes[2], 50)
+        deltas = self.fit.preview(
+            StateChange(self.booster, State.active),
+            [lambda fit: fit.modules.low[0].attributes[2]]
+        )
+        (stat, delta), = deltas.items()
+        self.assertAlmostEqual(delta.before, 50)
+        self.assertAlmostEqual(delta.after, 60)
+        self.assertAlmostEqual(delta.delta, 10)
+        self.assertEqual(self.booster.state, State.online)
+        self.assertAlmostEqual(self.target.attributes[2], 50)
+        self.assertEqual(len(self.log), 0)
+
+    def test_equip(self):
+        deltas = self.fit.preview(
+            EquipChange(self.fit.modules.high, Module(2, state=State.online)),
+            ['high_slots.used', 'cpu.used']
+        )
+        self.assertEqual(deltas['high_slots.used'], StatDelta(1, 2, 1))
+        self.assertAlmostEqual(deltas['cpu.used'].before, 10)
+        self.assertAlmostEqual(deltas['cpu.used'].after, 20)
+        self.assertEqual(len(self.fit.modules.high), 1)
+        self.assertEqual(self.fit.stats.high_slots.used, 1)
+        self.assertAlmostEqual(self.fit.stats.cpu.used, 10)
+        self.assertEqual(len(self.log), 0)
+
+    def test_charge_swap(self):
+        charge = self.target.charge
+        deltas = self.fit.preview(
+            ChargeChange(self.target, 5),
+            [lambda fit: fit.modules.low[0].charge.attributes[Attribute.volume]]
+        )
+        (stat, delta), = deltas.items()
+        self.assertEqual(delta, StatDelta(1, 2, 1))
+        self.assertIs(self.target.charge, charge)
+        self.assertEqual(charge._type_id, 4)
+        self.assertAlmostEqual(charge.attributes[Attribute.volume], 1)
+        self.assertEqual(len(self.log), 0)
+
+    def test_charge_load(self):
+        self.target.charge = None
+        deltas = self.fit.preview(
+            ChargeChange(self.target, 5),
+            [lambda fit: getattr(fit.modules.low[0].charge, '_type_id', None)]
+        )
+        (stat, delta), = deltas.items()
+        self.assertEqual((delta.before, delta.after), (None, 5))
+        self.assertIsNone(self.target.charge)
+        self.assertEqual(len(self.log), 0)
+
+    def test_calculated_data_kept(self):
+        self.assertAlmostEqual(self.target.attributes[2], 50)
+        with patch.object(MutableAttributeMap, '_MutableAttributeMap__calculate',
+                          autospec=True, side_effect=MutableAttributeMap._MutableAttributeMap__calculate) as calc:
+            self.fit.preview(
+                StateChange(self.booster, State.active),
+                [lambda fit: fit.modules.low[0].attributes[2]]
+            )
+            calls = calc.call_count
+            self.assertGreater(calls, 0)
+            # Only value affected by change has been calculated, and
+            # value which was calculated before is still there
+            self.assertAlmostEqual(self.target.attributes[2], 50)
+            self.assertEqual(calc.call_count, calls)
+        self.assertEqual(len(self.log), 0)
+
+    def test_change_failure(self):
+        self.assertAlmostEqual(self.target.attributes[2], 50)
+        with self.assertRaises(TypeFetchError):
+            self.fit.preview(ChargeChange(self.target, 1000), [lambda fit: fit.modules.low[0].attributes[2]])
+        self.assertEqual(self.target.charge._type_id, 4)
+        self.assertIsNone(self.fit._calc_overlay)
+        self.assertAlmostEqual(self.target.attributes[2], 50)
+        self.assertEqual(len(self.log), 0)
@@ -0,0 +1,88 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import Domain, Operator, Scope, State
+from eos.const.eve import EffectCategory, Type
+from eos.data.cache_object import Modifier
+from eos.data.source import Source
+from eos.fit import Fit
+from eos.fit.holder.item import Implant, Module, Ship
+from tests.environment import CacheHandler
+from tests.eos_testcase import EosTestCase
+
+
+class TestSourceSwitchDiff(EosTestCase):
+    """Check that source switch keeps data of holders with unchanged types."""
+
+    def setUp(self):
+        super().setUp()
+        self.ch2 = CacheHandler()
+        for ch, bonus in ((self.ch, 20), (self.ch2, 50)):
+            ch.attribute(attribute_id=1)
+            ch.attribute(attribute_id=2)
+            modifier = Modifier(
+                state=State.online, scope=Scope.local, src_attr=1, operator=Operator.post_percent,
+                tgt_attr=2, domain=Domain.ship, filter_type=None, filter_value=None
+            )
+            effect = ch.effect(effect_id=1, category=EffectCategory.online, modifiers=(modifier,))
+            ch.type_(type_id=1, attributes={2: 100})
+            ch.type_(type_id=2, effects=(effect,), attributes={1: bonus})
+            ch.type_(type_id=3, attributes={2: 10})
+            ch.type_(type_id=Type.character_static, attributes={})
+            ch.attributes_hash = 'attrs'
+            ch.type_hashes.update({1: 'ship', 3: 'implant', Type.character_static: 'char'})
+        self.ch.type_hashes[2] = 'module 20'
+        self.ch2.type_hashes[2] = 'module 50'
+        self.fit = Fit(source=Source(alias='test', cache_handler=self.ch))
+        self.fit.ship = Ship(1)
+        self.module = Module(2, state=State.online)
+        self.fit.modules.high.append(self.module)
+        self.implant = Implant(3)
+        self.fit.implants.add(self.implant)
+        self.assertAlmostEqual(self.fit.ship.attributes[2], 120)
+        self.assertAlmostEqual(self.implant.attributes[2], 10)
+
+    def test_unchanged_kept(self):
+        old_item = self.implant.item
+        self.fit.source = Source(alias='test2', cache_handler=self.ch2)
+        self.assertIs(self.implant.item, old_item)
+        # Calculated value is not cleared
+        self.assertEqual(self.implant.attributes._MutableAttributeMap__modified_attributes, {2: 10})
+        self.assertIs(self.module.item, self.ch2.get_type(2))
+        self.assertEqual(len(self.log), 0)
+
+    def test_dependents_updated(self):
+        self.fit.source = Source(alias='test2', cache_handler=self.ch2)
+        self.assertAlmostEqual(self.fit.ship.attributes[2], 150)
+        self.module.state = State.offline
+        self.assertAlmostEqual(self.fit.ship.attributes[2], 100)
+        self.fit.modules.high.remove(self.module)
+        self.module.state = State.online
+        self.fit.modules.high.append(self.module)
+        self.assertAlmostEqual(self.fit.ship.attributes[2], 150)
+        self.assertEqual(len(self.log), 0)
+
+    def test_attribute_change(self):
+        self.ch2.attributes_hash = 'other attrs'
+        self.fit.source = Source(alias='test2', cache_handler=self.ch2)
+        self.assertIs(self.implant.item, self.ch2.get_type(3))
+        self.assertIs(self.fit.ship.item, self.ch2.get_type(1))
+        self.assertIs(self.module.item, self.ch2.get_type(2))
+        self.assertEqual(len(self.log), 0)
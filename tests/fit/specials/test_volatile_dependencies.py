@@ -0,0 +1,96 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import Domain, FilterType, Operator, Scope, State
+from eos.const.eve import Attribute, EffectCategory, Type
+from eos.data.cache_object import Modifier
+from eos.data.source import Source
+from eos.fit import Fit
+from eos.fit.holder.item import Charge, Drone, Module, Ship
+from tests.eos_testcase import EosTestCase
+
+
+class TestVolatileDependencies(EosTestCase):
+    """Check that only values relying on changed data are dropped."""
+
+    def setUp(self):
+        super().setUp()
+        for attr_id in (1, Attribute.capacity, Attribute.volume, Attribute.reload_time):
+            self.ch.attribute(attribute_id=attr_id)
+        modifier = Modifier(
+            state=State.online, scope=Scope.local, src_attr=1, operator=Operator.post_percent,
+            tgt_attr=Attribute.capacity, domain=Domain.ship, filter_type=FilterType.all_, filter_value=None
+        )
+        effect = self.ch.effect(effect_id=1, category=EffectCategory.online, modifiers=(modifier,))
+        self.ch.type_(type_id=1, attributes={})
+        self.ch.type_(type_id=2, attributes={Attribute.capacity: 20.0, Attribute.reload_time: 10000.0})
+        self.ch.type_(type_id=3, attributes={Attribute.volume: 2.0})
+        self.ch.type_(type_id=4, attributes={})
+        self.ch.type_(type_id=5, effects=(effect,), attributes={1: 100})
+        self.ch.type_(type_id=Type.character_static, attributes={})
+        self.fit = Fit(source=Source(alias='test', cache_handler=self.ch))
+        self.fit.ship = Ship(1)
+        self.module = Module(2, state=State.active, charge=Charge(3))
+        self.fit.modules.high.append(self.module)
+        self.drone = Drone(4, state=State.offline)
+        self.fit.drones.add(self.drone)
+        self.assertEqual(self.module.charge_quantity_max, 10)
+        self.assertAlmostEqual(self.module.reload_time, 10)
+
+    def test_unrelated_change(self):
+        avoided_before = self.fit.volatile_recomputations_avoided
+        self.drone.state = State.active
+        avoided_after = self.fit.volatile_recomputations_avoided
+        self.assertEqual(avoided_after - avoided_before, 2)
+        self.assertIn('charge_quantity_max', self.module.__dict__)
+        self.assertIn('reload_time', self.module.__dict__)
+        self.assertEqual(self.module.charge_quantity_max, 10)
+        self.assertEqual(len(self.log), 0)
+
+    def test_attribute_change(self):
+        self.fit.modules.low.append(Module(5, state=State.online))
+        self.assertNotIn('charge_quantity_max', self.module.__dict__)
+        self.assertIn('reload_time', self.module.__dict__)
+        self.assertEqual(self.module.charge_quantity_max, 20)
+        self.assertAlmostEqual(self.module.reload_time, 10)
+        self.assertEqual(len(self.log), 0)
+
+    def test_charge_attribute_change(self):
+        self.module.charge.attributes[Attribute.volume] = 5.0
+        self.assertNotIn('charge_quantity_max', self.module.__dict__)
+        self.assertIn('reload_time', self.module.__dict__)
+        self.assertEqual(self.module.charge_quantity_max, 4)
+        self.assertEqual(len(self.log), 0)
+
+    def test_holder_change(self):
+        self.module.charge = None
+        self.assertIsNone(self.module.charge_quantity_max)
+        self.module.state = State.online
+        self.assertNotIn('reload_time', self.module.__dict__)
+        self.module.charge_quantity = 5
+        self.assertEqual(self.module.charge_quantity, 5)
+        self.assertEqual(len(self.log), 0)
+
+    def test_reset(self):
+        self.drone.state = State.active
+        self.assertGreater(self.fit.volatile_recomputations_avoided, 0)
+        self.fit.reset()
+        self.assertEqual(self.fit.volatile_recomputations_avoided, 0)
+        self.assertEqual(len(self.log), 0)
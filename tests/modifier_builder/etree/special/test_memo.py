@@ -0,0 +1,129 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from eos.const.eos import EffectBuildStatus, State
+from eos.const.eve import EffectCategory, Operand
+from eos.data.cache_generator.modifier_builder import ModifierBuilder
+from tests.modifier_builder.modbuilder_testcase import ModBuilderTestCase
+
+
+class TestBuilderEtreeMemo(ModBuilderTestCase):
+    """Test reuse of parsed expression subtrees"""
+
+    def setUp(self):
+        super().setUp()
+        e_tgt = self.ef.make(1, operandID=Operand.def_loc, expressionValue='Ship')
+        e_tgt_attr = self.ef.make(2, operandID=Operand.def_attr, expressionAttributeID=9)
+        e_optr = self.ef.make(3, operandID=Operand.def_optr, expressionValue='PostPercent')
+        e_src_attr = self.ef.make(4, operandID=Operand.def_attr, expressionAttributeID=327)
+        e_tgt_spec = self.ef.make(
+            5, operandID=Operand.itm_attr,
+            arg1=e_tgt['expressionID'],
+            arg2=e_tgt_attr['expressionID']
+        )
+        e_optr_tgt = self.ef.make(
+            6, operandID=Operand.optr_tgt,
+            arg1=e_optr['expressionID'],
+            arg2=e_tgt_spec['expressionID']
+        )
+        self.e_add_mod = self.ef.make(
+            7, operandID=Operand.add_itm_mod,
+            arg1=e_optr_tgt['expressionID'],
+            arg2=e_src_attr['expressionID']
+        )
+        self.e_rm_mod = self.ef.make(
+            8, operandID=Operand.rm_itm_mod,
+            arg1=e_optr_tgt['expressionID'],
+            arg2=e_src_attr['expressionID']
+        )
+        self.builder = ModifierBuilder(self.ef.data)
+
+    def make_row(self, effect_id, pre_expression, post_expression, effect_category=EffectCategory.passive):
+        return {
+            'effect_id': effect_id,
+            'pre_expression': pre_expression,
+            'post_expression': post_expression,
+            'effect_category': effect_category,
+            'modifier_info': None
+        }
+
+    def test_shared_tree(self):
+        effect_row1 = self.make_row(1, self.e_add_mod['expressionID'], self.e_rm_mod['expressionID'])
+        effect_row2 = self.make_row(
+            2, self.e_add_mod['expressionID'], self.e_rm_mod['expressionID'], EffectCategory.active)
+        modifiers1, status1 = self.builder.build(effect_row1)
+        stats = self.builder.etree_memo_stats
+        self.assertEqual(stats.hits, 0)
+        self.assertEqual(stats.misses, 2)
+        modifiers2, status2 = self.builder.build(effect_row2)
+        self.assertEqual(status1, EffectBuildStatus.ok_full)
+        self.assertEqual(status2, EffectBuildStatus.ok_full)
+        self.assertEqual(len(modifiers1), 1)
+        self.assertEqual(len(modifiers2), 1)
+        # Data which depends on effect itself should not be taken from memo
+        self.assertEqual(modifiers1[0].state, State.offline)
+        self.assertEqual(modifiers2[0].state, State.active)
+        self.assertEqual(modifiers1[0].src_attr, modifiers2[0].src_attr)
+        self.assertEqual(modifiers1[0].tgt_attr, modifiers2[0].tgt_attr)
+        stats = self.builder.etree_memo_stats
+        self.assertEqual(stats.hits, 2)
+        self.assertEqual(stats.misses, 2)
+        self.assertEqual(stats.reuse_rate, 0.5)
+        self.assertGreater(stats.time_saved, 0)
+        self.assertEqual(len(self.log), 0)
+
+    def test_repeated_subtree(self):
+        e_add_splice = self.ef.make(
+            9, operandID=Operand.splice,
+            arg1=self.e_add_mod['expressionID'],
+            arg2=self.e_add_mod['expressionID']
+        )
+        e_rm_splice = self.ef.make(
+            10, operandID=Operand.splice,
+            arg1=self.e_rm_mod['expressionID'],
+            arg2=self.e_rm_mod['expressionID']
+        )
+        builder = ModifierBuilder(self.ef.data)
+        effect_row = self.make_row(1, e_add_splice['expressionID'], e_rm_splice['expressionID'])
+        modifiers, status = builder.build(effect_row)
+        # Each branch should produce its own action, even if
+        # subtree of second one was taken from memo
+        self.assertEqual(status, EffectBuildStatus.ok_full)
+        self.assertEqual(len(modifiers), 2)
+        self.assertEqual(builder.etree_memo_stats.hits, 2)
+        self.assertEqual(len(self.log), 0)
+
+    def test_skipped_data(self):
+        e_disabled = self.ef.make(9, operandID=Operand.attack)
+        e_add_splice = self.ef.make(
+            10, operandID=Operand.splice,
+            arg1=self.e_add_mod['expressionID'],
+            arg2=e_disabled['expressionID']
+        )
+        builder = ModifierBuilder(self.ef.data)
+        effect_row1 = self.make_row(1, e_add_splice['expressionID'], self.e_rm_mod['expressionID'])
+        effect_row2 = self.make_row(2, e_add_splice['expressionID'], self.e_rm_mod['expressionID'])
+        modifiers1, status1 = builder.build(effect_row1)
+        modifiers2, status2 = builder.build(effect_row2)
+        self.assertEqual(status1, EffectBuildStatus.ok_partial)
+        self.assertEqual(status2, EffectBuildStatus.ok_partial)
+        self.assertEqual(len(modifiers1), 1)
+        self.assertEqual(len(modifiers2), 1)
+        self.assertEqual(len(self.log), 0)
@@ -0,0 +1,109 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from unittest.mock import Mock
+
+from eos.const.eos import State
+from eos.fit.holder.item import Module
+from eos.fit.holder.mixin.damage_dealer import WeaponType
+from tests.stat_tracker.stat_testcase import StatTestCase
+
+
+class TestStatsDamageCache(StatTestCase):
+
+    def make_holder(self, weapon_type, em):
+        item = self.ch.type_(type_id=len(self.holders) + 1, attributes={})
+        holder = Mock(state=State.active, item=item, spec=Module)
+        holder._weapon_type = weapon_type
+        holder.get_nominal_dps.return_value = Mock(em=em, thermal=None, kinetic=None, explosive=None)
+        self.holders.append(holder)
+        self.track_holder(holder)
+        return holder
+
+    def setUp(self):
+        super().setUp()
+        self.holders = []
+
+    def tearDown(self):
+        for holder in self.holders:
+            self.untrack_holder(holder)
+        self.assertEqual(len(self.log), 0)
+        self.assert_stat_buffers_empty()
+        super().tearDown()
+
+    def test_repeated(self):
+        holder1 = self.make_holder(WeaponType.turret, 1)
+        holder2 = self.make_holder(WeaponType.guided_missile, 2)
+        self.assertAlmostEqual(self.st.get_nominal_dps().total, 3)
+        self.assertAlmostEqual(self.st.get_nominal_dps().total, 3)
+        self.assertEqual(len(holder1.get_nominal_dps.mock_calls), 1)
+        self.assertEqual(len(holder2.get_nominal_dps.mock_calls), 1)
+
+    def test_invalidation(self):
+        holder1 = self.make_holder(WeaponType.turret, 1)
+        holder2 = self.make_holder(WeaponType.turret, 2)
+        holder3 = self.make_holder(WeaponType.guided_missile, 4)
+        self.assertAlmostEqual(self.st.get_nominal_dps().total, 7)
+        holder1.get_nominal_dps.return_value = Mock(em=8, thermal=None, kinetic=None, explosive=None)
+        self.st._damage_dealer_changed(holder1)
+        self.assertAlmostEqual(self.st.get_nominal_dps().total, 14)
+        self.assertEqual(len(holder1.get_nominal_dps.mock_calls), 2)
+        self.assertEqual(len(holder2.get_nominal_dps.mock_calls), 1)
+        self.assertEqual(len(holder3.get_nominal_dps.mock_calls), 1)
+
+    def test_weapon_type_change(self):
+        holder1 = self.make_holder(WeaponType.turret, 1)
+        holder2 = self.make_holder(WeaponType.guided_missile, 2)
+        self.assertAlmostEqual(self.st.get_nominal_dps().total, 3)
+        holder1._weapon_type = WeaponType.guided_missile
+        self.st._damage_dealer_changed(holder1)
+        self.assertAlmostEqual(self.st.get_nominal_dps().total, 3)
+        self.assertEqual(len(holder2.get_nominal_dps.mock_calls), 1)
+
+    def test_tracking_change(self):
+        holder1 = self.make_holder(WeaponType.turret, 1)
+        self.assertAlmostEqual(self.st.get_nominal_dps().total, 1)
+        holder2 = self.make_holder(WeaponType.turret, 2)
+        self.assertAlmostEqual(self.st.get_nominal_dps().total, 3)
+        self.untrack_holder(holder2)
+        self.holders.remove(holder2)
+        self.assertAlmostEqual(self.st.get_nominal_dps().total, 1)
+        self.assertEqual(len(holder1.get_nominal_dps.mock_calls), 1)
+
+    def test_arguments(self):
+        holder = self.make_holder(WeaponType.turret, 1)
+        self.st.get_nominal_dps()
+        self.st.get_nominal_dps(reload=True)
+        self.st.get_nominal_dps(reload=True)
+        self.assertEqual(len(holder.get_nominal_dps.mock_calls), 2)
+
+    def test_arguments_unhashable(self):
+        holder = self.make_holder(WeaponType.turret, 1)
+        self.st.get_nominal_dps(target_resistances=[])
+        self.st.get_nominal_dps(target_resistances=[])
+        self.assertEqual(len(holder.get_nominal_dps.mock_calls), 2)
+
+    def test_filter_before_fetch(self):
+        holder1 = self.make_holder(WeaponType.turret, 1)
+        holder2 = self.make_holder(WeaponType.turret, 2)
+        stats_dps = self.st.get_nominal_dps(holder_filter=lambda h: h is holder2)
+        self.assertAlmostEqual(stats_dps.total, 2)
+        self.assertEqual(len(holder1.get_nominal_dps.mock_calls), 0)
+        self.assertEqual(len(holder2.get_nominal_dps.mock_calls), 1)
@@ -0,0 +1,111 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from unittest import skipIf
+from unittest.mock import Mock, patch
+
+from eos.const.eos import State
+from eos.fit.holder.item import Module
+from eos.fit.stat_tracker import profile_matrix
+from eos.fit.tuples import DamageTypes
+from tests.stat_tracker.stat_testcase import StatTestCase
+
+
+class TestStatsDamageDpsMatrix(StatTestCase):
+
+    def setUp(self):
+        super().setUp()
+        item = self.ch.type_(type_id=1, attributes={})
+        self.holder1 = Mock(state=State.active, item=item, spec=Module)
+        self.holder1.get_nominal_dps.return_value = Mock(em=1.2, thermal=2.3, kinetic=3.4, explosive=None)
+        self.holder2 = Mock(state=State.active, item=item, spec=Module)
+        self.holder2.get_nominal_dps.return_value = Mock(em=0, thermal=4, kinetic=2, explosive=None)
+        self.profiles = (
+            DamageTypes(em=0, thermal=0, kinetic=0, explosive=0),
+            DamageTypes(em=0.5, thermal=0.25, kinetic=1, explosive=0.5)
+        )
+
+    def check_matrix(self):
+        self.track_holder(self.holder1)
+        self.track_holder(self.holder2)
+        dps_matrix = self.st.get_dps_matrix(self.profiles, reload=True)
+        self.assertEqual(len(dps_matrix), 2)
+        self.assertAlmostEqual(dps_matrix[0].em, 1.2)
+        self.assertAlmostEqual(dps_matrix[0].thermal, 6.3)
+        self.assertAlmostEqual(dps_matrix[0].kinetic, 5.4)
+        self.assertIsNone(dps_matrix[0].explosive)
+        self.assertAlmostEqual(dps_matrix[0].total, 12.9)
+        self.assertAlmostEqual(dps_matrix[1].em, 0.6)
+        self.assertAlmostEqual(dps_matrix[1].thermal, 4.725)
+        self.assertAlmostEqual(dps_matrix[1].kinetic, 0)
+        self.assertIsNone(dps_matrix[1].explosive)
+        self.assertAlmostEqual(dps_matrix[1].total, 5.325)
+        # Raw dps is requested from holders only once
+        for holder in (self.holder1, self.holder2):
+            self.assertEqual(len(holder.get_nominal_dps.mock_calls), 1)
+            self.assertEqual(holder.get_nominal_dps.mock_calls[-1].kwargs['reload'], True)
+        self.untrack_holder(self.holder1)
+        self.untrack_holder(self.holder2)
+        self.assertEqual(len(self.log), 0)
+        self.assert_stat_buffers_empty()
+
+    def test_pure_python(self):
+        with patch.object(profile_matrix, 'numpy', None):
+            self.check_matrix()
+
+    @skipIf(profile_matrix.numpy is None, 'NumPy is not available')
+    def test_numpy(self):
+        self.check_matrix()
+
+    def test_consistency(self):
+        self.track_holder(self.holder1)
+        dps_matrix = self.st.get_dps_matrix(self.profiles)
+        self.holder1.get_nominal_dps.return_value = Mock(em=0.6, thermal=1.725, kinetic=0, explosive=None)
+        dps_single = self.st.get_nominal_dps(target_resistances=self.profiles[1])
+        self.assertAlmostEqual(dps_matrix[1].em, dps_single.em)
+        self.assertAlmostEqual(dps_matrix[1].thermal, dps_single.thermal)
+        self.assertAlmostEqual(dps_matrix[1].kinetic, dps_single.kinetic)
+        self.assertAlmostEqual(dps_matrix[1].total, dps_single.total)
+        self.untrack_holder(self.holder1)
+        self.assertEqual(len(self.log), 0)
+        self.assert_stat_buffers_empty()
+
+    def test_empty(self):
+        dps_matrix = self.st.get_dps_matrix(self.profiles)
+        self.assertEqual(len(dps_matrix), 2)
+        for dps_stats in dps_matrix:
+            self.assertIsNone(dps_stats.em)
+            self.assertIsNone(dps_stats.thermal)
+            self.assertIsNone(dps_stats.kinetic)
+            self.assertIsNone(dps_stats.explosive)
+            self.assertIsNone(dps_stats.total)
+        self.assertEqual(len(self.log), 0)
+        self.assert_stat_buffers_empty()
+
+    def test_volley(self):
+        self.holder1.get_nominal_volley.return_value = Mock(em=10, thermal=None, kinetic=None, explosive=None)
+        self.track_holder(self.holder1)
+        volley_matrix = self.st.get_volley_matrix(self.profiles)
+        self.assertAlmostEqual(volley_matrix[0].total, 10)
+        self.assertAlmostEqual(volley_matrix[1].em, 5)
+        self.assertAlmostEqual(volley_matrix[1].total, 5)
+        self.untrack_holder(self.holder1)
+        self.assertEqual(len(self.log), 0)
+        self.assert_stat_buffers_empty()
@@ -0,0 +1,110 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+from unittest.mock import Mock
+
+from eos.const.eos import State
+from eos.const.eve import Category, Group, Type
+from eos.fit.holder.item import Drone, Module
+from eos.fit.holder.mixin.damage_dealer import WeaponType
+from eos.holder_filter import *
+from tests.stat_tracker.stat_testcase import StatTestCase
+
+
+class TestStatsDamageFilter(StatTestCase):
+
+    def make_holder(self, group, category, em, weapon_type=None, skills=(), spec=Module):
+        item = Mock(group=group, category=category, required_skills={s: 1 for s in skills})
+        holder = Mock(state=State.active, item=item, spec=spec)
+        holder._weapon_type = weapon_type
+        holder.get_nominal_dps.return_value = Mock(em=em, thermal=None, kinetic=None, explosive=None)
+        self.holders.append(holder)
+        self.track_holder(holder)
+        return holder
+
+    def setUp(self):
+        super().setUp()
+        self.holders = []
+        self.turret = self.make_holder(Group.projectile_weapon, Category.module, 1, WeaponType.turret)
+        self.launcher = self.make_holder(
+            Group.missile_launcher_heavy, Category.module, 2, WeaponType.guided_missile)
+        self.drone = self.make_holder(1, Category.drone, 4, WeaponType.turret, spec=Drone)
+        self.sentry = self.make_holder(
+            2, Category.drone, 8, WeaponType.turret, skills=(Type.sentry_drone_interfacing,), spec=Drone)
+
+    def tearDown(self):
+        for holder in self.holders:
+            self.untrack_holder(holder)
+        self.assertEqual(len(self.log), 0)
+        self.assert_stat_buffers_empty()
+        super().tearDown()
+
+    def get_called(self):
+        return set(h for h in self.holders if h.get_nominal_dps.mock_calls)
+
+    def test_predicate(self):
+        self.assertIs(turret_filter(self.turret), True)
+        self.assertIs(turret_filter(self.launcher), False)
+        self.assertIs(sentry_drone_filter(self.sentry), True)
+        self.assertIs(sentry_drone_filter(self.drone), False)
+        self.assertIs(drone_filter(Mock(spec=())), False)
+
+    def test_group(self):
+        self.assertAlmostEqual(self.st.get_nominal_dps(holder_filter=turret_filter).total, 1)
+        self.assertEqual(self.get_called(), {self.turret})
+
+    def test_category(self):
+        self.assertAlmostEqual(self.st.get_nominal_dps(holder_filter=drone_filter).total, 12)
+        self.assertEqual(self.get_called(), {self.drone, self.sentry})
+
+    def test_weapon_type(self):
+        holder_filter = WeaponTypeFilter(WeaponType.guided_missile)
+        self.assertAlmostEqual(self.st.get_nominal_dps(holder_filter=holder_filter).total, 2)
+        self.assertEqual(self.get_called(), {self.launcher})
+
+    def test_and_unindexed(self):
+        self.assertAlmostEqual(self.st.get_nominal_dps(holder_filter=sentry_drone_filter).total, 8)
+        self.assertEqual(self.get_called(), {self.sentry})
+
+    def test_and_function(self):
+        holder_filter = WeaponTypeFilter(WeaponType.turret) & (lambda h: h is not self.drone)
+        self.assertAlmostEqual(self.st.get_nominal_dps(holder_filter=holder_filter).total, 9)
+        self.assertEqual(self.get_called(), {self.turret, self.sentry})
+
+    def test_or(self):
+        holder_filter = turret_filter | missile_filter
+        self.assertAlmostEqual(self.st.get_nominal_dps(holder_filter=holder_filter).total, 3)
+        self.assertEqual(self.get_called(), {self.turret, self.launcher})
+
+    def test_or_function(self):
+        holder_filter = turret_filter | (lambda h: h is self.sentry)
+        self.assertAlmostEqual(self.st.get_nominal_dps(holder_filter=holder_filter).total, 9)
+        self.assertEqual(self.get_called(), {self.turret, self.sentry})
+
+    def test_index_update(self):
+        self.assertAlmostEqual(self.st.get_nominal_dps(holder_filter=missile_filter).total, 2)
+        self.turret.item.group = Group.missile_launcher_light
+        self.st._damage_dealer_changed(self.turret)
+        self.assertAlmostEqual(self.st.get_nominal_dps(holder_filter=missile_filter).total, 3)
+        self.assertIsNone(self.st.get_nominal_dps(holder_filter=turret_filter).total)
+
+    def test_base_abstract(self):
+        with self.assertRaises(TypeError):
+            HolderFilter()
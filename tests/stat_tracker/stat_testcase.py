@@ -71,12 +71,12 @@ class StatTestCase(EosTestCase):
 
     def assert_stat_buffers_empty(self):
         entry_num = 0
-        # Get dictionary-container with all registers used by tracker,
-        # and cycle through all of them
-        tracker_container = self.st._StatTracker__registers
-        for register_group in tracker_container.values():
-            for register in register_group:
-                entry_num += self._get_object_buffer_entry_amount(register)
+        # Get dictionary-container with all registers built by tracker,
+        # and cycle through all of them; registers which haven't been
+        # built yet cannot contain any data
+        tracker_container = self.st._StatTracker__built_registers
+        for register in tracker_container.values():
+            entry_num += self._get_object_buffer_entry_amount(register)
         # Raise error if we found any data in any register
         if entry_num > 0:
             plu = 'y' if entry_num == 1 else 'ies'
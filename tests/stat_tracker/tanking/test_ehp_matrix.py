@@ -0,0 +1,123 @@
+# ===============================================================================
+# Copyright (C) 2013-2015 Anton Vorobyov
+#
+# This file is part of Eos.
+#
+# Eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with Eos. If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+
+import math
+import warnings
+from unittest import skipIf
+from unittest.mock import Mock, patch
+
+from eos.const.eos import State
+from eos.fit.holder.item import Ship
+from eos.fit.stat_tracker import profile_matrix
+from eos.fit.tuples import DamageTypes, TankingLayers
+from tests.stat_tracker.stat_testcase import StatTestCase
+
+
+class TestEhpMatrix(StatTestCase):
+
+    def setUp(self):
+        super().setUp()
+        ship_item = self.ch.type_(type_id=1)
+        self.ship_holder = Mock(state=State.offline, item=ship_item, _domain=None, spec=Ship)
+        self.ship_holder.hp = Mock(hull=100, armor=200, shield=None)
+        self.ship_holder.resistances = TankingLayers(
+            hull=DamageTypes(em=0, thermal=0, kinetic=0, explosive=0),
+            armor=DamageTypes(em=0.5, thermal=None, kinetic=0, explosive=0),
+            shield=DamageTypes(em=0, thermal=0, kinetic=0, explosive=0)
+        )
+        self.profiles = (
+            DamageTypes(em=1, thermal=0, kinetic=0, explosive=0),
+            DamageTypes(em=1, thermal=1, kinetic=1, explosive=1)
+        )
+
+    def check_matrix(self):
+        self.set_ship(self.ship_holder)
+        ehp_matrix = self.st.get_ehp_matrix(self.profiles)
+        self.assertEqual(len(ehp_matrix), 2)
+        self.assertAlmostEqual(ehp_matrix[0].hull, 100)
+        self.assertAlmostEqual(ehp_matrix[0].armor, 400)
+        self.assertIsNone(ehp_matrix[0].shield)
+        self.assertAlmostEqual(ehp_matrix[0].total, 500)
+        self.assertAlmostEqual(ehp_matrix[1].hull, 100)
+        self.assertAlmostEqual(ehp_matrix[1].armor, 228.5714286)
+        self.assertIsNone(ehp_matrix[1].shield)
+        self.assertAlmostEqual(ehp_matrix[1].total, 328.5714286)
+        self.set_ship(None)
+        self.assertEqual(len(self.log), 0)
+        self.assert_stat_buffers_empty()
+
+    def test_pure_python(self):
+        with patch.object(profile_matrix, 'numpy', None):
+            self.check_matrix()
+
+    @skipIf(profile_matrix.numpy is None, 'NumPy is not available')
+    def test_numpy(self):
+        self.check_matrix()
+
+    def check_no_received_damage(self):
+        resistances = (
+            DamageTypes(em=1, thermal=0, kinetic=0, explosive=0),
+            DamageTypes(em=0.5, thermal=0, kinetic=0, explosive=0)
+        )
+        profiles = self.profiles + (DamageTypes(em=0, thermal=0, kinetic=0, explosive=0),)
+        rows = profile_matrix.get_layer_ehp_matrix((100, 200), resistances, profiles)
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0][0], math.inf)
+        self.assertAlmostEqual(rows[0][1], 400)
+        self.assertAlmostEqual(rows[1][0], 133.3333333)
+        self.assertAlmostEqual(rows[1][1], 228.5714286)
+        self.assertEqual(rows[2], [math.inf, math.inf])
+        self.assertEqual(len(self.log), 0)
+
+    def test_no_received_damage_pure_python(self):
+        with patch.object(profile_matrix, 'numpy', None):
+            self.check_no_received_damage()
+
+    @skipIf(profile_matrix.numpy is None, 'NumPy is not available')
+    def test_no_received_damage_numpy(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            self.check_no_received_damage()
+
+    def test_empty_profiles(self):
+        self.set_ship(self.ship_holder)
+        self.assertEqual(self.st.get_ehp_matrix(()), ())
+        self.set_ship(None)
+        self.assertEqual(len(self.log), 0)
+        self.assert_stat_buffers_empty()
+
+    def test_zero_profile(self):
+        self.set_ship(self.ship_holder)
+        profiles = self.profiles + (DamageTypes(em=0, thermal=0, kinetic=0, explosive=0),)
+        self.assertRaises(ValueError, self.st.get_ehp_matrix, profiles)
+        self.set_ship(None)
+        self.assertEqual(len(self.log), 0)
+        self.assert_stat_buffers_empty()
+
+    def test_no_ship(self):
+        ehp_matrix = self.st.get_ehp_matrix(self.profiles)
+        self.assertEqual(len(ehp_matrix), 2)
+        for ehp_stats in ehp_matrix:
+            self.assertIsNone(ehp_stats.hull)
+            self.assertIsNone(ehp_stats.armor)
+            self.assertIsNone(ehp_stats.shield)
+            self.assertIsNone(ehp_stats.total)
+        self.assertEqual(len(self.log), 0)
+        self.assert_stat_buffers_empty()